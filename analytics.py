@@ -0,0 +1,309 @@
+import atexit
+import bisect
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from shared import Shared
+
+ANALYTICS_DB_PATH = os.getenv('ANALYTICS_DB_PATH', os.path.join('data', 'analytics.db'))
+ANALYTICS_FLUSH_SECONDS = float(os.getenv('ANALYTICS_FLUSH_SECONDS', '5'))
+
+STAGES = ('domain_extraction', 'scrape', 'summarize', 'email', 'total')
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float('inf'))
+SUM_BUCKET = -1
+QUANTILES = (0.5, 0.95, 0.99)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    day TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, name)
+);
+CREATE TABLE IF NOT EXISTS latency (
+    day TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    industry TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, stage, industry, bucket)
+);
+"""
+
+
+class _Shard:
+    """Cumulative counters owned and written by a single thread."""
+
+    __slots__ = ('counts', 'flushed', 'owner')
+
+    def __init__(self, owner: threading.Thread):
+        self.counts: Dict[tuple, float] = {}
+        self.flushed: Dict[tuple, float] = {}
+        self.owner = owner
+
+
+class AnalyticsStore:
+    def __init__(self, path: str = ANALYTICS_DB_PATH, flush_seconds: float = ANALYTICS_FLUSH_SECONDS):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+        directory = os.path.dirname(path)
+        if directory and path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard(threading.current_thread())
+            self._local.shard = shard
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._start_flusher()
+        return shard
+
+    def _start_flusher(self):
+        if self._flusher is not None or self.flush_seconds <= 0:
+            return
+        with self._shards_lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name='analytics-flusher', daemon=True)
+                self._flusher.start()
+                atexit.register(self.close)
+
+    def _flush_loop(self):
+        while not self._stopped.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Analytics flush failed: {e}")
+
+    def incr(self, name: str, amount: float = 1, day: str = None):
+        key = ('c', day or datetime.now().strftime('%Y-%m-%d'), name)
+        counts = self._shard().counts
+        counts[key] = counts.get(key, 0) + amount
+
+    def observe(self, stage: str, seconds: float, industry: str = None, day: str = None, count: int = 1):
+        day = day or datetime.now().strftime('%Y-%m-%d')
+        industry = industry or 'Unknown'
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        counts = self._shard().counts
+        key = ('h', day, stage, industry, bucket)
+        counts[key] = counts.get(key, 0) + count
+        key = ('h', day, stage, industry, SUM_BUCKET)
+        counts[key] = counts.get(key, 0) + seconds * count
+
+    def record_lead(self, status: str, processing_time: float = 0.0, day: str = None):
+        day = day or datetime.now().strftime('%Y-%m-%d')
+        self.incr('leads_processed', day=day)
+        if status == 'Completed':
+            self.incr('successful', day=day)
+            self.incr('processing_time_sum', processing_time, day=day)
+            self.incr('processing_time_count', day=day)
+        elif status in ('Error', 'Skipped'):
+            self.incr('failed', day=day)
+
+    def record_degraded(self, reasons: List[str], day: str = None):
+        day = day or datetime.now().strftime('%Y-%m-%d')
+        self.incr('degraded_leads', day=day)
+        for reason in reasons:
+            self.incr(f'degraded:{reason}', day=day)
+
+    def flush(self):
+        # Shards only ever grow, so each flush writes the delta since the last
+        # one without having to stop or lock the threads that own them. A shard
+        # whose thread had already exited is final once written, and is dropped,
+        # so short-lived worker pools don't leave their shards behind.
+        with self._flush_lock:
+            with self._shards_lock:
+                shards = list(self._shards)
+            deltas: Dict[tuple, float] = {}
+            pending = []
+            retired = set()
+            for shard in shards:
+                if not shard.owner.is_alive():
+                    retired.add(shard)
+                current = dict(shard.counts)
+                for key, value in current.items():
+                    delta = value - shard.flushed.get(key, 0)
+                    if delta:
+                        deltas[key] = deltas.get(key, 0) + delta
+                pending.append((shard, current))
+            if deltas:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        'INSERT INTO counters (day, name, value) VALUES (?, ?, ?) '
+                        'ON CONFLICT(day, name) DO UPDATE SET value = value + excluded.value',
+                        [key[1:] + (value,) for key, value in deltas.items() if key[0] == 'c']
+                    )
+                    conn.executemany(
+                        'INSERT INTO latency (day, stage, industry, bucket, value) VALUES (?, ?, ?, ?, ?) '
+                        'ON CONFLICT(day, stage, industry, bucket) DO UPDATE SET value = value + excluded.value',
+                        [key[1:] + (value,) for key, value in deltas.items() if key[0] == 'h']
+                    )
+            for shard, current in pending:
+                shard.flushed = current
+            if retired:
+                with self._shards_lock:
+                    self._shards = [shard for shard in self._shards if shard not in retired]
+
+    def snapshot(self, days: int = None) -> Dict:
+        self.flush()
+        rows = self._connection().execute('SELECT day, name, value FROM counters ORDER BY day').fetchall()
+
+        totals: Dict[str, float] = {}
+        daily: Dict[str, Dict[str, float]] = {}
+        for day, name, value in rows:
+            totals[name] = totals.get(name, 0) + value
+            daily.setdefault(day, {})[name] = value
+
+        if days:
+            daily = dict(list(daily.items())[-days:])
+        completed = totals.get('processing_time_count', 0)
+        return {
+            'total_leads_processed': int(totals.get('leads_processed', 0)),
+            'successful_generations': int(totals.get('successful', 0)),
+            'failed_generations': int(totals.get('failed', 0)),
+            'average_processing_time': totals.get('processing_time_sum', 0) / completed if completed else 0,
+            'total_runs': int(totals.get('runs', 0)),
+            'degraded_leads': int(totals.get('degraded_leads', 0)),
+            'degraded_reasons': {
+                name.split(':', 1)[1]: int(value) for name, value in sorted(totals.items()) if name.startswith('degraded:')
+            },
+            'daily_stats': {
+                day: {
+                    'leads_processed': int(stats.get('leads_processed', 0)),
+                    'successful': int(stats.get('successful', 0)),
+                    'failed': int(stats.get('failed', 0)),
+                    'average_processing_time': (
+                        stats.get('processing_time_sum', 0) / stats['processing_time_count']
+                        if stats.get('processing_time_count') else 0
+                    )
+                }
+                for day, stats in daily.items()
+            }
+        }
+
+    def histograms(self, group_by: tuple = ('stage',), since_day: str = None, flush: bool = True) -> Dict[tuple, Dict]:
+        """Merge stored latency buckets into one histogram per ``group_by`` key (any of day, stage, industry)."""
+        if flush:
+            self.flush()
+        query = 'SELECT day, stage, industry, bucket, value FROM latency'
+        params = ()
+        if since_day:
+            query += ' WHERE day >= ?'
+            params = (since_day,)
+
+        merged: Dict[tuple, Dict] = {}
+        for day, stage, industry, bucket, value in self._connection().execute(query, params):
+            row = {'day': day, 'stage': stage, 'industry': industry}
+            key = tuple(row[field] for field in group_by)
+            histogram = merged.setdefault(key, {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0})
+            if bucket == SUM_BUCKET:
+                histogram['sum'] += value
+            else:
+                histogram['buckets'][bucket] += value
+                histogram['count'] += value
+        return merged
+
+    def latency_report(self, group_by: tuple = ('stage',), since_day: str = None) -> List[Dict]:
+        report = []
+        for key, histogram in sorted(self.histograms(group_by, since_day).items()):
+            entry = dict(zip(group_by, key))
+            entry['count'] = int(histogram['count'])
+            entry['mean'] = histogram['sum'] / histogram['count'] if histogram['count'] else 0
+            for q in QUANTILES:
+                entry[f"p{int(q * 100)}"] = histogram_quantile(histogram['buckets'], q)
+            report.append(entry)
+        return report
+
+    def prometheus_lines(self, prefix: str = 'leadgen') -> List[str]:
+        snapshot = self.snapshot()
+        lines = [
+            f'# HELP {prefix}_leads_total Leads processed, by outcome.',
+            f'# TYPE {prefix}_leads_total counter',
+            f'{prefix}_leads_total{{outcome="processed"}} {snapshot["total_leads_processed"]}',
+            f'{prefix}_leads_total{{outcome="successful"}} {snapshot["successful_generations"]}',
+            f'{prefix}_leads_total{{outcome="failed"}} {snapshot["failed_generations"]}',
+            f'# HELP {prefix}_runs_total Workflow runs finished.',
+            f'# TYPE {prefix}_runs_total counter',
+            f'{prefix}_runs_total {snapshot["total_runs"]}',
+            f'# HELP {prefix}_degraded_leads_total Leads finished with a fallback after a deadline or open circuit.',
+            f'# TYPE {prefix}_degraded_leads_total counter',
+            f'{prefix}_degraded_leads_total {snapshot["degraded_leads"]}',
+            f'# HELP {prefix}_degraded_total Fallbacks taken, by stage and cause.',
+            f'# TYPE {prefix}_degraded_total counter',
+        ]
+        lines += [
+            f'{prefix}_degraded_total{{reason="{_escape_label(reason)}"}} {count}'
+            for reason, count in snapshot['degraded_reasons'].items()
+        ]
+        lines += [
+            f'# HELP {prefix}_stage_latency_seconds Per-lead latency of each workflow stage.',
+            f'# TYPE {prefix}_stage_latency_seconds histogram'
+        ]
+        for (stage, industry), histogram in sorted(self.histograms(('stage', 'industry'), flush=False).items()):
+            labels = f'stage="{stage}",industry="{_escape_label(industry)}"'
+            cumulative = 0
+            for bound, value in zip(LATENCY_BUCKETS, histogram['buckets']):
+                cumulative += value
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_stage_latency_seconds_bucket{{{labels},le="{le}"}} {int(cumulative)}')
+            lines.append(f'{prefix}_stage_latency_seconds_sum{{{labels}}} {histogram["sum"]:.6f}')
+            lines.append(f'{prefix}_stage_latency_seconds_count{{{labels}}} {int(histogram["count"])}')
+        return lines
+
+    def close(self):
+        self._stopped.set()
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            print(f"Analytics flush failed: {e}")
+
+
+def histogram_quantile(buckets: List[float], q: float) -> float:
+    """Estimate a quantile by linear interpolation inside the bucket that holds it."""
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    rank = q * total
+    cumulative = 0
+    for index, value in enumerate(buckets):
+        if cumulative + value >= rank and value:
+            lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+            upper = LATENCY_BUCKETS[index]
+            if upper == float('inf'):
+                return lower
+            return lower + (upper - lower) * (rank - cumulative) / value
+        cumulative += value
+    return LATENCY_BUCKETS[-2]
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_shared_store: Shared[AnalyticsStore] = Shared(AnalyticsStore)
+
+
+def get_analytics_store() -> AnalyticsStore:
+    return _shared_store.get()
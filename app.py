@@ -1,492 +1,116 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, Response, stream_with_context
 import os
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
-import time
-from typing import List, Dict, Optional
-from groq import Groq
+from typing import Dict
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
-import json
-import random
 
+# Loaded before the project modules below, which read their settings from the
+# environment at import time.
 load_dotenv()
 
+from datetime import datetime, timedelta
+import json
+from jobs import JobManager
+from analytics import STAGES, get_analytics_store
+from results_store import get_result_store
+from llm_cache import get_cache_stats
+from llm_gateway import get_gateway_stats
+from page_cache import get_page_cache
+from lead_source import get_lead_source
+from prompt_templates import get_template_registry
+from shared import Shared
+from resilience import get_breaker_stats
+from summary_reuse import get_summary_reuse_stats
+from workflow import get_workflow
+
 app = Flask(__name__)
 app.secret_key = 'e2m_lead_generation_secret_key_2024'
 
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 APIFY_API_KEY = os.getenv('APIFY_API_KEY')
-
-print("🚀 E2M AI Lead Generation Web Application")
-print("=" * 50)
-print(f"✅ Groq API: {'Connected' if GROQ_API_KEY else 'Not Configured'}")
-print(f"✅ Apify API: {'Connected' if APIFY_API_KEY else 'Not Configured'}")
-print("🌐 Starting server on http://localhost:5000")
-
-analytics_data = {
-    'total_leads_processed': 0,
-    'successful_generations': 0,
-    'failed_generations': 0,
-    'average_processing_time': 0,
-    'daily_stats': {}
-}
-
-class DomainExtractor:
-    @staticmethod
-    def extract_domain_from_email(email: str) -> Optional[str]:
-        if not email or '@' not in email:
-            return None
-        return email.split('@')[1].lower()
-    
-    @staticmethod
-    def extract_domain_from_url(url: str) -> Optional[str]:
-        if not url:
-            return None
-        
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            return domain if domain else None
-        except Exception:
-            return None
-    
-    @staticmethod
-    def extract_domain(lead_data: dict) -> tuple[Optional[str], Optional[str]]:
-        company_name = lead_data.get('company_name', '')
-        domain = lead_data.get('domain', '').strip()
-        email = lead_data.get('email', '').strip()
-        website = lead_data.get('website', '').strip()
-        
-        if domain:
-            return domain, None
-        
-        if email:
-            domain = DomainExtractor.extract_domain_from_email(email)
-            if domain:
-                return domain, None
-        
-        if website:
-            domain = DomainExtractor.extract_domain_from_url(website)
-            if domain:
-                return domain, None
-        
-        error_msg = f"No domain found for {company_name}"
-        return None, error_msg
-
-class ApifyClient:
-    def get_company_leads(self, count: int = 5, industry_filter: str = None) -> List[Dict]:
-        return self._get_mock_leads(count, industry_filter)
-    
-    def _get_mock_leads(self, count: int, industry_filter: str = None) -> List[Dict]:
-        mock_companies = [
-            {
-                'company_name': 'TechCorp Solutions',
-                'email': 'info@techcorp.com',
-                'website': 'https://techcorp.com',
-                'domain': 'techcorp.com',
-                'industry': 'Technology',
-                'phone': '+91-555-0101',
-                'location': 'India,In',
-                'employees': '500-1000',
-                'revenue': '$100M-$500M'
-            },
-            {
-                'company_name': 'GreenEnergy Inc',
-                'email': 'contact@greenenergy.org',
-                'website': 'https://greenenergy.org',
-                'industry': 'Renewable Energy',
-                'phone': '+91-555-0102',
-                'location': 'India,In',
-                'employees': '200-500',
-                'revenue': '$50M-$100M'
-            },
-            {
-                'company_name': 'MediCare Systems',
-                'email': 'support@medicaresys.com',
-                'website': 'https://medicaresys.com',
-                'industry': 'Healthcare',
-                'phone': '+91-555-0103',
-                'location': 'India,In',
-                'employees': '1000-5000',
-                'revenue': '$500M-$1B'
-            },
-            {
-                'company_name': 'FoodDeliver Fast',
-                'email': 'orders@fooddeliver.app',
-                'website': 'invalid-website',
-                'industry': 'Food Delivery',
-                'phone': '+91-555-0104',
-                'location': 'India,In',
-                'employees': '1000-5000',
-                'revenue': '$500M-$1B'
-            },
-            {
-                'company_name': 'CloudTech Innovations',
-                'email': 'hello@cloudtech.io',
-                'website': 'https://cloudtech.io',
-                'industry': 'Cloud Computing',
-                'phone': '+91-555-0105',
-                'location': 'India,In',
-                'employees': '200-500',
-                'revenue': '$50M-$100M'
-            },
-            {
-                'company_name': 'FinTech Global',
-                'email': 'info@fintechglobal.com',
-                'website': 'https://fintechglobal.com',
-                'industry': 'Financial Technology',
-                'phone': '+91-555-0106',
-                'location': 'India,In',
-                'employees': '500-1000',
-                'revenue': '$100M-$500M'
-            },
-            {
-                'company_name': 'EduLearn Academy',
-                'email': 'contact@edulearn.com',
-                'website': 'https://edulearn.com',
-                'industry': 'Education Technology',
-                'phone': '+91-555-0107',
-                'location': 'India,In',
-                'employees': '100-200',
-                'revenue': '$10M-$50M'
-            }
-        ]
-        
-        if industry_filter and industry_filter != 'all':
-            mock_companies = [c for c in mock_companies if c['industry'].lower() == industry_filter.lower()]
-        
-        leads = []
-        for i in range(min(count, len(mock_companies))):
-            company = mock_companies[i].copy()
-            leads.append(company)
-        
-        return leads
-
-class WebScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-    
-    def scrape_website_content(self, domain: str) -> Optional[str]:
-        if domain == 'invalid-website':
-            return None
-            
-        try:
-            return self._get_mock_content(domain)
-        except Exception as e:
-            print(f"Error scraping {domain}: {e}")
-            return None
-    
-    def _get_mock_content(self, domain: str) -> str:
-        content_map = {
-            'techcorp.com': "TechCorp Solutions provides enterprise software development and cloud infrastructure services. We help businesses digitalize their operations through custom SaaS solutions and offer 24/7 technical support. Trusted by over 500 companies worldwide.",
-            'greenenergy.org': "GreenEnergy Inc is a renewable energy company focused on solar and wind power solutions. We provide sustainable energy systems for residential and commercial clients with installation and maintenance services. Committed to reducing carbon footprints.",
-            'medicaresys.com': "MediCare Systems offers healthcare management software and electronic medical records solutions. We streamline patient data management, appointment scheduling, and billing processes for medical practices. HIPAA compliant and secure.",
-            'cloudtech.io': "CloudTech Innovations helps businesses migrate to the cloud and optimize their infrastructure. We specialize in AWS, Azure, and Google Cloud Platform solutions with security consulting and DevOps services.",
-            'fintechglobal.com': "FinTech Global provides innovative financial technology solutions for banks and financial institutions. Our platform includes payment processing, risk management, and digital banking services.",
-            'edulearn.com': "EduLearn Academy offers interactive online courses and learning management systems. We serve schools, universities, and corporate training programs with advanced educational technology."
-        }
-        
-        return content_map.get(domain, f"{domain} is a professional company providing quality services to clients with a focus on innovation and customer satisfaction.")
-
-class ContentSummarizer:
-    def __init__(self):
-        self.client = Groq(api_key=GROQ_API_KEY) if GROQ_API_KEY else None
-    
-    def generate_summary(self, company_name: str, domain: str, content: str) -> Optional[str]:
-        if not self.client:
-            return f"{company_name} is a business operating at {domain}. They provide quality services in their industry with a focus on customer satisfaction and professional delivery."
-            
-        try:
-            prompt = f"""
-            Create a concise 2-3 sentence business summary for {company_name} ({domain}).
-
-            Based on this content: {content}
-
-            The summary should describe:
-            1. What the company does
-            2. Their main products/services  
-            3. Their value proposition
-
-            Make it professional and factual.
-            """
-            
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are a business analyst that creates concise company summaries."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="mixtral-8x7b-32768",
-                max_tokens=150,
-                temperature=0.3
-            )
-            
-            summary = response.choices[0].message.content.strip()
-            return summary
-            
-        except Exception as e:
-            print(f"Error generating summary: {e}")
-            return f"{company_name} is a business operating at {domain}. They provide services in their respective industry."
-
-class EmailGenerator:
-    def __init__(self):
-        self.client = Groq(api_key=GROQ_API_KEY) if GROQ_API_KEY else None
-        self.email_templates = {
-            'partnership': "I'm reaching out to explore partnership opportunities...",
-            'collaboration': "I'm impressed by your work and would like to discuss collaboration...",
-            'service_intro': "I'd like to introduce our services that could complement your business..."
-        }
-    
-    def generate_personalized_email(self, lead_data: Dict, business_summary: str, email_type: str = 'partnership') -> str:
-        company_name = lead_data.get('company_name', '')
-        industry = lead_data.get('industry', '')
-        
-        if not self.client:
-            return self._generate_fallback_email(company_name, business_summary, email_type)
-            
-        try:
-            prompt = f"""
-            Create a personalized outreach email for {company_name} in the {industry} industry.
-
-            Company Context: {business_summary}
-
-            Email Type: {email_type}
-            
-            Create a professional email that:
-            - References their business specifically
-            - Mentions their industry context
-            - Introduces digital marketing services
-            - Suggests a partnership/collaboration
-            - Includes a clear call-to-action
-
-            Keep it professional and concise (150-200 words).
-            Use placeholders: [Your Name], [Your Company], [Your Title]
-            """
-            
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert email copywriter that creates compelling outreach emails."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                model="mixtral-8x7b-32768",
-                max_tokens=400,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            print(f"Error generating email: {e}")
-            return self._generate_fallback_email(company_name, business_summary, email_type)
-    
-    def _generate_fallback_email(self, company_name: str, business_summary: str, email_type: str) -> str:
-        templates = {
-            'partnership': f"""Dear {company_name} Team,
-
-I was impressed by your work in {business_summary.lower()} and believe there's a great opportunity for partnership.
-
-At [Your Company], we specialize in helping {company_name.split()[0]} scale their digital presence through data-driven marketing strategies.
-
-Would you be open to a quick 15-minute call next week to explore potential synergies?
-
-Best regards,
-[Your Name]
-[Your Title]
-[Your Company]""",
-
-            'collaboration': f"""Hello {company_name} Team,
-
-I've been following your company's progress in {business_summary.lower()} and am impressed by your innovative approach.
-
-We at [Your Company] have expertise that could complement your efforts and drive mutual growth.
-
-Could we schedule a brief call to discuss collaboration opportunities?
-
-Warm regards,
-[Your Name]
-[Your Title]
-[Your Company]"""
-        }
-        
-        return templates.get(email_type, templates['partnership'])
-
-class LeadGenerationWorkflow:
-    def __init__(self):
-        self.apify_client = ApifyClient()
-        self.web_scraper = WebScraper()
-        self.summarizer = ContentSummarizer()
-        self.email_generator = EmailGenerator()
-        self.domain_extractor = DomainExtractor()
-        
-    def run_full_workflow(self, lead_count: int = 5, industry_filter: str = None, email_type: str = 'partnership'):
-        metrics = {
-            'total_processed': 0,
-            'completed': 0,
-            'skipped': 0,
-            'errors': 0,
-            'start_time': datetime.now(),
-            'processing_times': []
-        }
-        
-        leads = self.apify_client.get_company_leads(lead_count, industry_filter)
-        results = []
-        
-        for lead in leads:
-            start_time = datetime.now()
-            metrics['total_processed'] += 1
-            
-            lead_result = {
-                'company': lead['company_name'],
-                'email': lead.get('email'),
-                'website': lead.get('website'),
-                'industry': lead.get('industry'),
-                'location': lead.get('location'),
-                'employees': lead.get('employees'),
-                'revenue': lead.get('revenue'),
-                'phone': lead.get('phone'),
-                'status': 'Pending',
-                'error': None,
-                'domain': None,
-                'summary': None,
-                'email_content': None,
-                'email_type': email_type,
-                'processing_steps': [],
-                'processing_time': 0
-            }
-            
-            try:
-                domain, error = self.domain_extractor.extract_domain(lead)
-                lead_result['processing_steps'].append(f"✅ Domain extraction: {domain if domain else error}")
-                
-                if error:
-                    metrics['skipped'] += 1
-                    metrics['errors'] += 1
-                    lead_result['status'] = 'Skipped'
-                    lead_result['error'] = error
-                    results.append(lead_result)
-                    continue
-                
-                lead_result['domain'] = domain
-                
-                website_content = self.web_scraper.scrape_website_content(domain)
-                lead_result['processing_steps'].append(f"✅ Web scraping: {'Success' if website_content else 'Failed'}")
-                
-                if not website_content:
-                    error_msg = f"Could not scrape content from {domain}"
-                    metrics['skipped'] += 1
-                    metrics['errors'] += 1
-                    lead_result['status'] = 'Skipped'
-                    lead_result['error'] = error_msg
-                    results.append(lead_result)
-                    continue
-                
-                summary = self.summarizer.generate_summary(lead['company_name'], domain, website_content)
-                lead_result['processing_steps'].append("✅ AI summarization: Completed")
-                lead_result['summary'] = summary
-                
-                email_content = self.email_generator.generate_personalized_email(lead, summary, email_type)
-                lead_result['processing_steps'].append("✅ Email generation: Completed")
-                lead_result['email_content'] = email_content
-                
-                metrics['completed'] += 1
-                lead_result['status'] = 'Completed'
-                
-                processing_time = (datetime.now() - start_time).total_seconds()
-                lead_result['processing_time'] = round(processing_time, 2)
-                metrics['processing_times'].append(processing_time)
-                
-                time.sleep(1)  
-                
-            except Exception as e:
-                error_msg = f"Processing error: {str(e)}"
-                metrics['errors'] += 1
-                lead_result['status'] = 'Error'
-                lead_result['error'] = error_msg
-                lead_result['processing_steps'].append(f"❌ Error: {error_msg}")
-            
-            results.append(lead_result)
-        
-        if metrics['processing_times']:
-            metrics['average_processing_time'] = round(sum(metrics['processing_times']) / len(metrics['processing_times']), 2)
-        metrics['total_processing_time'] = round((datetime.now() - metrics['start_time']).total_seconds(), 2)
-        
-        self._update_analytics(metrics, len(results))
-        
-        return {
-            'input_leads': leads,
-            'processed_results': results,
-            'metrics': metrics,
-            'filters': {
-                'lead_count': lead_count,
-                'industry_filter': industry_filter,
-                'email_type': email_type
-            }
-        }
-    
-    def _update_analytics(self, metrics, total_leads):
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        if today not in analytics_data['daily_stats']:
-            analytics_data['daily_stats'][today] = {
-                'leads_processed': 0,
-                'successful': 0,
-                'failed': 0
-            }
-        
-        analytics_data['total_leads_processed'] += total_leads
-        analytics_data['successful_generations'] += metrics['completed']
-        analytics_data['failed_generations'] += metrics['errors']
-        
-        analytics_data['daily_stats'][today]['leads_processed'] += total_leads
-        analytics_data['daily_stats'][today]['successful'] += metrics['completed']
-        analytics_data['daily_stats'][today]['failed'] += metrics['errors']
-        
-        total_runs = analytics_data['successful_generations'] + analytics_data['failed_generations']
-        if total_runs > 0:
-            analytics_data['average_processing_time'] = (
-                analytics_data.get('average_processing_time', 0) * 0.7 + 
-                metrics.get('average_processing_time', 0) * 0.3
-            )
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+RESULTS_PAGE_SIZE = int(os.getenv('RESULTS_PAGE_SIZE', '20'))
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return render_template('index.html', email_types=get_template_registry().email_types(),
+                           industries=get_lead_source().industries())
+
+def get_analytics_snapshot() -> Dict:
+    page_cache = get_page_cache()
+    return {
+        **get_analytics_store().snapshot(),
+        'llm_cache': get_cache_stats(),
+        'llm_gateway': get_gateway_stats(),
+        'page_cache': dict(page_cache.stats) if page_cache else {},
+        'summary_reuse': get_summary_reuse_stats(),
+        'breakers': get_breaker_stats()
+    }
 
 @app.route('/dashboard')
 def dashboard():
-    return render_template('dashboard.html', analytics=analytics_data)
+    return render_template('dashboard.html', analytics=get_analytics_snapshot())
 
 @app.route('/analytics')
 def analytics():
+    store = get_analytics_store()
+    snapshot = get_analytics_snapshot()
+    days = [(datetime.now() - timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(6, -1, -1)]
+    daily = [snapshot['daily_stats'].get(day, {}) for day in days]
+    by_industry = [row for row in store.latency_report(('stage', 'industry')) if row['stage'] == 'total']
+    by_industry.sort(key=lambda row: row['count'], reverse=True)
+    stages = {row['stage']: row for row in store.latency_report(('stage',), since_day=days[0])}
+    stage_names = [stage for stage in STAGES if stage in stages]
+    
     chart_data = {
-        'daily_leads': [random.randint(10, 50) for _ in range(7)],
-        'success_rates': [random.randint(70, 95) for _ in range(7)],
-        'industries': ['Technology', 'Healthcare', 'Finance', 'Education', 'Energy'],
-        'industry_counts': [random.randint(20, 100) for _ in range(5)],
-        'processing_times': [round(random.uniform(2.5, 8.5), 2) for _ in range(10)]
+        'days': days,
+        'daily_leads': [stats.get('leads_processed', 0) for stats in daily],
+        'success_rates': [
+            round(stats['successful'] / stats['leads_processed'] * 100, 1) if stats.get('leads_processed') else 0
+            for stats in daily
+        ],
+        'industries': [row['industry'] for row in by_industry],
+        'industry_counts': [row['count'] for row in by_industry],
+        'stages': stage_names,
+        'stage_p50': [round(stages[stage]['p50'], 4) for stage in stage_names],
+        'stage_p95': [round(stages[stage]['p95'], 4) for stage in stage_names],
+        'stage_p99': [round(stages[stage]['p99'], 4) for stage in stage_names]
     }
-    return render_template('analytics.html', analytics=analytics_data, chart_data=chart_data)
+    latency_table = store.latency_report(('stage', 'industry'), since_day=days[0])
+    return render_template('analytics.html', analytics=snapshot, chart_data=chart_data, latency_table=latency_table)
+
+@app.route('/api/analytics/latency')
+def get_latency_analytics():
+    group_by = tuple(field for field in request.args.get('group_by', 'stage').split(',') if field in ('day', 'stage', 'industry'))
+    return jsonify({
+        'success': True,
+        'group_by': group_by or ('stage',),
+        'latency': get_analytics_store().latency_report(group_by or ('stage',), since_day=request.args.get('since'))
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    lines = get_analytics_store().prometheus_lines()
+    cache_stats = get_cache_stats()
+    page_cache = get_page_cache()
+    lines += ['# HELP leadgen_llm_cache_total LLM response cache events.', '# TYPE leadgen_llm_cache_total counter']
+    lines += [f'leadgen_llm_cache_total{{event="{event}"}} {cache_stats.get(event, 0)}' for event in ('hits', 'misses', 'writes', 'evictions', 'expired')]
+    gateway_stats = get_gateway_stats()
+    lines += ['# HELP leadgen_llm_gateway_total LLM gateway events.', '# TYPE leadgen_llm_gateway_total counter']
+    lines += [f'leadgen_llm_gateway_total{{event="{event}"}} {gateway_stats[event]}' for event in ('requests', 'cache_hits', 'retries', 'throttled', 'failures', 'fallbacks', 'circuit_open', 'deadline_exceeded')]
+    lines += ['# HELP leadgen_llm_concurrency_limit Current adaptive LLM concurrency limit.', '# TYPE leadgen_llm_concurrency_limit gauge']
+    lines.append(f'leadgen_llm_concurrency_limit {gateway_stats["concurrency_limit"]}')
+    reuse_stats = get_summary_reuse_stats()
+    lines += ['# HELP leadgen_summary_reuse_total Near-duplicate summary reuse events.', '# TYPE leadgen_summary_reuse_total counter']
+    lines += [f'leadgen_summary_reuse_total{{event="{event}"}} {reuse_stats.get(event, 0)}' for event in ('lookups', 'hits', 'added', 'unadaptable', 'evictions')]
+    breaker_stats = get_breaker_stats()
+    lines += ['# HELP leadgen_circuit_breaker_total Circuit breaker events, by kind of upstream.', '# TYPE leadgen_circuit_breaker_total counter']
+    lines += [f'leadgen_circuit_breaker_total{{kind="{kind}",event="{event}"}} {breaker_stats[kind][event]}' for kind in ('domain', 'provider') for event in ('opened', 'rejected', 'trials', 'closed')]
+    lines += ['# HELP leadgen_circuit_breaker_open Circuits currently open.', '# TYPE leadgen_circuit_breaker_open gauge']
+    lines += [f'leadgen_circuit_breaker_open{{kind="{kind}"}} {breaker_stats[kind]["open"]}' for kind in ('domain', 'provider')]
+    if page_cache:
+        lines += ['# HELP leadgen_page_cache_total Scraped page cache events.', '# TYPE leadgen_page_cache_total counter']
+        lines += [f'leadgen_page_cache_total{{event="{event}"}} {value}' for event, value in sorted(page_cache.stats.items())]
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
 
 @app.route('/run_workflow', methods=['POST'])
 def run_workflow():
@@ -495,21 +119,15 @@ def run_workflow():
         industry_filter = request.form.get('industry_filter', 'all')
         email_type = request.form.get('email_type', 'partnership')
         
-        workflow = LeadGenerationWorkflow()
-        results = workflow.run_full_workflow(lead_count, industry_filter, email_type)
-        
-        session['workflow_results'] = {
-            'metrics': results['metrics'],
-            'processed_results': results['processed_results'],
-            'filters': results['filters'],
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        job = get_job_manager().submit(lead_count, industry_filter, email_type)
         
         return jsonify({
             'success': True,
-            'metrics': results['metrics'],
-            'timestamp': session['workflow_results']['timestamp']
-        })
+            'job_id': job.id,
+            'status_url': url_for('get_job_status', job_id=job.id),
+            'events_url': url_for('stream_job_events', job_id=job.id),
+            'results_url': url_for('show_job_results', job_id=job.id)
+        }), 202
         
     except Exception as e:
         return jsonify({
@@ -517,27 +135,135 @@ def run_workflow():
             'error': str(e)
         })
 
+@app.route('/api/jobs/<job_id>')
+def get_job_status(job_id):
+    job = get_job_manager().get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    since = request.args.get('since', 0, type=int)
+    return jsonify({'success': True, **job.to_dict(since)})
+
+@app.route('/api/jobs/<job_id>/events')
+def stream_job_events(job_id):
+    job = get_job_manager().get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    since = last_event_id + 1 if last_event_id is not None else request.args.get('since', 0, type=int)
+    
+    def generate(cursor):
+        while True:
+            events = job.wait_for_events(cursor)
+            if not events:
+                if job.finished:
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                yield f"id: {event['seq']}\ndata: {json.dumps(event, default=str)}\n\n"
+            cursor = events[-1]['seq'] + 1
+            if job.finished and cursor >= job.next_seq:
+                return
+    
+    return Response(
+        stream_with_context(generate(since)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/jobs/<job_id>/results')
+def show_job_results(job_id):
+    job = get_job_manager().get(job_id)
+    if not job:
+        return redirect(url_for('index'))
+    if job.status != 'completed':
+        return render_template('results.html', live_job={
+            'job_id': job.id,
+            'params': job.params,
+            'events_url': url_for('stream_job_events', job_id=job.id),
+            'status_url': url_for('get_job_status', job_id=job.id),
+            'results_url': url_for('show_job_results', job_id=job.id)
+        })
+    session.pop('workflow_results', None)
+    session['workflow_run_id'] = job.result['run_id']
+    return redirect(url_for('show_results'))
+
 @app.route('/results')
 def show_results():
-    results = session.get('workflow_results', {})
-    if not results:
+    run_id = request.args.get('run_id') or session.get('workflow_run_id')
+    run = get_result_store().get_run(run_id) if run_id else None
+    if not run:
         return redirect(url_for('index'))
-    return render_template('results.html', results=results)
+    
+    page_size = max(1, min(request.args.get('per_page', RESULTS_PAGE_SIZE, type=int), 200))
+    total_pages = max(1, (run['total'] + page_size - 1) // page_size)
+    page = max(1, min(request.args.get('page', 1, type=int), total_pages))
+    
+    run['processed_results'] = get_result_store().get_results(run_id, (page - 1) * page_size, page_size)
+    pagination = {
+        'page': page,
+        'per_page': page_size,
+        'total': run['total'],
+        'pages': total_pages,
+        'offset': (page - 1) * page_size
+    }
+    return render_template('results.html', results=run, pagination=pagination)
+
+@app.route('/api/results/<run_id>')
+def get_run_results(run_id):
+    run = get_result_store().get_run(run_id)
+    if not run:
+        return jsonify({'success': False, 'error': 'Run not found'}), 404
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = max(1, min(request.args.get('limit', RESULTS_PAGE_SIZE, type=int), 500))
+    return jsonify({
+        'success': True,
+        **run,
+        'offset': offset,
+        'processed_results': get_result_store().get_results(run_id, offset, limit)
+    })
 
 @app.route('/api/analytics')
 def get_analytics():
-    return jsonify(analytics_data)
+    return jsonify(get_analytics_snapshot())
 
 @app.route('/api/industries')
 def get_industries():
-    industries = [
-        'Technology', 'Healthcare', 'Financial Technology', 
-        'Education Technology', 'Renewable Energy', 'Food Delivery',
-        'Cloud Computing', 'All Industries'
-    ]
-    return jsonify(industries)
+    return jsonify(get_lead_source().industries() + ['All Industries'])
+
+@app.route('/api/leads')
+def get_leads():
+    try:
+        page = get_lead_source().query(
+            industry=request.args.getlist('industry'),
+            location=request.args.getlist('location'),
+            employees=request.args.getlist('employees'),
+            revenue=request.args.getlist('revenue'),
+            limit=max(1, min(request.args.get('limit', 50, type=int), 1000)),
+            cursor=request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify({
+        'success': True,
+        'leads': [dict(lead) for lead in page.leads],
+        'next_cursor': page.next_cursor
+    })
+
+# Built on first use, so importing the app does not create the results database.
+_job_manager: Shared[JobManager] = Shared(lambda: JobManager(get_workflow, get_result_store(), max_workers=JOB_WORKERS))
+
+def get_job_manager() -> JobManager:
+    return _job_manager.get()
 
 if __name__ == '__main__':
+    print("🚀 E2M AI Lead Generation Web Application")
+    print("=" * 50)
+    print(f"✅ Groq API: {'Connected' if GROQ_API_KEY else 'Not Configured'}")
+    print(f"✅ Apify API: {'Connected' if APIFY_API_KEY else 'Not Configured'}")
+    print("🌐 Starting server on http://localhost:5000")
+    
     if not os.path.exists('templates'):
         os.makedirs('templates')
         print("📁 Created templates directory")
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+LEADS = int(os.getenv('BENCH_LEADS', '60'))
+LLM_LATENCY = float(os.getenv('BENCH_LLM_LATENCY', '0.02'))
+
+
+class LedgerClient:
+    """Fake Groq client that logs every completion it delivers and can kill the process mid-batch."""
+
+    def __init__(self, ledger_path: str, crash_after: int):
+        from fake_groq import FakeGroqClient
+
+        self.inner = FakeGroqClient(latency=LLM_LATENCY)
+        self.ledger = open(ledger_path, 'a', encoding='utf-8')
+        self.crash_after = crash_after
+        self.chat = self.inner.chat
+        self.inner.chat.completions = self
+
+    def create(self, messages, model, **params):
+        if self.crash_after and self.inner.request_count >= self.crash_after:
+            os._exit(137)
+        response = self.inner.create(messages, model, **params)
+        digest = hashlib.sha1(messages[-1]['content'].encode('utf-8')).hexdigest()
+        self.ledger.write(digest + '\n')
+        self.ledger.flush()
+        return response
+
+
+def child(journal_path: str, ledger_path: str, crash_after: int, use_checkpoint: bool, workers: int):
+    from workflow import LeadGenerationWorkflow
+    from bench_workflow import StubApifyClient, StubWebScraper
+    from checkpoint import CheckpointJournal
+    from llm_gateway import LLMGateway
+
+    checkpoint = CheckpointJournal(journal_path) if use_checkpoint else None
+    workflow = LeadGenerationWorkflow(max_workers=workers, checkpoint=checkpoint)
+    workflow.web_scraper = StubWebScraper()
+    gateway = LLMGateway(LedgerClient(ledger_path, crash_after), rpm=0, tpm=0, use_cache=False)
+    workflow.summarizer.gateway = gateway
+    workflow.email_generator.gateway = gateway
+
+    leads = StubApifyClient().get_company_leads(LEADS)
+    metrics = {}
+    completed = sum(1 for result in workflow.run_stream(leads, metrics=metrics) if result['status'] == 'Completed')
+    print(f"{completed} {metrics['resumed']}")
+
+
+def run_child(workdir: str, crash_after: int, use_checkpoint: bool, workers: int) -> subprocess.CompletedProcess:
+    env = dict(os.environ, LLM_CACHE_ENABLED='false', PAGE_CACHE_ENABLED='false', DEDUP_ENABLED='false', SUMMARY_REUSE_ENABLED='false',
+               ANALYTICS_DB_PATH=os.path.join(workdir, 'analytics.db'), BENCH_SCRAPE_LATENCY='0')
+    command = [sys.executable, os.path.abspath(__file__), '--child', workdir, str(crash_after), str(int(use_checkpoint)), str(workers)]
+    return subprocess.run(command, env=env, capture_output=True, text=True)
+
+
+def scenario(use_checkpoint: bool, crash_after: int, workers: int) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        crashed = run_child(workdir, crash_after, use_checkpoint, workers)
+        resumed = run_child(workdir, 0, use_checkpoint, workers)
+        elapsed = time.perf_counter() - start
+        if resumed.returncode != 0:
+            raise RuntimeError(resumed.stderr)
+        completed, replayed = (int(value) for value in resumed.stdout.split()[-2:])
+        with open(os.path.join(workdir, 'ledger.txt'), encoding='utf-8') as handle:
+            deliveries = Counter(line.strip() for line in handle if line.strip())
+    return {
+        'crash_exit': crashed.returncode,
+        'completed': completed,
+        'replayed': replayed,
+        'llm_calls': sum(deliveries.values()),
+        'repeated': sum(count - 1 for count in deliveries.values()),
+        'seconds': round(elapsed, 2)
+    }
+
+
+def main():
+    crash_after = int(os.getenv('BENCH_CRASH_AFTER', str(LEADS)))
+    print(f"📊 Crash-and-resume benchmark ({LEADS} leads, killed after {crash_after} LLM requests)")
+    print("=" * 50)
+    for workers in (1, 4):
+        for label, use_checkpoint in (('rerun from scratch', False), ('resume from journal', True)):
+            row = scenario(use_checkpoint, crash_after, workers)
+            print(
+                f"{workers} workers  {label:<20} exit={row['crash_exit']}  {row['completed']:>3} completed  "
+                f"{row['replayed']:>3} replayed  {row['llm_calls']:>4} LLM calls  {row['repeated']:>3} repeated  {row['seconds']:>6.2f}s"
+            )
+            if use_checkpoint:
+                assert row['completed'] == LEADS
+                # Only completions still in flight on other workers when the process died can be lost.
+                assert row['repeated'] <= workers - 1, f"{row['repeated']} completions were paid for twice"
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 6 and sys.argv[1] == '--child':
+        workdir = sys.argv[2]
+        child(os.path.join(workdir, 'journal.jsonl'), os.path.join(workdir, 'ledger.txt'), int(sys.argv[3]), sys.argv[4] == '1', int(sys.argv[5]))
+    else:
+        main()
@@ -0,0 +1,84 @@
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflow import DomainExtractor
+
+
+def legacy_extract_domain(lead_data: dict) -> tuple:
+    company_name = lead_data.get('company_name', '')
+    domain = lead_data.get('domain', '').strip()
+    email = lead_data.get('email', '').strip()
+    website = lead_data.get('website', '').strip()
+
+    if domain:
+        return domain, None
+    if email and '@' in email:
+        return email.split('@')[1].lower(), None
+    if website:
+        url = website if website.startswith(('http://', 'https://')) else 'https://' + website
+        try:
+            parsed = urlparse(url)
+            netloc = parsed.netloc.lower()
+            if netloc.startswith('www.'):
+                netloc = netloc[4:]
+            if netloc:
+                return netloc, None
+        except Exception:
+            pass
+    return None, f"No domain found for {company_name}"
+
+
+def make_leads(count: int, distinct_domains: int = 5000, seed: int = 7) -> List[Dict]:
+    rng = random.Random(seed)
+    suffixes = ['com', 'io', 'co.uk', 'com.au', 'org', 'co.in']
+    leads = []
+    for i in range(count):
+        n = rng.randrange(distinct_domains)
+        host = f"company{n}.{suffixes[n % len(suffixes)]}"
+        shape = i % 4
+        leads.append({
+            'company_name': f'Company {n}',
+            'email': f'info@{host}' if shape in (0, 1) else (f'owner{n}@gmail.com' if shape == 2 else ''),
+            'website': f'https://www.{host}/about' if shape in (1, 2, 3) else '',
+            'domain': ''
+        })
+    return leads
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def bench_domains(count: int = 200000) -> Dict[str, float]:
+    leads = make_leads(count)
+    columns = {
+        'domains': [lead['domain'] for lead in leads],
+        'emails': [lead['email'] for lead in leads],
+        'websites': [lead['website'] for lead in leads],
+        'company_names': [lead['company_name'] for lead in leads]
+    }
+    return {
+        'legacy_per_row': timed(lambda: [legacy_extract_domain(lead) for lead in leads]),
+        'per_row': timed(lambda: [DomainExtractor.extract_domain(lead) for lead in leads]),
+        'bulk_columns': timed(lambda: DomainExtractor.extract_domains_bulk(**columns))
+    }
+
+
+def main():
+    count = int(os.getenv('BENCH_LEADS', '200000'))
+    print(f"📊 Domain extraction micro-benchmark ({count} rows)")
+    print("=" * 50)
+    for name, seconds in bench_domains(count).items():
+        print(f"{name:<16} {seconds:>7.3f}s  {count / seconds:>12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lead_source import LeadIndex, employee_band, revenue_band
+
+INDUSTRIES = [
+    'Technology', 'Healthcare', 'Financial Technology', 'Education Technology', 'Renewable Energy',
+    'Food Delivery', 'Cloud Computing', 'Logistics', 'Retail', 'Manufacturing'
+] + [f'Niche Industry {n}' for n in range(40)]
+LOCATIONS = [f'City {n},In' for n in range(200)]
+EMPLOYEES = ['1-10', '11-50', '50-100', '100-200', '200-500', '500-1000', '1000-5000', '10000+']
+REVENUE = ['$500K', '$1M-$5M', '$5M-$10M', '$10M-$50M', '$50M-$100M', '$100M-$500M', '$500M-$1B']
+
+
+def make_leads(count: int) -> List[Dict]:
+    rng = random.Random(7)
+    # Skewed like real lists: a few big industries, a long tail of small ones.
+    weights = [20] * 10 + [1] * 40
+    return [
+        {
+            'company_name': f'Company {i}',
+            'email': f'info@company{i}.com',
+            'industry': rng.choices(INDUSTRIES, weights)[0],
+            'location': rng.choice(LOCATIONS),
+            'employees': rng.choice(EMPLOYEES),
+            'revenue': rng.choice(REVENUE)
+        }
+        for i in range(count)
+    ]
+
+
+def linear(leads: List[Dict], limit: int, industry=None, location=None, employees=None, revenue=None) -> List[Dict]:
+    """Today's ApifyClient approach: lowercase and compare every lead, then slice."""
+    matched = [
+        lead for lead in leads
+        if (industry is None or lead['industry'].lower() == industry.lower())
+        and (location is None or lead['location'].lower() == location.lower())
+        and (employees is None or employee_band(lead['employees']) == employees)
+        and (revenue is None or revenue_band(lead['revenue']) == revenue)
+    ]
+    return matched[:limit]
+
+
+def timed(func: Callable, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    count = int(os.getenv('BENCH_LEADS', '1000000'))
+    limit = 50
+    leads = make_leads(count)
+
+    start = time.perf_counter()
+    index = LeadIndex(leads)
+    print(f"📊 Lead source benchmark ({count:,} leads, pages of {limit}; index built in {time.perf_counter() - start:.1f}s)")
+    print("=" * 50)
+
+    queries = {
+        'industry': {'industry': 'technology'},
+        'rare industry': {'industry': 'Niche Industry 39'},
+        'industry + location': {'industry': 'Healthcare', 'location': 'City 17,In'},
+        'industry + location + bands': {'industry': 'Retail', 'location': 'City 3,In', 'employees': '201-1000', 'revenue': '$10M-$50M'},
+        'two industries + band': {'industry': ['Logistics', 'Niche Industry 5'], 'revenue': '$500M+'},
+    }
+    for name, filters in queries.items():
+        page = index.query(limit=limit, **filters)
+        expected = [lead['company_name'] for lead in linear(leads, limit, **{
+            key: value for key, value in filters.items() if not isinstance(value, list)
+        })] if not any(isinstance(value, list) for value in filters.values()) else None
+        if expected is not None:
+            assert [lead.company_name for lead in page.leads] == expected, name
+        indexed = timed(lambda: index.query(limit=limit, **filters))
+        scan = timed(lambda: linear(leads, limit, **{k: v for k, v in filters.items() if not isinstance(v, list)}), repeat=1)
+        print(f"{name:<30} indexed {indexed * 1000:>8.3f} ms   linear scan {scan * 1000:>9.1f} ms   x{scan / indexed:,.0f}")
+
+    pages = 0
+    cursor = None
+    start = time.perf_counter()
+    while pages < 200:
+        page = index.query(industry='Cloud Computing', limit=limit, cursor=cursor)
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    per_page = (time.perf_counter() - start) / pages
+    print(f"{'cursor paging (200 pages)':<30} indexed {per_page * 1000:>8.3f} ms/page")
+    print(f"{'industries()':<30} indexed {timed(index.industries) * 1000:>8.3f} ms   ({len(index.industries())} industries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+
+os.environ.setdefault('LLM_CACHE_ENABLED', 'false')
+os.environ.setdefault('SUMMARY_REUSE_ENABLED', 'false')
+os.environ.setdefault('DEDUP_ENABLED', 'false')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from workflow import LeadGenerationWorkflow
+from bench_workflow import StubApifyClient
+from fake_groq import FakeGroqClient
+from llm_gateway import LLMGateway
+
+
+def run(lead_count: int, batch_llm: bool, malformed_batches: bool = False, latency: float = 0.02) -> dict:
+    client = FakeGroqClient(latency=latency, malformed_batches=malformed_batches)
+    workflow = LeadGenerationWorkflow(max_workers=1, batch_llm=batch_llm)
+    workflow.apify_client = StubApifyClient()
+    gateway = LLMGateway(client, rpm=0, tpm=0)
+    workflow.summarizer.gateway = gateway
+    workflow.email_generator.gateway = gateway
+
+    start = time.perf_counter()
+    results = workflow.run_full_workflow(lead_count, 'all', 'partnership')
+    elapsed = time.perf_counter() - start
+
+    assert results['metrics']['completed'] == lead_count
+    assert all(r['summary'] and r['email_content'] for r in results['processed_results'])
+    return {'requests': client.request_count, 'seconds': round(elapsed, 3)}
+
+
+def main():
+    lead_count = int(os.getenv('BENCH_LEADS', '40'))
+    print(f"📊 Batched LLM prompting benchmark ({lead_count} leads)")
+    print("=" * 50)
+    for label, kwargs in [
+        ('per-lead', {'batch_llm': False}),
+        ('batched', {'batch_llm': True}),
+        ('batched (unparseable)', {'batch_llm': True, 'malformed_batches': True})
+    ]:
+        row = run(lead_count, **kwargs)
+        print(f"{label:<24} {row['requests']:>5} round trips  {row['seconds']:>7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
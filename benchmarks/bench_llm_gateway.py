@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('LLM_CACHE_ENABLED', 'false')
+os.environ.setdefault('SUMMARY_REUSE_ENABLED', 'false')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from groq import Groq
+
+from llm_gateway import LLMGateway
+from local_http import FakeLLMHandler, start_llm_server, stop_servers
+
+
+def make_client(server) -> Groq:
+    host, port = server.server_address
+    return Groq(api_key='local-test-key', base_url=f'http://{host}:{port}', max_retries=0)
+
+
+def prompt(index: int):
+    return [{'role': 'user', 'content': f'Summarize company {index}'}]
+
+
+def run_direct(server, calls: int, threads: int) -> dict:
+    client = make_client(server)
+    fallbacks = 0
+
+    def call(index):
+        try:
+            client.chat.completions.create(messages=prompt(index), model='mixtral-8x7b-32768', max_tokens=50)
+            return 0
+        except Exception:
+            return 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        fallbacks = sum(pool.map(call, range(calls)))
+    return {'seconds': time.perf_counter() - start, 'fallbacks': fallbacks, 'retries': 0, 'concurrency_limit': threads}
+
+
+def run_gateway(server, calls: int, threads: int, rpm: float) -> dict:
+    gateway = LLMGateway(make_client(server), rpm=rpm, tpm=0, max_concurrency=threads, backoff=0.1, cache=None)
+
+    def call(index):
+        try:
+            gateway.complete(prompt(index), model='mixtral-8x7b-32768', max_tokens=50)
+        except Exception:
+            gateway.record_fallback()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(calls)))
+    stats = gateway.stats()
+    return {
+        'seconds': time.perf_counter() - start,
+        'fallbacks': stats['fallbacks'],
+        'retries': stats['retries'],
+        'concurrency_limit': stats['concurrency_limit']
+    }
+
+
+def main():
+    calls = int(os.getenv('BENCH_CALLS', '120'))
+    threads = int(os.getenv('BENCH_THREADS', '16'))
+    server = start_llm_server()
+    provider_rpm = FakeLLMHandler.requests_per_second * 60
+
+    print(f"📊 LLM gateway benchmark ({calls} calls, {threads} threads, provider limit "
+          f"{FakeLLMHandler.requests_per_second} req/s and {FakeLLMHandler.max_concurrent} concurrent)")
+    print("=" * 50)
+    try:
+        for label, runner in [
+            ('direct client', lambda: run_direct(server, calls, threads)),
+            ('gateway (AIMD only)', lambda: run_gateway(server, calls, threads, rpm=0)),
+            ('gateway (bucket+AIMD)', lambda: run_gateway(server, calls, threads, rpm=provider_rpm * 0.9))
+        ]:
+            FakeLLMHandler.reset()
+            row = runner()
+            print(f"{label:<24} {row['seconds']:>6.2f}s  {calls / row['seconds']:>6.1f} calls/s  "
+                  f"{row['fallbacks']:>4} fallbacks  {row['retries']:>4} retries  "
+                  f"{FakeLLMHandler.throttled:>4} 429s  limit {row['concurrency_limit']}")
+    finally:
+        stop_servers([server])
+
+
+if __name__ == "__main__":
+    main()
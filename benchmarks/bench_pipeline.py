@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+from typing import Dict, List
+
+os.environ.setdefault('DEDUP_ENABLED', 'false')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline as pipeline_module
+from bench_workflow import EMAIL_LATENCY, SCRAPE_LATENCY, SUMMARY_LATENCY, build_workflow
+from pipeline import Pipeline, Stage
+
+
+def stage_capacity(workers: int, latency: float) -> float:
+    return workers / latency if latency else float('inf')
+
+
+def bench_stub_stages(item_count: int = 200, latencies=(0.01, 0.04, 0.02), workers=(4, 4, 4)) -> Dict:
+    stages = [
+        Stage(f'stage{i}', lambda item, delay=delay: (time.sleep(delay), item)[1], count)
+        for i, (delay, count) in enumerate(zip(latencies, workers))
+    ]
+    engine = Pipeline(stages, queue_size=8)
+    start = time.perf_counter()
+    output = list(engine.run(range(item_count)))
+    elapsed = time.perf_counter() - start
+    assert output == list(range(item_count)), "pipeline changed item order"
+
+    bottleneck = min(stage_capacity(count, delay) for delay, count in zip(latencies, workers))
+    return {
+        'items_per_second': round(item_count / elapsed, 1),
+        'bottleneck_capacity': round(bottleneck, 1),
+        'efficiency': round(item_count / elapsed / bottleneck, 3),
+        'stages': engine.summary(elapsed)
+    }
+
+
+def bench_workflow_modes(lead_count: int = 96, llm_workers: int = 4) -> List[Dict]:
+    # The LLM provider only tolerates ``llm_workers`` concurrent calls, so the
+    # pool mode can run that many whole leads at once while the pipeline keeps
+    # scraping ahead on its own workers.
+    stage_workers = (pipeline_module.PIPELINE_SCRAPE_WORKERS, llm_workers, llm_workers)
+    capacity = min(
+        stage_capacity(stage_workers[0], SCRAPE_LATENCY),
+        stage_capacity(llm_workers, SUMMARY_LATENCY),
+        stage_capacity(llm_workers, EMAIL_LATENCY)
+    )
+
+    rows = []
+    for mode in ('pool', 'pipeline'):
+        workflow = build_workflow()
+        start = time.perf_counter()
+        if mode == 'pool':
+            results = workflow.run_full_workflow(lead_count, 'all', 'partnership', max_workers=llm_workers)
+        else:
+            results = workflow.run_full_workflow(lead_count, 'all', 'partnership', pipeline=True)
+        elapsed = time.perf_counter() - start
+        assert [r['company'] for r in results['processed_results']] == [f'Company {i}' for i in range(lead_count)]
+        assert results['metrics']['completed'] == lead_count
+        rows.append({
+            'mode': mode,
+            'seconds': round(elapsed, 3),
+            'leads_per_second': round(lead_count / elapsed, 1),
+            'bottleneck_capacity': round(capacity, 1),
+            'stages': results['metrics'].get('pipeline', {})
+        })
+    return rows
+
+
+def main():
+    llm_workers = int(os.getenv('BENCH_LLM_WORKERS', '4'))
+    pipeline_module.PIPELINE_SUMMARY_WORKERS = llm_workers
+    pipeline_module.PIPELINE_EMAIL_WORKERS = llm_workers
+
+    print("📊 Pipeline benchmark")
+    print("=" * 50)
+    result = bench_stub_stages()
+    print(f"stub stages: {result['items_per_second']} items/s vs bottleneck {result['bottleneck_capacity']} "
+          f"(efficiency {result['efficiency']:.0%})")
+    for name, stats in result['stages'].items():
+        print(f"  {name:<10} utilization {stats['utilization']:.0%}  blocked {stats['blocked_seconds']:.2f}s")
+
+    lead_count = int(os.getenv('BENCH_LEADS', '96'))
+    print(f"\nworkflow, {lead_count} leads, {llm_workers} concurrent LLM calls:")
+    for row in bench_workflow_modes(lead_count, llm_workers):
+        print(f"  {row['mode']:<9} {row['seconds']:>7.3f}s  {row['leads_per_second']:>6.1f} leads/s  "
+              f"(slowest stage capacity {row['bottleneck_capacity']})")
+        for name, stats in row['stages'].items():
+            print(f"    {name:<10} utilization {stats['utilization']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
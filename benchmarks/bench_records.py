@@ -0,0 +1,127 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Lead, LeadResult, Step
+
+# Summaries and emails are the same size in both representations, so one shared
+# string stands in for them and the numbers show only the per-lead overhead.
+SUMMARY = 'A business operating online. ' * 8
+EMAIL = 'Dear Team, ' * 40
+
+
+def make_rows(count: int) -> List[Dict]:
+    industries = ['Technology', 'Healthcare', 'Finance', 'Energy', 'Education']
+    return [
+        {
+            'company_name': f'Company {i} Holdings',
+            'email': f'info@company{i}.com',
+            'website': f'https://company{i}.com',
+            'domain': f'company{i}.com',
+            'industry': industries[i % len(industries)],
+            'phone': f'+91-555-{i:06d}',
+            'location': 'India,In',
+            'employees': '100-200',
+            'revenue': '$10M-$50M'
+        }
+        for i in range(count)
+    ]
+
+
+def legacy(rows: List[Dict]) -> List[tuple]:
+    """Today's shape: a copied lead dict and a 16-key result dict with f-string steps."""
+    out = []
+    for row in rows:
+        lead = row.copy()
+        lead_result = {
+            'company': lead['company_name'],
+            'email': lead.get('email'),
+            'website': lead.get('website'),
+            'industry': lead.get('industry'),
+            'location': lead.get('location'),
+            'employees': lead.get('employees'),
+            'revenue': lead.get('revenue'),
+            'phone': lead.get('phone'),
+            'status': 'Pending',
+            'error': None,
+            'domain': None,
+            'summary': None,
+            'email_content': None,
+            'email_type': 'partnership',
+            'processing_steps': [],
+            'processing_time': 0
+        }
+        domain = lead['domain']
+        lead_result['processing_steps'].append(f"✅ Domain extraction: {domain}")
+        lead_result['domain'] = domain
+        lead_result['processing_steps'].append(f"✅ Web scraping: {'Success' if SUMMARY else 'Failed'}")
+        lead_result['processing_steps'].append("✅ AI summarization: Completed")
+        lead_result['summary'] = SUMMARY
+        lead_result['processing_steps'].append("✅ Email generation: Completed")
+        lead_result['email_content'] = EMAIL
+        lead_result['status'] = 'Completed'
+        lead_result['processing_time'] = round(0.123456, 2)
+        out.append((lead, lead_result))
+    return out
+
+
+def records(rows: List[Dict]) -> List[tuple]:
+    out = []
+    for row in rows:
+        lead = Lead.from_dict(row)
+        lead_result = LeadResult.for_lead(lead, 'partnership')
+        lead_result.add_step(Step.DOMAIN)
+        lead_result.domain = lead.domain
+        lead_result.add_step(Step.SCRAPED, 0.041)
+        lead_result.add_step(Step.SUMMARIZED, 0.052)
+        lead_result.summary = SUMMARY
+        lead_result.add_step(Step.EMAILED, 0.030)
+        lead_result.email_content = EMAIL
+        lead_result.status = 'Completed'
+        lead_result.processing_time = round(0.123456, 2)
+        out.append((lead, lead_result))
+    return out
+
+
+def measure(build: Callable, rows: List[Dict]) -> Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    built = build(rows)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _, lead_result in built:
+        dict(lead_result)
+    rendered = time.perf_counter() - start
+    return {'bytes': current, 'peak': peak, 'build': elapsed, 'render': rendered}
+
+
+def main():
+    count = int(os.getenv('BENCH_LEADS', '100000'))
+    rows = make_rows(count)
+
+    sample_legacy = legacy(rows[:1])[0][1]
+    assert dict(records(rows[:1])[0][1], step_timings=None) == dict(sample_legacy, step_timings=None)
+
+    print(f"📊 Lead/result memory benchmark ({count} completed leads, tracemalloc)")
+    print("=" * 50)
+    baseline = None
+    for name, build in (('dicts + f-string steps', legacy), ('slotted records', records)):
+        row = measure(build, rows)
+        baseline = baseline or row['bytes']
+        print(
+            f"{name:<24} {row['bytes'] / 2**20:>8.1f} MiB  {row['bytes'] / count:>6.0f} B/lead  peak {row['peak'] / 2**20:>7.1f} MiB  "
+            f"x{baseline / row['bytes']:.2f}  build {row['build']:.3f}s  render {row['render']:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from typing import Dict, List
+
+WORKDIR = tempfile.mkdtemp(prefix='leadgen-resilience-')
+os.environ.update({
+    'GROQ_API_KEY': '',
+    'ANALYTICS_DB_PATH': os.path.join(WORKDIR, 'analytics.db'),
+    'LLM_CACHE_ENABLED': 'false',
+    'PAGE_CACHE_ENABLED': 'false',
+    'DEDUP_ENABLED': 'false',
+    'SUMMARY_REUSE_ENABLED': 'false',
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_groq import FakeGroqClient
+from lead_source import LeadIndex
+from llm_gateway import LLMGateway
+from local_http import LocalSiteHandler, start_servers, stop_servers
+from resilience import BREAKER_DOMAIN_MIN_CALLS, BREAKER_MIN_CALLS, BreakerRegistry
+from scraping import FetchEngine
+from workflow import ApifyClient, ContentSummarizer, EmailGenerator, LeadGenerationWorkflow, WebScraper
+
+HANG_SECONDS = float(os.getenv('BENCH_HANG_SECONDS', '3'))
+LEAD_BUDGET = float(os.getenv('BENCH_LEAD_BUDGET', '1.5'))
+
+
+class APITimeoutError(Exception):
+    pass
+
+
+class FlakyGroqClient(FakeGroqClient):
+    """Every ``hang_every``-th call stalls until the caller's timeout and then fails, like a provider brown-out."""
+
+    def __init__(self, latency: float, hang_every: int, hang: float):
+        super().__init__(latency=latency)
+        self.hang_every = hang_every
+        self.hang = hang
+
+    def create(self, messages: List[Dict], model: str, stream: bool = False, **params):
+        with self._lock:
+            call = len(self.requests) + 1
+        if self.hang_every and call % self.hang_every == 0:
+            with self._lock:
+                self.requests.append({'model': model, 'messages': messages, 'stream': stream, **params})
+            time.sleep(min(self.hang, params.get('timeout') or self.hang))
+            raise APITimeoutError('Request timed out.')
+        return super().create(messages, model, stream=stream, **params)
+
+
+class HangingSiteHandler(LocalSiteHandler):
+    latency = HANG_SECONDS
+
+
+class QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that gave up on a hanging site leave broken pipes behind.
+        pass
+
+
+def start_hanging_servers(count: int) -> List[ThreadingHTTPServer]:
+    servers = []
+    for _ in range(count):
+        server = QuietServer(('127.0.0.1', 0), HangingSiteHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def make_workflow(domains: List[str], count: int, resilient: bool) -> LeadGenerationWorkflow:
+    def breakers(name):
+        min_calls = BREAKER_DOMAIN_MIN_CALLS if name == 'domain' else BREAKER_MIN_CALLS
+        return BreakerRegistry(name, min_calls=min_calls) if resilient else None
+
+    client = FlakyGroqClient(latency=0.02, hang_every=5, hang=HANG_SECONDS)
+    gateway = LLMGateway(client, rpm=0, tpm=0, max_retries=2, backoff=0.05, use_cache=False, breakers=breakers('provider'), use_breakers=resilient)
+    workflow = LeadGenerationWorkflow(max_workers=8, lead_budget=LEAD_BUDGET if resilient else 0, run_budget=0)
+    leads = [{'company_name': f'Company {i}', 'domain': domains[i % len(domains)], 'industry': 'Technology'} for i in range(count)]
+    workflow.apify_client = ApifyClient(LeadIndex(leads))
+    engine = FetchEngine(schemes=('http',), max_retries=1, backoff=0.05, per_domain_concurrency=8, domain_rps=0)
+    workflow.web_scraper = WebScraper(live=True, engine=engine, use_page_cache=False, breakers=breakers('domain'), use_breakers=resilient)
+    workflow.summarizer = ContentSummarizer(use_page_cache=False, gateway=gateway, use_summary_index=False)
+    workflow.email_generator = EmailGenerator(gateway=gateway)
+    return workflow
+
+
+def timed(workflow: LeadGenerationWorkflow, latencies: List[float]):
+    process_lead = workflow._process_lead
+
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return process_lead(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    workflow._process_lead = wrapper
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def main():
+    count = int(os.getenv('BENCH_LEADS', '48'))
+    LocalSiteHandler.latency = 0.01
+    LocalSiteHandler.flaky_every = 0
+    healthy = start_servers(9)
+    hanging = start_hanging_servers(3)
+    domains = [f"127.0.0.1:{server.server_address[1]}" for server in healthy + hanging]
+    print(f"📊 Deadline and circuit breaker benchmark ({count} leads, 3 of 12 sites hang {HANG_SECONDS:g}s, every 5th LLM call stalls)")
+    print("=" * 50)
+
+    try:
+        for resilient in (False, True):
+            workflow = make_workflow(domains, count, resilient)
+            latencies: List[float] = []
+            timed(workflow, latencies)
+            start = time.perf_counter()
+            results = workflow.run_full_workflow(count, 'all', 'partnership')
+            elapsed = time.perf_counter() - start
+            metrics = results['metrics']
+            gateway = workflow.summarizer.gateway.stats()
+            domain = workflow.web_scraper.breakers.stats() if resilient else {'rejected': 0}
+            label = f'budget {LEAD_BUDGET:g}s' if resilient else 'unbounded'
+            print(f"{label:<12} {elapsed:>6.2f}s wall  p50 {percentile(latencies, 0.5):.2f}s  p99 {percentile(latencies, 0.99):.2f}s  "
+                  f"{metrics['completed']} completed / {metrics['skipped']} skipped / {metrics['degraded']} degraded  "
+                  f"{gateway['requests']} LLM requests, {gateway['circuit_open']} LLM / {domain['rejected']} scrapes rejected by breaker")
+    finally:
+        stop_servers(healthy + hanging)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tempfile
+
+from workflow import WebScraper
+from page_cache import PageCache
+from scraping import FetchEngine
+from local_http import LocalSiteHandler, start_servers, stop_servers
+
+
+def bench_fetch(fetches: int = 400, hosts: int = 4, workers: int = 32, latency: float = 0.02) -> dict:
+    LocalSiteHandler.latency = latency
+    LocalSiteHandler.flaky_every = 25
+    servers = start_servers(hosts)
+    domains = [f"127.0.0.1:{server.server_address[1]}" for server in servers]
+    engine = FetchEngine(schemes=('http',), per_domain_concurrency=8, domain_rps=0, backoff=0.01, max_chars=2000)
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            texts = list(pool.map(engine.fetch_text, (domains[i % hosts] for i in range(fetches))))
+        elapsed = time.perf_counter() - start
+    finally:
+        stop_servers(servers)
+
+    assert all(texts), "some fetches returned no text"
+    assert all('ignore me' not in text for text in texts)
+    return {
+        'fetches': fetches,
+        'seconds': round(elapsed, 3),
+        'fetches_per_second': round(fetches / elapsed, 1),
+        **engine.stats
+    }
+
+
+def bench_revalidation(hosts: int = 50, latency: float = 0.02) -> dict:
+    LocalSiteHandler.latency = latency
+    LocalSiteHandler.flaky_every = 0
+    servers = start_servers(hosts)
+    domains = [f"127.0.0.1:{server.server_address[1]}" for server in servers]
+    engine = FetchEngine(schemes=('http',), domain_rps=0, max_chars=2000)
+    cache = PageCache(os.path.join(tempfile.mkdtemp(), 'pages.db'), fresh_seconds=0)
+    scraper = WebScraper(live=True, engine=engine, page_cache=cache)
+
+    try:
+        timings = []
+        for _ in range(2):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                texts = list(pool.map(scraper.scrape_website_content, domains))
+            timings.append(time.perf_counter() - start)
+            assert all(texts)
+    finally:
+        stop_servers(servers)
+
+    return {
+        'cold_seconds': round(timings[0], 3),
+        'revalidate_seconds': round(timings[1], 3),
+        'bytes_downloaded': engine.stats['bytes'],
+        **cache.stats
+    }
+
+
+def main():
+    print("📊 Scraper fetch engine benchmark (local HTTP servers)")
+    print("=" * 50)
+    for key, value in bench_fetch().items():
+        print(f"{key:<20} {value}")
+    
+    print("\n📊 Conditional-request page cache (cold vs. revalidated run)")
+    print("=" * 50)
+    for key, value in bench_revalidation().items():
+        print(f"{key:<20} {value}")
+
+
+if __name__ == "__main__":
+    main()
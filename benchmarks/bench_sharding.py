@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+from typing import Dict, List
+
+WORKDIR = tempfile.mkdtemp(prefix='leadgen-shards-')
+# Set before the project imports; shard processes inherit the environment.
+os.environ.update({
+    'GROQ_API_KEY': '',
+    'ANALYTICS_DB_PATH': os.path.join(WORKDIR, 'analytics.db'),
+    'LLM_CACHE_ENABLED': 'false',
+    'PAGE_CACHE_ENABLED': 'false',
+    'DEDUP_ENABLED': 'false',
+    'SUMMARY_REUSE_ENABLED': 'false',
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_groq import FakeGroqClient
+from lead_source import LeadIndex
+from llm_gateway import LLMGateway
+from local_http import LocalSiteHandler, start_servers, stop_servers
+from scraping import FetchEngine
+from workflow import ApifyClient, ContentSummarizer, EmailGenerator, LeadGenerationWorkflow, WebScraper
+
+PAGE_PARAGRAPHS = int(os.getenv('BENCH_PAGE_PARAGRAPHS', '4000'))
+
+
+def make_leads(domains: List[str], count: int) -> List[Dict]:
+    return [
+        {'company_name': f'Company {i}', 'domain': domains[i % len(domains)], 'industry': 'Technology'}
+        for i in range(count)
+    ]
+
+
+def make_workflow(domains: List[str], count: int, shards: int = 0) -> LeadGenerationWorkflow:
+    """Parse-heavy workflow: whole large pages are extracted and the fake LLM answers instantly."""
+    gateway = LLMGateway(FakeGroqClient(latency=0), rpm=0, tpm=0, use_cache=False)
+    workflow = LeadGenerationWorkflow(max_workers=8, shards=shards, shard_factory=partial(make_workflow, domains, count))
+    workflow.apify_client = ApifyClient(LeadIndex(make_leads(domains, count)))
+    engine = FetchEngine(schemes=('http',), per_domain_concurrency=8, domain_rps=0, max_chars=10 ** 7, max_bytes=10 ** 8)
+    workflow.web_scraper = WebScraper(live=True, engine=engine, use_page_cache=False)
+    workflow.summarizer = ContentSummarizer(use_page_cache=False, gateway=gateway, use_summary_index=False)
+    workflow.email_generator = EmailGenerator(gateway=gateway)
+    return workflow
+
+
+def main():
+    count = int(os.getenv('BENCH_LEADS', '200'))
+    LocalSiteHandler.latency = 0
+    LocalSiteHandler.flaky_every = 0
+    LocalSiteHandler.filler_paragraphs = PAGE_PARAGRAPHS
+    servers = start_servers(16)
+    domains = [f"127.0.0.1:{server.server_address[1]}" for server in servers]
+    cores = os.cpu_count() or 1
+    print(f"📊 Sharded workflow benchmark ({count} leads, {PAGE_PARAGRAPHS} paragraphs per page, {cores} CPU cores)")
+    print("=" * 50)
+
+    try:
+        baseline = None
+        for shards in sorted({0, 2, 4, cores} - {1}):
+            workflow = make_workflow(domains, count, shards)
+            if shards > 1:
+                # Start the processes and warm their clients outside the timed run.
+                workflow.run_full_workflow(shards * 2, 'all', 'partnership')
+            start = time.perf_counter()
+            results = workflow.run_full_workflow(count, 'all', 'partnership')
+            elapsed = time.perf_counter() - start
+            workflow.close()
+
+            outputs = [(result.company, result.status, result.summary, result.email_content) for result in results['processed_results']]
+            assert results['metrics']['completed'] == count, results['metrics']
+            if baseline is None:
+                baseline = (outputs, elapsed)
+            assert outputs == baseline[0], f"{shards} shards changed the results"
+            label = 'in-process' if shards <= 1 else f'{shards} shards'
+            print(f"{label:<12} {count / elapsed:>8.1f} leads/s  {elapsed:>6.2f}s  x{baseline[1] / elapsed:.2f}")
+    finally:
+        stop_servers(servers)
+
+
+if __name__ == "__main__":
+    main()
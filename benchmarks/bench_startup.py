@@ -0,0 +1,69 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+COLD_RUNS = int(os.getenv('BENCH_COLD_RUNS', '7'))
+
+
+def cold_import(module: str) -> Dict[str, float]:
+    """Median wall time of a fresh interpreter importing ``module``, minus a bare interpreter start."""
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True)
+        return time.perf_counter() - start
+
+    bare = statistics.median(run('pass') for _ in range(COLD_RUNS))
+    loaded = statistics.median(run(f'import {module}') for _ in range(COLD_RUNS))
+    return {'seconds': loaded - bare}
+
+
+def heavy_modules(module: str) -> list:
+    code = f"import sys, {module}; print(' '.join(m for m in ('flask', 'requests', 'lxml', 'groq', 'bs4') if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return output.split()
+
+
+def per_request_setup(requests: int = 20) -> Dict[str, float]:
+    from scraping import FetchEngine
+    from workflow import LeadGenerationWorkflow, WebScraper, get_workflow
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        # What every job used to build: its own workflow, fetch engine and connection pool.
+        workflow = LeadGenerationWorkflow()
+        workflow.web_scraper = WebScraper(engine=FetchEngine())
+        workflow.web_scraper.session
+    fresh = (time.perf_counter() - start) / requests
+
+    get_workflow().web_scraper.session
+    start = time.perf_counter()
+    for _ in range(requests):
+        get_workflow().web_scraper.session
+    shared = (time.perf_counter() - start) / requests
+    return {'fresh': fresh, 'shared': shared}
+
+
+def main():
+    print(f"📊 Cold start (median of {COLD_RUNS} fresh interpreters, interpreter start subtracted)")
+    print("=" * 50)
+    for module in ('workflow', 'cli', 'app'):
+        row = cold_import(module)
+        heavy = ', '.join(heavy_modules(module)) or 'none'
+        print(f"import {module:<10} {row['seconds'] * 1000:>8.1f} ms   heavy modules loaded: {heavy}")
+
+    row = per_request_setup()
+    print()
+    print("📊 Per-job workflow setup (building the HTTP session included)")
+    print("=" * 50)
+    print(f"new workflow per job        {row['fresh'] * 1000:>8.3f} ms/job")
+    print(f"shared get_workflow()       {row['shared'] * 1000:>8.3f} ms/job")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('LLM_CACHE_ENABLED', 'false')
+os.environ.setdefault('SUMMARY_REUSE_ENABLED', 'false')
+os.environ.setdefault('PAGE_CACHE_ENABLED', 'false')
+os.environ.setdefault('DEDUP_ENABLED', 'false')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_groq import FakeGroqClient
+from jobs import JobManager
+from llm_gateway import LLMGateway
+from results_store import ResultStore
+import workflow
+
+
+def first_output(streaming: bool, latency: float, lead_count: int) -> dict:
+    workflow.LLM_STREAMING = streaming
+    gateway = LLMGateway(FakeGroqClient(latency=latency), rpm=0, cache=None)
+
+    def workflow_factory():
+        instance = workflow.LeadGenerationWorkflow()
+        instance.summarizer.gateway = gateway
+        instance.email_generator.gateway = gateway
+        return instance
+
+    store = ResultStore(os.path.join(tempfile.mkdtemp(), 'results.db'))
+    manager = JobManager(workflow_factory, store, max_workers=1)
+    start = time.perf_counter()
+    job = manager.submit(lead_count, 'all', 'partnership')
+
+    first_visible = None
+    cursor = 0
+    while True:
+        events = job.wait_for_events(cursor, timeout=1.0)
+        for event in events:
+            if first_visible is None and event['type'] in ('email_delta', 'lead') and (event.get('text') or event.get('email_content')):
+                first_visible = time.perf_counter() - start
+        if events:
+            cursor = events[-1]['seq'] + 1
+        if job.finished and cursor >= job.next_seq:
+            break
+    return {
+        'first_visible': first_visible,
+        'total': time.perf_counter() - start,
+        'events': job.next_seq
+    }
+
+
+def main():
+    latency = float(os.getenv('BENCH_LLM_LATENCY', '1.0'))
+    lead_count = int(os.getenv('BENCH_LEADS', '4'))
+    print(f"📊 Time to first visible email text ({lead_count} leads, {latency:.1f}s per completion)")
+    print("=" * 50)
+    for streaming in (False, True):
+        row = first_output(streaming, latency, lead_count)
+        label = 'streaming' if streaming else 'buffered'
+        print(f"{label:<10} first text after {row['first_visible']:.2f}s  run {row['total']:.2f}s  {row['events']} events")
+
+
+if __name__ == "__main__":
+    main()
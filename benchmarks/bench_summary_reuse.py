@@ -0,0 +1,97 @@
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+os.environ.setdefault('LLM_CACHE_ENABLED', 'false')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_groq import FakeGroqClient
+from llm_gateway import LLMGateway
+from summary_reuse import SummaryIndex
+from workflow import ContentSummarizer
+
+VERTICALS = {
+    'saas': "{name} builds cloud software for growing teams. Our platform automates reporting, billing and customer "
+            "onboarding so operations teams spend less time on spreadsheets. We integrate with the tools you already "
+            "use, offer single sign-on and role based access, and back every plan with around the clock support from "
+            "engineers who know the product. Start a free trial today or book a demo with our sales team.",
+    'clinic': "{name} is a family healthcare clinic offering general practice, pediatrics, diagnostics and preventive "
+              "care. Our doctors and nurses focus on compassionate, evidence based treatment with short waiting times. "
+              "Book appointments online, access lab results through the patient portal and use telehealth visits for "
+              "follow ups. We accept most insurance plans and welcome new patients of all ages.",
+    'agency': "{name} is a full service digital marketing agency. We plan and run search, social and content campaigns "
+              "that turn traffic into revenue, and we report on every channel in plain language. Our team of "
+              "strategists, designers and analysts has helped hundreds of small and mid sized brands grow online. "
+              "Get a free audit of your website and advertising accounts.",
+}
+FILLER = ('modern', 'trusted', 'reliable', 'expert', 'friendly', 'leading', 'local', 'global', 'innovative', 'proven')
+
+
+def make_corpus(count: int, seed: int = 3) -> List[Dict]:
+    rng = random.Random(seed)
+    vocabulary = [f'word{n}' for n in range(5000)]
+    corpus = []
+    for i in range(count):
+        name, domain = f'Company{i} Group', f'company{i}.com'
+        kind = rng.random()
+        if kind < 0.35:
+            # WebScraper's generic fallback page.
+            content = f"{domain} is a professional company providing quality services to clients with a focus on innovation and customer satisfaction."
+            source = 'generic'
+        elif kind < 0.8:
+            words = rng.choice(list(VERTICALS.values())).format(name=name).split()
+            words[rng.randrange(len(words))] = rng.choice(FILLER)
+            content = ' '.join(words)
+            source = 'vertical'
+        else:
+            content = ' '.join(rng.choice(vocabulary) for _ in range(60))
+            source = 'unique'
+        corpus.append({'company_name': name, 'domain': domain, 'content': content, 'source': source})
+    return corpus
+
+
+def run(corpus: List[Dict], index: SummaryIndex = None) -> Dict:
+    client = FakeGroqClient()
+    summarizer = ContentSummarizer(use_page_cache=False, gateway=LLMGateway(client, rpm=0, tpm=0, use_cache=False), summary_index=index, use_summary_index=index is not None)
+    reused_by_source = {'generic': 0, 'vertical': 0, 'unique': 0}
+    leaked = 0
+    start = time.perf_counter()
+    for item in corpus:
+        before = client.request_count
+        summary = summarizer.generate_summary(item['company_name'], item['domain'], item['content'])
+        if client.request_count == before:
+            reused_by_source[item['source']] += 1
+            if item['company_name'] not in summary or summary.count('Company') != 1:
+                leaked += 1
+    return {'llm_calls': client.request_count, 'seconds': time.perf_counter() - start, 'reused': reused_by_source, 'leaked': leaked}
+
+
+def main():
+    count = int(os.getenv('BENCH_LEADS', '3000'))
+    corpus = make_corpus(count)
+    sources = {source: sum(1 for item in corpus if item['source'] == source) for source in ('generic', 'vertical', 'unique')}
+    print(f"📊 Near-duplicate summary reuse ({count} leads: {sources['generic']} generic pages, "
+          f"{sources['vertical']} vertical boilerplate with one word changed, {sources['unique']} unique)")
+    print("=" * 50)
+
+    baseline = run(corpus)
+    print(f"{'no reuse':<16} {baseline['llm_calls']:>5} LLM calls")
+    for threshold in (0.8, 0.9, 0.95):
+        index = SummaryIndex(threshold=threshold)
+        row = run(corpus, index)
+        stats = index.stats()
+        print(
+            f"threshold {threshold:<6} {row['llm_calls']:>5} LLM calls  {stats['llm_calls_avoided']:>5} avoided  "
+            f"hit rate {stats['hit_rate']:>5.1f}%  reused generic/vertical/unique "
+            f"{row['reused']['generic']}/{row['reused']['vertical']}/{row['reused']['unique']}  "
+            f"{row['seconds'] / count * 1000:.2f} ms/lead"
+        )
+        assert row['leaked'] == 0, f"{row['leaked']} reused summaries name the wrong company"
+        assert row['reused']['unique'] == 0
+
+
+if __name__ == "__main__":
+    main()
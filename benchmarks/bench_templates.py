@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+from typing import Dict, List
+
+os.environ.setdefault('LLM_CACHE_ENABLED', 'false')
+os.environ.setdefault('SUMMARY_REUSE_ENABLED', 'false')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflow import ContentSummarizer, EmailGenerator
+from llm_gateway import LLMGateway
+
+
+def legacy_fallback_email(company_name: str, business_summary: str, email_type: str) -> str:
+    templates = {
+        'partnership': f"""Dear {company_name} Team,
+
+I was impressed by your work in {business_summary.lower()} and believe there's a great opportunity for partnership.
+
+At [Your Company], we specialize in helping {company_name.split()[0]} scale their digital presence through data-driven marketing strategies.
+
+Would you be open to a quick 15-minute call next week to explore potential synergies?
+
+Best regards,
+[Your Name]
+[Your Title]
+[Your Company]""",
+
+        'collaboration': f"""Hello {company_name} Team,
+
+I've been following your company's progress in {business_summary.lower()} and am impressed by your innovative approach.
+
+We at [Your Company] have expertise that could complement your efforts and drive mutual growth.
+
+Could we schedule a brief call to discuss collaboration opportunities?
+
+Warm regards,
+[Your Name]
+[Your Title]
+[Your Company]"""
+    }
+    return templates.get(email_type, templates['partnership'])
+
+
+def legacy_fallback_summary(company_name: str, domain: str) -> str:
+    return f"{company_name} is a business operating at {domain}. They provide quality services in their industry with a focus on customer satisfaction and professional delivery."
+
+
+def make_leads(count: int) -> List[Dict]:
+    industries = ['Technology', 'Healthcare', 'Finance', 'Energy', 'Education']
+    return [
+        {'company_name': f'Company{i} Holdings Ltd', 'domain': f'company{i}.com', 'industry': industries[i % len(industries)]}
+        for i in range(count)
+    ]
+
+
+def bench_templates(count: int, email_type: str) -> Dict[str, float]:
+    gateway = LLMGateway(None, rpm=0, tpm=0, use_cache=False)
+    summarizer = ContentSummarizer(use_page_cache=False, gateway=gateway)
+    generator = EmailGenerator(gateway=gateway)
+    templates = generator.templates
+    leads = make_leads(count)
+
+    def legacy():
+        for lead in leads:
+            summary = legacy_fallback_summary(lead['company_name'], lead['domain'])
+            legacy_fallback_email(lead['company_name'], summary, email_type)
+
+    def compiled():
+        summary_template = templates.prompt('summary_fallback')
+        for lead in leads:
+            summary = summary_template.render(company_name=lead['company_name'], domain=lead['domain'])
+            templates.render_fallback_email(email_type, lead['company_name'], summary, lead['industry'])
+
+    def generators():
+        for lead in leads:
+            summary = summarizer.generate_summary(lead['company_name'], lead['domain'], '')
+            generator.generate_personalized_email(lead, summary, email_type)
+
+    lead = leads[0]
+    summary = summarizer.generate_summary(lead['company_name'], lead['domain'], '')
+    if email_type in ('partnership', 'collaboration'):
+        assert summary == legacy_fallback_summary(lead['company_name'], lead['domain'])
+        assert generator.generate_personalized_email(lead, summary, email_type) == legacy_fallback_email(lead['company_name'], summary, email_type)
+
+    timings = {}
+    for name, func in (('legacy f-strings', legacy), ('compiled templates', compiled), ('generators', generators)):
+        start = time.perf_counter()
+        func()
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    count = int(os.getenv('BENCH_LEADS', '100000'))
+    print(f"📊 Fallback template rendering benchmark ({count} leads, summary + email each)")
+    print("=" * 50)
+    for email_type in ('partnership', 'collaboration', 'service_intro'):
+        for name, seconds in bench_templates(count, email_type).items():
+            print(f"{email_type:<14} {name:<18} {seconds:>7.3f}s  {count / seconds:>12,.0f} leads/s")
+
+
+if __name__ == "__main__":
+    main()
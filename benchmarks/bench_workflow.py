@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Every run reuses the same company names, which dedup would skip from the second run on.
+os.environ.setdefault('DEDUP_ENABLED', 'false')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflow import LeadGenerationWorkflow
+
+SCRAPE_LATENCY = float(os.getenv('BENCH_SCRAPE_LATENCY', '0.05'))
+SUMMARY_LATENCY = float(os.getenv('BENCH_SUMMARY_LATENCY', '0.08'))
+EMAIL_LATENCY = float(os.getenv('BENCH_EMAIL_LATENCY', '0.12'))
+
+
+class StubApifyClient:
+    def get_company_leads(self, count: int = 5, industry_filter: str = None) -> List[Dict]:
+        return [
+            {
+                'company_name': f'Company {i}',
+                'email': f'info@company{i}.com',
+                'website': f'https://company{i}.com',
+                'industry': 'Technology'
+            }
+            for i in range(count)
+        ]
+
+
+class StubWebScraper:
+    def scrape_website_content(self, domain: str) -> Optional[str]:
+        time.sleep(SCRAPE_LATENCY)
+        return f"{domain} builds software for modern businesses."
+
+
+class StubSummarizer:
+    def generate_summary(self, company_name: str, domain: str, content: str) -> Optional[str]:
+        time.sleep(SUMMARY_LATENCY)
+        return f"{company_name} ({domain}) builds software."
+
+
+class StubEmailGenerator:
+    def generate_personalized_email(self, lead_data: Dict, business_summary: str, email_type: str = 'partnership', on_delta=None) -> str:
+        time.sleep(EMAIL_LATENCY)
+        return f"Dear {lead_data['company_name']} Team, {business_summary}"
+
+
+def build_workflow() -> LeadGenerationWorkflow:
+    workflow = LeadGenerationWorkflow()
+    workflow.apify_client = StubApifyClient()
+    workflow.web_scraper = StubWebScraper()
+    workflow.summarizer = StubSummarizer()
+    workflow.email_generator = StubEmailGenerator()
+    return workflow
+
+
+def bench_concurrency(lead_count: int = 64, worker_counts=(1, 2, 4, 8, 16, 32)) -> List[Dict]:
+    rows = []
+    baseline = None
+    for workers in worker_counts:
+        workflow = build_workflow()
+        start = time.perf_counter()
+        results = workflow.run_full_workflow(lead_count, 'all', 'partnership', max_workers=workers)
+        elapsed = time.perf_counter() - start
+        
+        companies = [r['company'] for r in results['processed_results']]
+        assert companies == [f'Company {i}' for i in range(lead_count)], "result order changed"
+        assert results['metrics']['completed'] == lead_count
+        
+        baseline = baseline or elapsed
+        rows.append({
+            'workers': workers,
+            'seconds': round(elapsed, 3),
+            'leads_per_second': round(lead_count / elapsed, 1),
+            'speedup': round(baseline / elapsed, 2)
+        })
+    return rows
+
+
+def main():
+    lead_count = int(os.getenv('BENCH_LEADS', '64'))
+    print(f"📊 Workflow concurrency benchmark ({lead_count} leads)")
+    print("=" * 50)
+    for row in bench_concurrency(lead_count):
+        print(f"workers={row['workers']:>3}  {row['seconds']:>7.3f}s  {row['leads_per_second']:>7.1f} leads/s  x{row['speedup']}")
+
+
+if __name__ == "__main__":
+    main()
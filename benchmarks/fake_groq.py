@@ -0,0 +1,55 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+
+class FakeGroqClient:
+    def __init__(self, latency: float = 0.0, malformed_batches: bool = False):
+        self.latency = latency
+        self.malformed_batches = malformed_batches
+        self.requests: List[Dict] = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=self)
+
+    @property
+    def request_count(self) -> int:
+        return len(self.requests)
+
+    def create(self, messages: List[Dict], model: str, stream: bool = False, **params):
+        with self._lock:
+            self.requests.append({'model': model, 'messages': messages, 'stream': stream, **params})
+        if stream:
+            return self._stream(self._answer(messages[-1]['content']))
+        if self.latency:
+            time.sleep(self.latency)
+        return self._response(self._answer(messages[-1]['content']))
+
+    def _stream(self, content: str, pieces: int = 20):
+        # Spread the same total latency over the pieces, so the first one
+        # arrives long before the whole completion would.
+        size = max(1, len(content) // pieces)
+        chunks = [content[i:i + size] for i in range(0, len(content), size)]
+        for chunk in chunks:
+            if self.latency:
+                time.sleep(self.latency / len(chunks))
+            delta = SimpleNamespace(content=chunk)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    def _answer(self, prompt: str) -> str:
+        if 'Inputs:\n' not in prompt:
+            return f"Fake completion for: {prompt.strip().splitlines()[0]}"
+        if self.malformed_batches:
+            return "Sorry, I can't produce JSON right now."
+
+        items = json.loads(prompt.split('Inputs:\n', 1)[1])
+        field = 'email' if '"email"' in prompt else 'summary'
+        return json.dumps({
+            'results': [{'id': item['id'], field: f"Fake {field} for {item['company_name']}"} for item in items]
+        })
+
+    @staticmethod
+    def _response(content: str):
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+PAGE_TEMPLATE = """<html><head><title>{host}</title><style>body {{ color: red; }}</style>
+<script>var tracking = "ignore me";</script></head>
+<body><h1>{host}</h1><p>{host} provides enterprise software and cloud services for growing teams.</p>
+{filler}</body></html>"""
+
+
+class LocalSiteHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    filler_paragraphs = 200
+    flaky_every = 0
+    requests_seen = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with LocalSiteHandler.lock:
+            LocalSiteHandler.requests_seen += 1
+            seen = LocalSiteHandler.requests_seen
+        if self.latency:
+            time.sleep(self.latency)
+        if self.flaky_every and seen % self.flaky_every == 0:
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        host = self.headers.get('Host', 'localhost')
+        filler = '\n'.join(f"<p>Paragraph {i} about {host} services and solutions.</p>" for i in range(self.filler_paragraphs))
+        body = PAGE_TEMPLATE.format(host=host, filler=filler).encode('utf-8')
+        etag = f'"{len(body)}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_servers(count: int = 4) -> List[ThreadingHTTPServer]:
+    servers = []
+    for _ in range(count):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), LocalSiteHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def stop_servers(servers: List[ThreadingHTTPServer]):
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible chat endpoint that throttles like a hosted provider."""
+
+    protocol_version = 'HTTP/1.1'
+    latency = 0.05
+    requests_per_second = 20
+    max_concurrent = 4
+    retry_after = '0.25'
+    lock = threading.Lock()
+    window: List[float] = []
+    in_flight = 0
+    served = 0
+    throttled = 0
+    # Requests still to be answered with a 503, as during a provider outage.
+    fail_next = 0
+    failed = 0
+
+    @classmethod
+    def reset(cls):
+        with cls.lock:
+            cls.window = []
+            cls.in_flight = 0
+            cls.served = 0
+            cls.throttled = 0
+            cls.fail_next = 0
+            cls.failed = 0
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        now = time.monotonic()
+        cls = FakeLLMHandler
+        with cls.lock:
+            failing = cls.fail_next > 0
+            if failing:
+                cls.fail_next -= 1
+                cls.failed += 1
+            cls.window = [stamp for stamp in cls.window if now - stamp < 1.0]
+            allowed = not failing and len(cls.window) < self.requests_per_second and cls.in_flight < self.max_concurrent
+            if allowed:
+                cls.window.append(now)
+                cls.in_flight += 1
+            elif not failing:
+                cls.throttled += 1
+        if failing:
+            self._send_json(503, {'error': {'message': 'Service unavailable', 'type': 'internal_server_error'}})
+            return
+        if not allowed:
+            self._send_json(429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_exceeded'}},
+                            {'retry-after': self.retry_after})
+            return
+
+        try:
+            time.sleep(self.latency)
+            prompt = payload['messages'][-1]['content'].strip().splitlines()[0]
+            self._send_json(200, {
+                'id': 'chatcmpl-local',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': payload.get('model'),
+                'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': f"Fake completion for: {prompt}"}}],
+                'usage': {'prompt_tokens': 10, 'completion_tokens': 10, 'total_tokens': 20}
+            })
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+                cls.served += 1
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_llm_server() -> ThreadingHTTPServer:
+    FakeLLMHandler.reset()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeLLMHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,378 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Every store goes to a scratch directory and nothing real is called, so runs
+# are repeatable and never touch data/ or a paid API.
+WORKDIR = tempfile.mkdtemp(prefix='leadgen-bench-')
+os.environ.update({
+    'GROQ_API_KEY': '',
+    'RESULTS_DB_PATH': os.path.join(WORKDIR, 'results.db'),
+    'ANALYTICS_DB_PATH': os.path.join(WORKDIR, 'analytics.db'),
+    'LLM_CACHE_ENABLED': 'false',
+    'PAGE_CACHE_ENABLED': 'false',
+    'DEDUP_ENABLED': 'false',
+    'SUMMARY_REUSE_ENABLED': 'false',
+    'SCRAPER_DOMAIN_RPS': '0',
+})
+
+from analytics import AnalyticsStore
+from bench_domains import make_leads as make_domain_leads
+from fake_groq import FakeGroqClient
+from lead_source import LeadIndex
+from llm_gateway import LLMGateway
+from local_http import LocalSiteHandler, start_servers, stop_servers
+from scraping import FetchEngine
+from workflow import ApifyClient, ContentSummarizer, DomainExtractor, EmailGenerator, LeadGenerationWorkflow, WebScraper
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+OUTPUT_PATH = os.path.join(ROOT, 'data', 'benchmarks', 'latest.json')
+
+SCALE = float(os.getenv('BENCH_SCALE', '1'))
+LLM_LATENCY = float(os.getenv('BENCH_LLM_LATENCY', '0.05'))
+HTTP_LATENCY = float(os.getenv('BENCH_HTTP_LATENCY', '0.02'))
+LOAD_SECONDS = float(os.getenv('BENCH_LOAD_SECONDS', '5'))
+LOAD_CLIENTS = int(os.getenv('BENCH_LOAD_CLIENTS', '8'))
+# Timed passes per case; the one with the best throughput is kept, since scheduling noise only slows a pass down.
+REPEAT = max(1, int(os.getenv('BENCH_REPEAT', '3')))
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+
+# Differences below these floors are timer and allocator noise, not regressions.
+P95_FLOOR_MS = 1.0
+MEMORY_FLOOR_MB = 1.0
+
+
+def scaled(count: int) -> int:
+    return max(1, int(count * SCALE))
+
+
+def timed_calls(func: Callable, items) -> List[float]:
+    samples = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+class HttpSites:
+    """Local HTTP servers with injected latency, standing in for company homepages."""
+
+    def __init__(self, hosts: int = 4, latency: float = HTTP_LATENCY):
+        LocalSiteHandler.latency = latency
+        LocalSiteHandler.flaky_every = 0
+        LocalSiteHandler.filler_paragraphs = 40
+        self.servers = start_servers(hosts)
+        self.domains = [f"127.0.0.1:{server.server_address[1]}" for server in self.servers]
+
+    def scraper(self) -> WebScraper:
+        engine = FetchEngine(schemes=('http',), per_domain_concurrency=16, domain_rps=0, max_chars=2000)
+        return WebScraper(live=True, engine=engine, use_page_cache=False)
+
+    def leads(self, count: int) -> List[Dict]:
+        return [
+            {
+                'company_name': f'Company {i}',
+                'domain': self.domains[i % len(self.domains)],
+                'industry': ('Technology', 'Healthcare', 'Finance')[i % 3],
+                'employees': '51-200'
+            }
+            for i in range(count)
+        ]
+
+    def close(self):
+        stop_servers(self.servers)
+
+
+def fake_workflow(sites: HttpSites, lead_count: int) -> LeadGenerationWorkflow:
+    gateway = LLMGateway(FakeGroqClient(latency=LLM_LATENCY), rpm=0, tpm=0, use_cache=False)
+    workflow = LeadGenerationWorkflow(max_workers=16, analytics=AnalyticsStore(os.path.join(WORKDIR, 'workflow-analytics.db')))
+    workflow.apify_client = ApifyClient(LeadIndex(sites.leads(lead_count)))
+    workflow.web_scraper = sites.scraper()
+    workflow.summarizer = ContentSummarizer(use_page_cache=False, gateway=gateway, use_summary_index=False)
+    workflow.email_generator = EmailGenerator(gateway=gateway)
+    return workflow
+
+
+# Each case returns latency samples in seconds, one per operation, keyed by metric name.
+# A case that has setup or teardown outside the measured window returns
+# ``(samples, window_seconds)`` so throughput is not diluted by it.
+
+def case_domain_extraction() -> Dict[str, List[float]]:
+    leads = make_domain_leads(scaled(20000))
+    return {'domain_extraction': timed_calls(lambda lead: DomainExtractor.extract_domains([lead]), leads)}
+
+
+def case_web_scraper() -> Dict[str, List[float]]:
+    sites = HttpSites()
+    try:
+        scraper = sites.scraper()
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            samples = list(pool.map(
+                lambda domain: timed_calls(scraper.scrape_website_content, [domain])[0],
+                (sites.domains[i % len(sites.domains)] for i in range(scaled(400)))
+            ))
+    finally:
+        sites.close()
+    return {'web_scraper': samples}
+
+
+def case_fallback_email() -> Dict[str, List[float]]:
+    generator = EmailGenerator(gateway=LLMGateway(None, rpm=0, tpm=0, use_cache=False))
+    summary = 'Company builds cloud software for growing teams.'
+    leads = [{'company_name': f'Company {i} Ltd', 'industry': 'Technology'} for i in range(scaled(20000))]
+    email_types = ('partnership', 'collaboration', 'service_intro')
+    return {'fallback_email': timed_calls(
+        lambda item: generator.generate_personalized_email(item[1], summary, email_types[item[0] % 3]),
+        list(enumerate(leads))
+    )}
+
+
+def _workflow_case(name: str, **options) -> Callable[[], Dict[str, List[float]]]:
+    def run() -> Dict[str, List[float]]:
+        sites = HttpSites()
+        try:
+            lead_count = scaled(64)
+            results = fake_workflow(sites, lead_count).run_full_workflow(lead_count, 'all', 'partnership', **options)
+        finally:
+            sites.close()
+        assert results['metrics']['completed'] == lead_count, results['metrics']
+        return {name: results['metrics']['processing_times']}
+    return run
+
+
+def case_http_load() -> Tuple[Dict[str, List[float]], float]:
+    """Concurrent clients hitting /run_workflow, /results and /api/analytics on a live local server."""
+    import logging
+    from werkzeug.serving import make_server
+    import app as web
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    sites = HttpSites()
+    workflow = fake_workflow(sites, 10)
+    web.job_manager.workflow_factory = lambda: workflow
+    server = make_server('127.0.0.1', 0, web.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    def call(method: str, path: str, form: Dict = None) -> bytes:
+        data = urlencode(form).encode('utf-8') if form else None
+        with urlopen(Request(base + path, data=data, method=method), timeout=30) as response:
+            return response.read()
+
+    def wait_for(job_ids: List[str], timeout: float = 60):
+        deadline = time.monotonic() + timeout
+        for job_id in job_ids:
+            while time.monotonic() < deadline:
+                try:
+                    if json.loads(call('GET', f'/api/jobs/{job_id}'))['status'] in ('completed', 'failed'):
+                        break
+                except HTTPError as e:
+                    # The manager only keeps recent jobs; an evicted one has finished.
+                    if e.code == 404:
+                        break
+                    raise
+                time.sleep(0.05)
+
+    form = {'lead_count': 3, 'industry_filter': 'all', 'email_type': 'partnership'}
+    endpoints = [
+        ('load_run_workflow', 'POST', '/run_workflow', form),
+        ('load_results', 'GET', None, None),
+        ('load_api_analytics', 'GET', '/api/analytics', None),
+    ]
+    samples: Dict[str, List[float]] = {name: [] for name, _, _, _ in endpoints}
+    submitted: List[str] = []
+    errors = [0]
+    lock = threading.Lock()
+
+    try:
+        run_id = json.loads(call('POST', '/run_workflow', form))['job_id']
+        wait_for([run_id])
+        endpoints[1] = ('load_results', 'GET', f'/results?run_id={run_id}', None)
+
+        def client(offset: int):
+            stop = time.monotonic() + LOAD_SECONDS
+            count = offset
+            while time.monotonic() < stop:
+                name, method, path, payload = endpoints[count % len(endpoints)]
+                count += 1
+                start = time.perf_counter()
+                try:
+                    body = call(method, path, payload)
+                except (HTTPError, OSError):
+                    with lock:
+                        errors[0] += 1
+                    continue
+                elapsed = time.perf_counter() - start
+                with lock:
+                    samples[name].append(elapsed)
+                    if name == 'load_run_workflow':
+                        submitted.append(json.loads(body)['job_id'])
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=LOAD_CLIENTS) as pool:
+            list(pool.map(client, range(LOAD_CLIENTS)))
+        window = time.perf_counter() - start
+        # Let queued jobs finish so they do not bleed into whatever runs next.
+        wait_for(submitted)
+    finally:
+        server.shutdown()
+        sites.close()
+    if errors[0]:
+        raise RuntimeError(f"{errors[0]} load requests failed")
+    return samples, window
+
+
+CASES = {
+    'micro': [case_domain_extraction, case_web_scraper, case_fallback_email],
+    'workflow': [
+        _workflow_case('workflow_pool'),
+        _workflow_case('workflow_batched', batch_llm=True),
+        _workflow_case('workflow_pipeline', pipeline=True),
+    ],
+    'load': [case_http_load],
+}
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(case: Callable) -> Dict[str, Dict]:
+    """Keep the best of ``REPEAT`` untraced passes, then run once under tracemalloc for peak memory."""
+    best = None
+    for _ in range(REPEAT):
+        gc.collect()
+        start = time.perf_counter()
+        sampled = case()
+        elapsed = time.perf_counter() - start
+        if isinstance(sampled, tuple):
+            sampled, elapsed = sampled
+        throughput = sum(len(samples) for samples in sampled.values()) / elapsed
+        if best is None or throughput > best[2]:
+            best = (sampled, elapsed, throughput)
+    sampled, elapsed, _ = best
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    rows = {}
+    for name, samples in sampled.items():
+        ordered = sorted(samples)
+        rows[name] = {
+            'operations': len(ordered),
+            'seconds': round(elapsed, 3),
+            'throughput': round(len(ordered) / elapsed, 2),
+            'p50_ms': round(percentile(ordered, 0.50) * 1000, 4),
+            'p95_ms': round(percentile(ordered, 0.95) * 1000, 4),
+            'p99_ms': round(percentile(ordered, 0.99) * 1000, 4),
+            'peak_memory_mb': round(peak / 2**20, 2),
+        }
+    return rows
+
+
+def compare(cases: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    regressions = []
+    for name, row in cases.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if row['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {row['throughput']}/s vs baseline {base['throughput']}/s")
+        if row['p95_ms'] > base['p95_ms'] * (1 + tolerance) and row['p95_ms'] - base['p95_ms'] > P95_FLOOR_MS:
+            regressions.append(f"{name}: p95 {row['p95_ms']} ms vs baseline {base['p95_ms']} ms")
+        if row['peak_memory_mb'] > base['peak_memory_mb'] * (1 + tolerance) and row['peak_memory_mb'] - base['peak_memory_mb'] > MEMORY_FLOOR_MB:
+            regressions.append(f"{name}: peak memory {row['peak_memory_mb']} MiB vs baseline {base['peak_memory_mb']} MiB")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Lead generation performance suite')
+    parser.add_argument('--only', default=','.join(CASES), help=f"Comma-separated groups to run ({', '.join(CASES)})")
+    parser.add_argument('--output', default=OUTPUT_PATH, help='Where to write this run as JSON')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Write this run to --baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float, default=float(os.getenv('BENCH_TOLERANCE', '0.25')),
+                        help='Allowed fractional slowdown before a metric counts as a regression')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    groups = [group.strip() for group in args.only.split(',') if group.strip()]
+    unknown = [group for group in groups if group not in CASES]
+    if unknown:
+        print(f"❌ Unknown group(s): {', '.join(unknown)}", file=sys.stderr)
+        return EXIT_REGRESSION
+
+    print(f"📊 Performance suite ({', '.join(groups)}; scale {SCALE:g})")
+    print("=" * 50)
+    cases = {}
+    for group in groups:
+        for case in CASES[group]:
+            for name, row in measure(case).items():
+                cases[name] = row
+                print(
+                    f"{name:<20} {row['throughput']:>10.1f} ops/s  p50 {row['p50_ms']:>9.3f} ms  p95 {row['p95_ms']:>9.3f} ms  "
+                    f"p99 {row['p99_ms']:>9.3f} ms  peak {row['peak_memory_mb']:>7.2f} MiB"
+                )
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': SCALE,
+        'cases': cases
+    }
+    target = args.baseline if args.save_baseline else args.output
+    directory = os.path.dirname(target)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(target, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+        handle.write('\n')
+    print(f"💾 Wrote {target}")
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return EXIT_OK
+
+    with open(args.baseline, encoding='utf-8') as handle:
+        baseline = json.load(handle)
+    if baseline.get('scale') != SCALE:
+        print(f"⚠️ Baseline was recorded at scale {baseline.get('scale')}, not {SCALE:g}; skipping comparison")
+        return EXIT_OK
+    regressions = compare(cases, baseline.get('cases', {}), args.tolerance)
+    for regression in regressions:
+        print(f"❌ Regression: {regression}")
+    if regressions:
+        return EXIT_REGRESSION
+    print(f"✅ Within {args.tolerance:.0%} of baseline ({args.baseline})")
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+from typing import Callable, Dict, Optional, Set
+
+from lead_io import lead_key, result_key
+from records import LeadResult, Step
+
+CHECKPOINT_FSYNC = os.getenv('CHECKPOINT_FSYNC', 'false').lower() in ('1', 'true', 'yes')
+
+FINISHED_STATUSES = ('Completed', 'Skipped')
+# Skips that may well go the other way next time, e.g. a site that was down.
+RETRYABLE_STEPS = (Step.SCRAPE_FAILED,)
+
+
+def is_retryable(lead_result: LeadResult) -> bool:
+    steps = lead_result.steps
+    return lead_result.status == 'Skipped' and bool(steps) and steps[-1] in RETRYABLE_STEPS
+
+
+class CheckpointJournal:
+    """Append-only JSONL record of per-lead progress for one batch.
+
+    Every finished ``lead_result`` is appended as soon as its lead reaches a
+    terminal status, and each summary as soon as it is generated, so after a
+    crash a resumed run can replay finished leads and reuse paid-for summaries.
+    Leads that ended in ``Error``, were skipped for a retryable reason (see
+    ``is_retryable``) or never finished are processed again.
+    """
+
+    def __init__(self, path: str, fsync: bool = CHECKPOINT_FSYNC):
+        self.path = path
+        self.fsync = fsync
+        self._results: Dict[tuple, LeadResult] = {}
+        self._summaries: Dict[tuple, str] = {}
+        self._retryable: Set[tuple] = set()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        torn = self._load()
+        self._handle = open(path, 'a', encoding='utf-8')
+        if torn:
+            # A crash mid-write leaves a partial last line; start on a fresh one.
+            self._handle.write('\n')
+            self._handle.flush()
+
+    def _load(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        torn = False
+        with open(self.path, 'r', encoding='utf-8') as handle:
+            for line in handle:
+                torn = not line.endswith('\n')
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                key = tuple(entry.get('key') or ())
+                if entry.get('type') == 'result':
+                    self._results[key] = LeadResult.from_dict(entry['result'])
+                    if entry.get('retryable'):
+                        self._retryable.add(key)
+                    else:
+                        self._retryable.discard(key)
+                elif entry.get('type') == 'summary':
+                    self._summaries[key] = entry['summary']
+        return torn
+
+    def _append(self, entry: Dict):
+        line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            self._handle.write(line)
+            self._handle.flush()
+            if self.fsync:
+                os.fsync(self._handle.fileno())
+
+    def finished(self, lead: Dict) -> Optional[LeadResult]:
+        """The stored result for ``lead`` if an earlier run finished it, else None."""
+        key = lead_key(lead)
+        result = self._results.get(key)
+        if result is not None and result.status in FINISHED_STATUSES and key not in self._retryable:
+            return result
+        return None
+
+    def summary(self, lead_result: LeadResult) -> Optional[str]:
+        return self._summaries.get(result_key(lead_result))
+
+    def lead_summary(self, lead: Dict) -> Optional[str]:
+        return self._summaries.get(lead_key(lead))
+
+    def record_summary(self, lead_result: LeadResult, summary: str):
+        key = result_key(lead_result)
+        self._summaries[key] = summary
+        self._append({'type': 'summary', 'key': key, 'summary': summary})
+
+    def record_result(self, lead_result: LeadResult):
+        key = result_key(lead_result)
+        entry = {'type': 'result', 'key': key, 'result': dict(lead_result)}
+        self._results[key] = lead_result
+        if is_retryable(lead_result):
+            self._retryable.add(key)
+            entry['retryable'] = True
+        else:
+            self._retryable.discard(key)
+        self._append(entry)
+
+    def stats(self) -> Dict:
+        return {
+            'results': len(self._results),
+            'finished': sum(1 for key, result in self._results.items()
+                            if result.status in FINISHED_STATUSES and key not in self._retryable),
+            'summaries': len(self._summaries)
+        }
+
+    def close(self):
+        with self._lock:
+            if not self._handle.closed:
+                self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CheckpointRelay:
+    """Stands in for the journal inside a shard process.
+
+    Summaries the parent already journaled are handed in with the chunk, and
+    new ones are passed to ``report`` for the parent to journal. Results are
+    journaled by the parent as they come back, so they are not relayed.
+    """
+
+    def __init__(self, summaries: Dict[tuple, str], report: Callable[[Dict], None]):
+        self._summaries = summaries
+        self._report = report
+
+    def summary(self, lead_result: LeadResult) -> Optional[str]:
+        return self._summaries.get(result_key(lead_result))
+
+    def record_summary(self, lead_result: LeadResult, summary: str):
+        self._summaries[result_key(lead_result)] = summary
+        self._report({'company': lead_result.company, 'email': lead_result.email, 'website': lead_result.website,
+                      'summary': summary})
+
+    def record_result(self, lead_result: LeadResult):
+        pass
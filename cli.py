@@ -0,0 +1,197 @@
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from functools import partial
+from typing import Dict, Iterable, Iterator
+
+from dotenv import load_dotenv
+
+# Before the project imports, which read their settings at import time.
+load_dotenv()
+
+from checkpoint import CheckpointJournal
+from lead_io import ResultWriter, batched, detect_format, iter_leads, lead_key, read_results, result_key
+
+EXIT_OK = 0
+EXIT_USAGE = 1
+EXIT_FAILURE_THRESHOLD = 2
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    def error(self, message):
+        # argparse exits with 2 on bad arguments, which would read as a failed run.
+        self.print_usage(sys.stderr)
+        self.exit(EXIT_USAGE, f"{self.prog}: error: {message}\n")
+
+
+def parse_args(argv=None):
+    parser = _ArgumentParser(description='E2M AI Lead Generation - batch runner')
+    parser.add_argument('--input', '-i', required=True, help='Lead list (.csv or .jsonl, "-" for stdin)')
+    parser.add_argument('--output', '-o', required=True, help='Results file (.csv or .jsonl, "-" for stdout)')
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'], help='Override input format detection')
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'], help='Override output format detection')
+    parser.add_argument('--email-type', default='partnership', help='Email template type')
+    parser.add_argument('--workers', '--concurrency', type=int, default=None, help='Concurrent leads in flight')
+    parser.add_argument('--batch-llm', action='store_true', help='Pack several leads into each LLM request')
+    parser.add_argument('--pipeline', action='store_true', help='Run scrape, summarize and email as separate pipelined stages')
+    parser.add_argument('--shards', type=int, default=None, help='Worker processes to spread leads over, partitioned by domain')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='Contact domains again even if contacted within DEDUP_WINDOW_DAYS (also DEDUP_ENABLED=false)')
+    parser.add_argument('--dedup-seed', action='append', default=[], help='Prior results file to load into the dedup index')
+    parser.add_argument('--checkpoint', help='Journal each finished lead to this file so an interrupted run can be resumed')
+    parser.add_argument('--resume', action='store_true',
+                        help='Replay leads finished in --checkpoint; without one, append to --output skipping leads it has')
+    parser.add_argument('--dry-run', action='store_true', help='Validate input and resolve domains without scraping or LLM calls')
+    parser.add_argument('--progress-every', type=float, default=10.0, help='Seconds between progress lines (0 disables)')
+    parser.add_argument('--max-errors', type=int, default=None, help='Stop and exit non-zero once this many leads have errored')
+    parser.add_argument('--max-error-rate', type=float, default=None, help='Exit non-zero if errors exceed this fraction of processed leads')
+    return parser.parse_args(argv)
+
+
+def _log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+def _finished_keys(args) -> Counter:
+    if not args.resume or args.checkpoint or args.output == '-' or not os.path.exists(args.output):
+        return Counter()
+    return Counter(result_key(row) for row in read_results(args.output, args.output_format))
+
+
+def _skip_finished(leads: Iterable[Dict], finished: Counter, skipped: list) -> Iterator[Dict]:
+    for lead in leads:
+        key = lead_key(lead)
+        if finished[key] > 0:
+            finished[key] -= 1
+            skipped[0] += 1
+            continue
+        yield lead
+
+
+def _failed(metrics: Dict) -> int:
+    return metrics['errors'] - metrics['skipped']
+
+
+def _progress_line(metrics: Dict, elapsed: float) -> str:
+    rate = metrics['total_processed'] / elapsed if elapsed else 0
+    return (
+        f"⏳ {metrics['total_processed']} leads in {elapsed:.1f}s ({rate:.1f} leads/s): "
+        f"{metrics['completed']} completed, {metrics['skipped']} skipped, {_failed(metrics)} errors"
+    )
+
+
+def _shard_workflow(dedup: bool):
+    from workflow import LeadGenerationWorkflow
+    from dedup import DedupIndex
+
+    # Shard processes open their own handle on the same dedup database the parent seeded.
+    return LeadGenerationWorkflow(dedup_index=DedupIndex() if dedup else None, use_dedup=dedup)
+
+
+def dry_run(leads: Iterable[Dict]) -> int:
+    from workflow import DomainExtractor
+
+    counts = Counter()
+    domains = set()
+    for chunk in batched(leads, 1000):
+        for domain, error in DomainExtractor.extract_domains(chunk):
+            counts['leads'] += 1
+            if error:
+                counts['unresolved'] += 1
+            else:
+                domains.add(domain)
+    _log(
+        f"🔎 Dry run: {counts['leads']} leads to process, {len(domains)} distinct domains, "
+        f"{counts['unresolved']} without a usable domain"
+    )
+    return EXIT_OK
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.checkpoint and not args.resume and os.path.exists(args.checkpoint) and os.path.getsize(args.checkpoint):
+        _log(f"❌ Checkpoint {args.checkpoint} already exists; pass --resume to continue it or remove it to start over")
+        return EXIT_USAGE
+    checkpoint = CheckpointJournal(args.checkpoint) if args.checkpoint else None
+
+    finished = _finished_keys(args)
+    resumed = [0]
+    leads = iter_leads(args.input, args.input_format or detect_format(args.input, 'csv'))
+    if finished:
+        leads = _skip_finished(leads, finished, resumed)
+
+    if args.dry_run:
+        if checkpoint is not None:
+            leads = (lead for lead in leads if checkpoint.finished(lead) is None)
+        status = dry_run(leads)
+        if resumed[0]:
+            _log(f"⏭️ {resumed[0]} leads already have results in {args.output}")
+        if checkpoint is not None:
+            _log(f"⏭️ {checkpoint.stats()['finished']} leads already finished in {args.checkpoint}")
+            checkpoint.close()
+        return status
+
+    from workflow import LeadGenerationWorkflow
+    from dedup import DEDUP_ENABLED, DedupIndex
+    from summary_reuse import get_summary_reuse_stats
+
+    dedup_index = None
+    if not args.no_dedup and (DEDUP_ENABLED or args.dedup_seed):
+        dedup_index = DedupIndex()
+        for seed in args.dedup_seed:
+            _log(f"📥 Loaded {dedup_index.bulk_load(read_results(seed))} prior contacts from {seed}")
+
+    workflow = LeadGenerationWorkflow(max_workers=args.workers, dedup_index=dedup_index, use_dedup=dedup_index is not None,
+                                      checkpoint=checkpoint, shards=args.shards,
+                                      shard_factory=partial(_shard_workflow, dedup_index is not None))
+    metrics = {}
+    start = time.perf_counter()
+    last_progress = start
+    aborted = False
+
+    # With a checkpoint, finished leads are replayed from it, so the output is rewritten in full.
+    with ResultWriter(args.output, args.output_format, append=args.resume and checkpoint is None) as writer:
+        results = workflow.run_stream(leads, args.email_type, metrics=metrics, batch_llm=args.batch_llm or None,
+                                      pipeline=args.pipeline or None)
+        for result in results:
+            writer.write(result)
+            now = time.perf_counter()
+            if args.progress_every and now - last_progress >= args.progress_every:
+                _log(_progress_line(metrics, now - start))
+                last_progress = now
+            if args.max_errors is not None and _failed(metrics) >= args.max_errors:
+                aborted = True
+                results.close()
+                break
+
+    workflow.close()
+    if checkpoint is not None:
+        checkpoint.close()
+    elapsed = time.perf_counter() - start
+    if metrics.get('resumed'):
+        _log(f"⏭️ Resumed: {metrics['resumed']} leads replayed from {args.checkpoint}")
+    if resumed[0]:
+        _log(f"⏭️ Resumed: {resumed[0]} leads already had results in {args.output}")
+    _log(_progress_line(metrics, elapsed).replace('⏳', '✅', 1))
+    reuse = get_summary_reuse_stats()
+    if reuse['lookups']:
+        _log(f"♻️ Near-duplicate summaries reused: {reuse['hits']}/{reuse['lookups']} ({reuse['hit_rate']}%), "
+             f"{reuse['llm_calls_avoided']} LLM calls avoided")
+    if metrics.get('degraded'):
+        _log(f"⚠️ Degraded: {metrics['degraded']} leads fell back after a deadline or open circuit")
+
+    failed = _failed(metrics)
+    if aborted:
+        _log(f"❌ Stopped after {failed} errors (--max-errors {args.max_errors})")
+        return EXIT_FAILURE_THRESHOLD
+    if args.max_error_rate is not None and metrics['total_processed'] and failed / metrics['total_processed'] > args.max_error_rate:
+        _log(f"❌ Error rate {failed / metrics['total_processed']:.1%} exceeds --max-error-rate {args.max_error_rate:.1%}")
+        return EXIT_FAILURE_THRESHOLD
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+import difflib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from domains import site_key
+from shared import Shared
+
+DEDUP_ENABLED = os.getenv('DEDUP_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+DEDUP_DB_PATH = os.getenv('DEDUP_DB_PATH', os.path.join('data', 'dedup.db'))
+DEDUP_WINDOW_DAYS = float(os.getenv('DEDUP_WINDOW_DAYS', '30'))
+DEDUP_FUZZY_NAMES = os.getenv('DEDUP_FUZZY_NAMES', 'true').lower() in ('1', 'true', 'yes')
+DEDUP_NAME_THRESHOLD = float(os.getenv('DEDUP_NAME_THRESHOLD', '0.92'))
+
+NON_ALNUM = re.compile(r'[^a-z0-9 ]+')
+LEGAL_SUFFIXES = frozenset({
+    'inc', 'incorporated', 'llc', 'llp', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+    'plc', 'gmbh', 'ag', 'sa', 'pvt', 'private', 'pte', 'bv', 'srl', 'the'
+})
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    domain TEXT PRIMARY KEY,
+    company_key TEXT,
+    company_name TEXT,
+    last_contacted REAL NOT NULL,
+    times INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_company_key ON contacts (company_key);
+"""
+
+
+def company_key(name: Optional[str]) -> str:
+    tokens = NON_ALNUM.sub(' ', (name or '').lower()).split()
+    return ' '.join(token for token in tokens if token not in LEGAL_SUFFIXES)
+
+
+class DedupIndex:
+    """Contacted companies, keyed by registrable domain so shop.example.com and example.com count as one."""
+
+    def __init__(self, path: str = DEDUP_DB_PATH, window_days: float = DEDUP_WINDOW_DAYS,
+                 fuzzy_names: bool = DEDUP_FUZZY_NAMES, name_threshold: float = DEDUP_NAME_THRESHOLD):
+        self.path = path
+        self.window_seconds = window_days * 86400 if window_days > 0 else None
+        self.fuzzy_names = fuzzy_names
+        self.name_threshold = name_threshold
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._domains: Dict[str, float] = {}
+        self._names: Dict[str, str] = {}
+        self._name_blocks: Dict[str, Set[str]] = {}
+        self._in_flight: Dict[str, str] = {}
+        self.stats = {'checked': 0, 'duplicate_domain': 0, 'duplicate_name': 0, 'duplicate_in_run': 0, 'recorded': 0}
+
+        directory = os.path.dirname(path)
+        if directory and path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        for domain, key, last_contacted in conn.execute('SELECT domain, company_key, last_contacted FROM contacts'):
+            self._remember(domain, key, last_contacted)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, domain: str, key: Optional[str], last_contacted: float):
+        if last_contacted >= self._domains.get(domain, 0):
+            self._domains[domain] = last_contacted
+        if key:
+            self._names[key] = domain
+            if self.fuzzy_names:
+                self._name_blocks.setdefault(key.split()[0], set()).add(key)
+
+    def _within_window(self, last_contacted: float, now: float) -> bool:
+        return self.window_seconds is None or now - last_contacted <= self.window_seconds
+
+    def _match_name(self, key: str, now: float) -> Optional[str]:
+        if not key:
+            return None
+        domain = self._names.get(key)
+        if domain and self._within_window(self._domains.get(domain, 0), now):
+            return domain
+        if not self.fuzzy_names:
+            return None
+        for candidate in self._name_blocks.get(key.split()[0], ()):
+            if candidate == key:
+                continue
+            if difflib.SequenceMatcher(None, key, candidate).ratio() >= self.name_threshold:
+                domain = self._names[candidate]
+                if self._within_window(self._domains.get(domain, 0), now):
+                    return domain
+        return None
+
+    def check(self, domain: Optional[str], company_name: Optional[str] = None) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            return self._check_locked(site_key(domain), company_key(company_name), now)
+
+    def _check_locked(self, domain: Optional[str], key: str, now: float) -> Optional[str]:
+        self.stats['checked'] += 1
+        if domain and domain in self._in_flight:
+            self.stats['duplicate_in_run'] += 1
+            return f"Duplicate of {self._in_flight[domain]} earlier in this run"
+
+        last_contacted = self._domains.get(domain) if domain else None
+        if last_contacted is not None and self._within_window(last_contacted, now):
+            self.stats['duplicate_domain'] += 1
+            days = (now - last_contacted) / 86400
+            return f"{domain} already contacted {days:.0f} days ago"
+
+        matched = self._match_name(key, now)
+        if matched and matched != domain:
+            self.stats['duplicate_name'] += 1
+            return f"Company name matches previously contacted {matched}"
+        return None
+
+    def claim(self, domain: Optional[str], company_name: Optional[str] = None) -> Optional[str]:
+        now = time.time()
+        domain = site_key(domain)
+        with self._lock:
+            reason = self._check_locked(domain, company_key(company_name), now)
+            if reason is None and domain:
+                self._in_flight[domain] = company_name or domain
+            return reason
+
+    def release(self, domain: Optional[str]):
+        if domain:
+            with self._lock:
+                self._in_flight.pop(site_key(domain), None)
+
+    def record(self, domain: Optional[str], company_name: Optional[str] = None, contacted_at: float = None):
+        if domain:
+            self.bulk_record([(domain, company_name, contacted_at or time.time())])
+
+    def bulk_record(self, entries: List[tuple]):
+        rows = [(site_key(domain), company_key(name), name, when) for domain, name, when in entries if domain]
+        if not rows:
+            return
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                'INSERT INTO contacts (domain, company_key, company_name, last_contacted) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(domain) DO UPDATE SET company_key = excluded.company_key, company_name = excluded.company_name, '
+                'last_contacted = MAX(last_contacted, excluded.last_contacted), times = times + 1',
+                rows
+            )
+        with self._lock:
+            for domain, key, _, when in rows:
+                self._in_flight.pop(domain, None)
+                self._remember(domain, key, when)
+            self.stats['recorded'] += len(rows)
+
+    def bulk_load(self, results: Iterable[Dict], contacted_at: float = None, batch_size: int = 1000) -> int:
+        contacted_at = contacted_at or time.time()
+        loaded = 0
+        batch = []
+        for result in results:
+            if result.get('status') != 'Completed' or not result.get('domain'):
+                continue
+            batch.append((result['domain'], result.get('company') or result.get('company_name'), contacted_at))
+            if len(batch) >= batch_size:
+                self.bulk_record(batch)
+                loaded += len(batch)
+                batch = []
+        if batch:
+            self.bulk_record(batch)
+            loaded += len(batch)
+        return loaded
+
+    def __contains__(self, domain: str) -> bool:
+        with self._lock:
+            last_contacted = self._domains.get(site_key(domain))
+            return last_contacted is not None and self._within_window(last_contacted, time.time())
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+
+_shared_index: Shared[DedupIndex] = Shared(lambda: DedupIndex() if DEDUP_ENABLED else None)
+
+
+def get_dedup_index() -> Optional[DedupIndex]:
+    return _shared_index.get()
@@ -0,0 +1,88 @@
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import tldextract
+
+URL_HOST_PATTERN = re.compile(r'^(?:[a-z][a-z0-9+.\-]*://)?(?:[^@/?#]*@)?([^/?#:\s]+)(:\d+)?', re.IGNORECASE)
+HOSTNAME_PATTERN = re.compile(r'^(?:[a-z0-9](?:[a-z0-9\-_]{0,61}[a-z0-9])?\.)+(?:[a-z]{2,63}|xn--[a-z0-9\-]{2,59})$')
+IPV4_PATTERN = re.compile(r'^(?:\d{1,3}\.){3}\d{1,3}$')
+
+# Public Suffix List snapshot bundled with tldextract (private suffixes such as
+# github.io included); nothing is fetched over the network.
+PUBLIC_SUFFIXES = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None, include_psl_private_domains=True)
+
+FREE_MAIL_DOMAINS = frozenset({
+    'gmail.com', 'googlemail.com', 'yahoo.com', 'yahoo.co.uk', 'yahoo.co.in', 'yahoo.in', 'ymail.com', 'rocketmail.com',
+    'hotmail.com', 'hotmail.co.uk', 'hotmail.fr', 'outlook.com', 'outlook.in', 'live.com', 'msn.com',
+    'aol.com', 'icloud.com', 'me.com', 'mac.com', 'protonmail.com', 'proton.me', 'pm.me',
+    'gmx.com', 'gmx.de', 'gmx.net', 'mail.com', 'email.com', 'zoho.com', 'zohomail.com',
+    'yandex.com', 'yandex.ru', 'mail.ru', 'inbox.ru', 'qq.com', '163.com', '126.com', 'sina.com',
+    'rediffmail.com', 'fastmail.com', 'tutanota.com', 'hey.com', 'web.de', 't-online.de',
+    'libero.it', 'orange.fr', 'free.fr', 'laposte.net', 'comcast.net', 'verizon.net', 'att.net', 'sbcglobal.net'
+})
+
+
+@lru_cache(maxsize=65536)
+def canonical_host(host: str) -> Optional[str]:
+    """The host as it is fetched: lowercased and without ``www.``; None if it is not a valid site host."""
+    host = host.strip().rstrip('.').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if IPV4_PATTERN.match(host):
+        return host
+    if not HOSTNAME_PATTERN.match(host):
+        return None
+    parts = PUBLIC_SUFFIXES(host)
+    if parts.suffix and not parts.domain:
+        return None
+    return host
+
+
+@lru_cache(maxsize=65536)
+def registrable_domain(host: str) -> Optional[str]:
+    """The domain a host was registered under (shop.example.co.uk -> example.co.uk)."""
+    host = canonical_host(host)
+    if host is None or IPV4_PATTERN.match(host):
+        return host
+
+    parts = PUBLIC_SUFFIXES(host)
+    if parts.suffix:
+        return parts.top_domain_under_public_suffix
+    # Not under a public suffix (internal or test TLDs): fall back to the last two labels.
+    return '.'.join(host.split('.')[-2:])
+
+
+def site_key(host: Optional[str]) -> Optional[str]:
+    """What identifies a company's site for deduplication; hosts with a port are kept whole."""
+    if not host:
+        return None
+    return registrable_domain(host) or host
+
+
+def host_from_url(url: str) -> Tuple[Optional[str], Optional[str]]:
+    match = URL_HOST_PATTERN.match(url.strip())
+    if not match:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+@lru_cache(maxsize=65536)
+def normalize_host(value: str) -> Optional[str]:
+    host, port = host_from_url(value)
+    if not host:
+        return None
+    if port:
+        return f"{host.lower()}{port}"
+    return canonical_host(host)
+
+
+def domain_from_email(email: str) -> Optional[str]:
+    local, at, host = email.strip().rpartition('@')
+    if not at or not local or '@' in local:
+        return None
+    return canonical_host(host) if host else None
+
+
+def is_free_mail(domain: Optional[str]) -> bool:
+    return bool(domain) and (domain in FREE_MAIL_DOMAINS or registrable_domain(domain) in FREE_MAIL_DOMAINS)
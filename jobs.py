@@ -0,0 +1,198 @@
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+TERMINAL_STATUSES = ('completed', 'failed')
+DELTA_FLUSH_CHARS = 48
+DELTA_FLUSH_SECONDS = 0.15
+
+
+class Job:
+    """A background run and the events it emits, numbered by ``seq`` for SSE resumption.
+
+    Once the job finishes its events are compacted: a completed job keeps only
+    its start and completion events, since its results are in the ResultStore
+    under ``run_id``; a failed one drops its email drafts. Events keep their
+    ``seq``, so cursors held by subscribers stay valid.
+    """
+
+    def __init__(self, params: Dict):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = 'queued'
+        self.total = 0
+        self.completed = 0
+        self.events: List[Dict] = []
+        self.next_seq = 0
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self._drafts: Dict[int, Dict] = {}
+        self._draft_count = 0
+        self._condition = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def _emit(self, event_type: str, **payload):
+        event = {'seq': self.next_seq, 'type': event_type, **payload}
+        self.next_seq += 1
+        self.events.append(event)
+        self._condition.notify_all()
+
+    def _events_since(self, since: int) -> List[Dict]:
+        return self.events[bisect_left(self.events, since, key=lambda event: event['seq']):]
+
+    def _compact(self, keep: tuple):
+        self.events = [event for event in self.events if event['type'] in keep]
+        self._drafts.clear()
+
+    def mark_running(self):
+        with self._condition:
+            self.status = 'running'
+            self._emit('started', params=self.params)
+
+    def record_email_delta(self, lead_result: Dict, text: str):
+        # Tokens are coalesced so a 400-token email becomes a handful of events
+        # rather than one per token.
+        with self._condition:
+            draft = self._drafts.get(id(lead_result))
+            if draft is None:
+                draft = {'id': self._draft_count, 'pending': [], 'size': 0, 'flushed_at': 0.0}
+                self._drafts[id(lead_result)] = draft
+                self._draft_count += 1
+            draft['pending'].append(text)
+            draft['size'] += len(text)
+            if draft['size'] >= DELTA_FLUSH_CHARS or time.monotonic() - draft['flushed_at'] >= DELTA_FLUSH_SECONDS:
+                self._flush_draft(draft, lead_result)
+
+    def _flush_draft(self, draft: Dict, lead_result: Dict):
+        if draft['pending']:
+            self._emit('email_delta', draft=draft['id'], company=lead_result.get('company'), text=''.join(draft['pending']))
+            draft['pending'] = []
+            draft['size'] = 0
+        draft['flushed_at'] = time.monotonic()
+
+    def record_lead(self, lead_result: Dict, total: int):
+        with self._condition:
+            self.total = total
+            self.completed += 1
+            draft = self._drafts.pop(id(lead_result), None)
+            if draft:
+                self._flush_draft(draft, lead_result)
+            self._emit(
+                'lead',
+                company=lead_result.get('company'),
+                status=lead_result.get('status'),
+                error=lead_result.get('error'),
+                degraded=lead_result.get('degraded'),
+                steps=list(lead_result.get('processing_steps', [])),
+                draft=draft['id'] if draft else None,
+                domain=lead_result.get('domain'),
+                industry=lead_result.get('industry'),
+                summary=lead_result.get('summary'),
+                email_type=lead_result.get('email_type'),
+                email_content=lead_result.get('email_content'),
+                completed=self.completed,
+                total=total
+            )
+
+    def mark_completed(self, result: Dict):
+        with self._condition:
+            self.result = result
+            self.status = 'completed'
+            self.finished_at = datetime.now()
+            self._emit('completed', run_id=result.get('run_id'), metrics=result.get('metrics', {}),
+                       completed=self.completed, total=self.total)
+            self._compact(('started', 'completed'))
+
+    def mark_failed(self, error: str):
+        with self._condition:
+            self.error = error
+            self.status = 'failed'
+            self.finished_at = datetime.now()
+            self._emit('failed', error=error)
+            self._compact(('started', 'lead', 'failed'))
+
+    def wait_for_events(self, since: int, timeout: float = 15.0) -> List[Dict]:
+        with self._condition:
+            if self.next_seq <= since and not self.finished:
+                self._condition.wait(timeout)
+            return self._events_since(since)
+
+    def to_dict(self, since: int = 0) -> Dict:
+        with self._condition:
+            return {
+                'job_id': self.id,
+                'status': self.status,
+                'completed': self.completed,
+                'total': self.total,
+                'error': self.error,
+                'run_id': self.result['run_id'] if self.result else None,
+                'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'events': self._events_since(since),
+                'next_since': self.next_seq
+            }
+
+
+class JobManager:
+    def __init__(self, workflow_factory: Callable, result_store, max_workers: int = 2, max_jobs: int = 100):
+        self.workflow_factory = workflow_factory
+        self.result_store = result_store
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-worker')
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, lead_count: int, industry_filter: str, email_type: str) -> Job:
+        job = Job({
+            'lead_count': lead_count,
+            'industry_filter': industry_filter,
+            'email_type': email_type
+        })
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _evict_finished(self):
+        while len(self._jobs) > self.max_jobs:
+            oldest = next((job_id for job_id, job in self._jobs.items() if job.finished), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest]
+
+    def _run(self, job: Job):
+        job.mark_running()
+        try:
+            workflow = self.workflow_factory()
+            results = workflow.run_full_workflow(
+                job.params['lead_count'],
+                job.params['industry_filter'],
+                job.params['email_type'],
+                progress_callback=job.record_lead,
+                email_delta_callback=job.record_email_delta
+            )
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.result_store.save_run(job.id, results['metrics'], results['filters'], timestamp, results['processed_results'])
+            job.mark_completed({
+                'run_id': job.id,
+                'metrics': results['metrics'],
+                'filters': results['filters'],
+                'timestamp': timestamp
+            })
+        except Exception as e:
+            print(f"Error running job {job.id}: {e}")
+            job.mark_failed(str(e))
@@ -1,53 +1,60 @@
-import os
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
-import time
-from typing import List, Dict, Optional
-from groq import Groq
+from typing import Iterator, List
+
 from dotenv import load_dotenv
-import json
 
-load_dotenv()
+from records import Lead, LeadResult
+
+SAMPLE_LEADS = [
+    {
+        'company_name': 'TechCorp Solutions',
+        'email': 'info@techcorp.com',
+        'website': 'https://techcorp.com',
+        'industry': 'Technology',
+        'location': 'India,In'
+    },
+    {
+        'company_name': 'GreenEnergy Inc',
+        'email': 'contact@greenenergy.org',
+        'website': 'https://greenenergy.org',
+        'industry': 'Renewable Energy',
+        'location': 'India,In'
+    },
+    {
+        'company_name': 'MediCare Systems',
+        'email': 'support@medicaresys.com',
+        'website': 'https://medicaresys.com',
+        'industry': 'Healthcare',
+        'location': 'India,In'
+    }
+]
 
-GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 
 class LeadGenerator:
-    def __init__(self):
-        self.groq_client = Groq(api_key=GROQ_API_KEY) if GROQ_API_KEY else None
-    
-    def get_sample_leads(self, count=3):
-        leads = [
-            {
-                'company_name': 'TechCorp Solutions',
-                'email': 'info@techcorp.com',
-                'website': 'https://techcorp.com',
-                'industry': 'Technology',
-                'location': 'India,In'
-            },
-            {
-                'company_name': 'GreenEnergy Inc', 
-                'email': 'contact@greenenergy.org',
-                'website': 'https://greenenergy.org',
-                'industry': 'Renewable Energy',
-                'location': 'India,In'
-            },
-            {
-                'company_name': 'MediCare Systems',
-                'email': 'support@medicaresys.com', 
-                'website': 'https://medicaresys.com',
-                'industry': 'Healthcare',
-                'location': 'India,In'
-            }
-        ]
-        return leads[:count]
-    
+    """Standalone demo that runs sample leads through the same workflow as the web app and cli.py."""
+
+    def __init__(self, workflow=None, gateway=None):
+        if workflow is None:
+            from workflow import LeadGenerationWorkflow
+            workflow = LeadGenerationWorkflow()
+        if gateway is None:
+            from llm_gateway import get_llm_gateway
+            gateway = get_llm_gateway()
+        self.workflow = workflow
+        self.gateway = gateway
+
+    def get_sample_leads(self, count=3) -> List[Lead]:
+        return [Lead.from_dict(lead) for lead in SAMPLE_LEADS[:count]]
+
+    def process(self, leads: List[Lead], email_type: str = 'partnership') -> Iterator[LeadResult]:
+        return self.workflow.run_stream(leads, email_type)
+
     def generate_summary(self, company_name, domain, industry):
-        if not self.groq_client:
+        """Short summary from the company's name alone; goes through the gateway, so repeats are served from the LLM cache."""
+        if not self.gateway.available:
             return f"{company_name} is a {industry} company operating at {domain}."
-        
+
         try:
-            response = self.groq_client.chat.completions.create(
+            return self.gateway.complete(
                 messages=[{
                     "role": "user",
                     "content": f"Create a 2-sentence business summary for {company_name} in {industry} industry (domain: {domain})"
@@ -55,33 +62,29 @@ class LeadGenerator:
                 model="mixtral-8x7b-32768",
                 max_tokens=100
             )
-            return response.choices[0].message.content
-        except Exception as e:
+        except Exception:
+            self.gateway.record_fallback()
             return f"{company_name} operates in the {industry} sector."
 
 def main():
     print("🚀 E2M Lead Generator - Standalone Version")
     print("=" * 50)
     
+    load_dotenv()
     generator = LeadGenerator()
     leads = generator.get_sample_leads()
     
     print("📊 Sample Lead Processing:")
     print("=" * 50)
     
-    for i, lead in enumerate(leads, 1):
-        summary = generator.generate_summary(
-            lead['company_name'], 
-            lead['website'], 
-            lead['industry']
-        )
-        
-        print(f"\n🏢 Company {i}: {lead['company_name']}")
-        print(f"📍 Industry: {lead['industry']}")
-        print(f"📧 Email: {lead['email']}")
-        print(f"🌐 Website: {lead['website']}")
-        print(f"📝 AI Summary: {summary}")
+    for i, result in enumerate(generator.process(leads), 1):
+        print(f"\n🏢 Company {i}: {result['company']}")
+        print(f"📍 Industry: {result['industry']}")
+        print(f"📧 Email: {result['email']}")
+        print(f"🌐 Website: {result['website']}")
+        print(f"📝 AI Summary: {result['summary'] or result['error']}")
         print("-" * 50)
+    print("\nFor batch runs over a lead file use: python cli.py --input leads.csv --output results.jsonl")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
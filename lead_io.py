@@ -0,0 +1,182 @@
+import csv
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, Optional
+
+from records import LEAD_FIELDS, RESULT_FIELDS, Lead
+
+FIELD_ALIASES = {
+    'company': 'company_name',
+    'company name': 'company_name',
+    'name': 'company_name',
+    'organization': 'company_name',
+    'email address': 'email',
+    'contact email': 'email',
+    'url': 'website',
+    'website url': 'website',
+    'homepage': 'website',
+    'sector': 'industry',
+    'city': 'location',
+    'country': 'location',
+    'employee count': 'employees',
+    'company size': 'employees',
+    'annual revenue': 'revenue'
+}
+
+
+def _normalize_key(key: str) -> str:
+    key = (key or '').strip().lower().replace('_', ' ')
+    key = FIELD_ALIASES.get(key, key)
+    return key.replace(' ', '_')
+
+
+def _normalize_lead(row: Dict) -> Lead:
+    lead = {}
+    for key, value in row.items():
+        field = _normalize_key(key)
+        if field in LEAD_FIELDS and value is not None and field not in lead:
+            lead[field] = str(value).strip()
+    lead.setdefault('company_name', lead.get('domain') or lead.get('email') or lead.get('website') or 'Unknown Company')
+    return Lead.from_dict(lead)
+
+
+def _open_input(path: str):
+    if path == '-':
+        return sys.stdin
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+
+def detect_format(path: str, default: str = 'jsonl') -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    return default
+
+
+def iter_csv_leads(path: str) -> Iterator[Lead]:
+    handle = _open_input(path)
+    try:
+        for row in csv.DictReader(handle):
+            if any(value and value.strip() for value in row.values() if isinstance(value, str)):
+                yield _normalize_lead(row)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def iter_jsonl_leads(path: str) -> Iterator[Lead]:
+    handle = _open_input(path)
+    try:
+        for line_number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                print(f"Skipping invalid JSON on line {line_number}: {e}", file=sys.stderr)
+                continue
+            if isinstance(row, dict):
+                yield _normalize_lead(row)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def iter_leads(path: str, fmt: Optional[str] = None) -> Iterator[Lead]:
+    fmt = fmt or detect_format(path)
+    if fmt == 'csv':
+        return iter_csv_leads(path)
+    return iter_jsonl_leads(path)
+
+
+class ResultWriter:
+    def __init__(self, path: str, fmt: Optional[str] = None, append: bool = False, flush_every: int = 100):
+        self.path = path
+        self.fmt = fmt or detect_format(path)
+        self.flush_every = flush_every
+        self.count = 0
+        if path == '-':
+            self._handle = sys.stdout
+            write_header = True
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+            self._handle = open(path, 'a' if append else 'w', encoding='utf-8', newline='')
+        self._csv = None
+        if self.fmt == 'csv':
+            self._csv = csv.DictWriter(self._handle, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+            if write_header:
+                self._csv.writeheader()
+
+    def write(self, result: Dict):
+        row = dict(result)
+        if self._csv:
+            row['processing_steps'] = ' | '.join(row.get('processing_steps') or [])
+            self._csv.writerow(row)
+        else:
+            self._handle.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._handle.flush()
+
+    def close(self):
+        self._handle.flush()
+        if self._handle is not sys.stdout:
+            self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_results(path: str, fmt: Optional[str] = None) -> Iterator[Dict]:
+    fmt = fmt or detect_format(path)
+    with open(path, 'r', encoding='utf-8', newline='') as handle:
+        if fmt == 'csv':
+            for row in csv.DictReader(handle):
+                row['processing_steps'] = [step for step in (row.get('processing_steps') or '').split(' | ') if step]
+                yield row
+        else:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+
+def lead_key(lead: Dict) -> tuple:
+    """Identity of an input lead, comparable with ``result_key`` of its result row."""
+    return (
+        (lead.get('company_name') or '').strip().lower(),
+        (lead.get('email') or '').strip().lower(),
+        (lead.get('website') or '').strip().lower()
+    )
+
+
+def result_key(result: Dict) -> tuple:
+    return (
+        (result.get('company') or '').strip().lower(),
+        (result.get('email') or '').strip().lower(),
+        (result.get('website') or '').strip().lower()
+    )
+
+
+def batched(iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,333 @@
+import heapq
+import os
+import re
+import threading
+from array import array
+from functools import lru_cache
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from records import Lead
+from shared import Shared
+
+LEAD_SOURCE_PATH = os.getenv('LEAD_SOURCE_PATH', '')
+
+DIMENSIONS = ('industry', 'location', 'employees', 'revenue')
+
+EMPLOYEE_BANDS = ((1, '1-10'), (11, '11-50'), (51, '51-200'), (201, '201-1000'), (1001, '1001-5000'), (5001, '5000+'))
+REVENUE_BANDS = (
+    (0, '<$1M'), (1e6, '$1M-$10M'), (1e7, '$10M-$50M'), (5e7, '$50M-$100M'), (1e8, '$100M-$500M'), (5e8, '$500M+')
+)
+EMPLOYEE_BOUNDS = [lower for lower, _ in EMPLOYEE_BANDS]
+REVENUE_BOUNDS = [lower for lower, _ in REVENUE_BANDS]
+EMPLOYEE_LABELS = {label.casefold(): label for _, label in EMPLOYEE_BANDS}
+REVENUE_LABELS = {label.casefold(): label for _, label in REVENUE_BANDS}
+REVENUE_UNITS = {'': 1, 'k': 1e3, 'm': 1e6, 'b': 1e9}
+
+NUMBER = re.compile(r'\d[\d,]*(?:\.\d+)?')
+AMOUNT = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([kmb]?)', re.IGNORECASE)
+
+# Demo companies served when LEAD_SOURCE_PATH is not set.
+SAMPLE_LEADS = [
+    {
+        'company_name': 'TechCorp Solutions',
+        'email': 'info@techcorp.com',
+        'website': 'https://techcorp.com',
+        'domain': 'techcorp.com',
+        'industry': 'Technology',
+        'phone': '+91-555-0101',
+        'location': 'India,In',
+        'employees': '500-1000',
+        'revenue': '$100M-$500M'
+    },
+    {
+        'company_name': 'GreenEnergy Inc',
+        'email': 'contact@greenenergy.org',
+        'website': 'https://greenenergy.org',
+        'industry': 'Renewable Energy',
+        'phone': '+91-555-0102',
+        'location': 'India,In',
+        'employees': '200-500',
+        'revenue': '$50M-$100M'
+    },
+    {
+        'company_name': 'MediCare Systems',
+        'email': 'support@medicaresys.com',
+        'website': 'https://medicaresys.com',
+        'industry': 'Healthcare',
+        'phone': '+91-555-0103',
+        'location': 'India,In',
+        'employees': '1000-5000',
+        'revenue': '$500M-$1B'
+    },
+    {
+        'company_name': 'FoodDeliver Fast',
+        'email': 'orders@fooddeliver.app',
+        'website': 'invalid-website',
+        'industry': 'Food Delivery',
+        'phone': '+91-555-0104',
+        'location': 'India,In',
+        'employees': '1000-5000',
+        'revenue': '$500M-$1B'
+    },
+    {
+        'company_name': 'CloudTech Innovations',
+        'email': 'hello@cloudtech.io',
+        'website': 'https://cloudtech.io',
+        'industry': 'Cloud Computing',
+        'phone': '+91-555-0105',
+        'location': 'India,In',
+        'employees': '200-500',
+        'revenue': '$50M-$100M'
+    },
+    {
+        'company_name': 'FinTech Global',
+        'email': 'info@fintechglobal.com',
+        'website': 'https://fintechglobal.com',
+        'industry': 'Financial Technology',
+        'phone': '+91-555-0106',
+        'location': 'India,In',
+        'employees': '500-1000',
+        'revenue': '$100M-$500M'
+    },
+    {
+        'company_name': 'EduLearn Academy',
+        'email': 'contact@edulearn.com',
+        'website': 'https://edulearn.com',
+        'industry': 'Education Technology',
+        'phone': '+91-555-0107',
+        'location': 'India,In',
+        'employees': '100-200',
+        'revenue': '$10M-$50M'
+    }
+]
+
+
+def _normalize(value: Optional[str]) -> str:
+    return (value or '').strip().casefold()
+
+
+def _band(value: float, bounds: List[float], bands: tuple) -> str:
+    return bands[max(bisect_right(bounds, value) - 1, 0)][1]
+
+
+def _midpoint(values: List[float]) -> float:
+    # A range is banded by its middle, so "1000-5000" lands in 1001-5000 rather than
+    # with the companies at its lower end.
+    return (values[0] + values[1]) / 2 if len(values) > 1 else values[0]
+
+
+def _employee_values(employees: Optional[str]) -> List[float]:
+    return [float(number.replace(',', '')) for number in NUMBER.findall(employees or '')[:2]]
+
+
+def _revenue_values(revenue: Optional[str]) -> List[float]:
+    amounts = AMOUNT.findall(revenue or '')[:2]
+    # "10-50M": a bare lower bound takes the upper bound's unit.
+    unit = next((unit for _, unit in reversed(amounts) if unit), '')
+    return [float(number.replace(',', '')) * REVENUE_UNITS[(suffix or unit).lower()] for number, suffix in amounts]
+
+
+@lru_cache(maxsize=4096)
+def employee_band(employees: Optional[str]) -> Optional[str]:
+    """Band of a free-form headcount such as ``'500-1000'`` or ``'1,200+'``, by its midpoint."""
+    if _normalize(employees) in EMPLOYEE_LABELS:
+        return EMPLOYEE_LABELS[_normalize(employees)]
+    values = _employee_values(employees)
+    return _band(_midpoint(values), EMPLOYEE_BOUNDS, EMPLOYEE_BANDS) if values else None
+
+
+@lru_cache(maxsize=4096)
+def revenue_band(revenue: Optional[str]) -> Optional[str]:
+    """Band of a free-form revenue such as ``'$10M-$50M'``, by its midpoint."""
+    if _normalize(revenue) in REVENUE_LABELS:
+        return REVENUE_LABELS[_normalize(revenue)]
+    values = _revenue_values(revenue)
+    return _band(_midpoint(values), REVENUE_BOUNDS, REVENUE_BANDS) if values else None
+
+
+BANDED = {
+    'employees': (employee_band, _employee_values, EMPLOYEE_BOUNDS, EMPLOYEE_LABELS),
+    'revenue': (revenue_band, _revenue_values, REVENUE_BOUNDS, REVENUE_LABELS)
+}
+
+
+def _spans_one_band(values: List[float], bounds: List[float]) -> bool:
+    """Whether a low-high range is exactly one band, e.g. 201-1000 or $1M-$10M."""
+    index = bisect_right(bounds, values[0]) - 1
+    if index < 0 or index + 1 >= len(bounds) or bounds[index] != values[0]:
+        return False
+    return values[1] in (bounds[index + 1], bounds[index + 1] - 1)
+
+
+def band_filter(dimension: str, value: str) -> str:
+    """The band a filter value selects: a band label, a raw headcount/revenue, or a range that is exactly one band.
+
+    Leads are banded by the midpoint of their range, so any other range could
+    only be answered with companies outside it and is rejected.
+    """
+    banding, parse, bounds, labels = BANDED[dimension]
+    choices = ', '.join(labels.values())
+    if _normalize(value) not in labels:
+        values = parse(value)
+        if len(values) > 1 and not _spans_one_band(values, bounds):
+            raise ValueError(f"The {dimension} range {value!r} does not match a band; use a single number or one of: {choices}")
+    band = banding(value)
+    if band is None:
+        raise ValueError(f"Invalid {dimension} filter {value!r}; use a number or one of: {choices}")
+    return band
+
+
+def _postings_from(posting: array, start: int, stop: int) -> Iterator[int]:
+    for position in range(bisect_left(posting, start), bisect_left(posting, stop)):
+        yield posting[position]
+
+
+class LeadPage:
+    __slots__ = ('leads', 'next_cursor')
+
+    def __init__(self, leads: List[Lead], next_cursor: Optional[str]):
+        self.leads = leads
+        self.next_cursor = next_cursor
+
+
+class LeadIndex:
+    """Append-only lead store indexed by industry, location and employee/revenue band.
+
+    Each dimension keeps a column of small integer codes, one per lead, and a
+    sorted posting list of lead ids per code. A query walks the smallest
+    matching posting list from its cursor and checks the other filters against
+    the columns, so it stops as soon as a page is full instead of scanning
+    every lead. Matching is case-insensitive; a cursor is the id of the first
+    lead of the next page and stays valid while leads are appended.
+    """
+
+    def __init__(self, leads: Iterable = ()):
+        self._leads: List[Lead] = []
+        self._columns = {dimension: array('I') for dimension in DIMENSIONS}
+        self._codes: Dict[str, Dict[str, int]] = {dimension: {} for dimension in DIMENSIONS}
+        # Code 0 is "not set" and is never matched by a filter.
+        self._labels: Dict[str, List[Optional[str]]] = {dimension: [None] for dimension in DIMENSIONS}
+        self._postings: Dict[str, List[array]] = {dimension: [None] for dimension in DIMENSIONS}
+        self._lock = threading.Lock()
+        self.extend(leads)
+
+    def __len__(self) -> int:
+        return len(self._leads)
+
+    def extend(self, leads: Iterable) -> int:
+        added = 0
+        with self._lock:
+            for lead in leads:
+                if not isinstance(lead, Lead):
+                    lead = Lead.from_dict(lead)
+                lead_id = len(self._leads)
+                labels = (lead.industry, lead.location, employee_band(lead.employees), revenue_band(lead.revenue))
+                for dimension, label in zip(DIMENSIONS, labels):
+                    code = self._code(dimension, label)
+                    self._columns[dimension].append(code)
+                    if code:
+                        self._postings[dimension][code].append(lead_id)
+                # Appended last: readers bound every query by len(self._leads).
+                self._leads.append(lead)
+                added += 1
+        return added
+
+    def _code(self, dimension: str, label: Optional[str]) -> int:
+        key = _normalize(label)
+        if not key:
+            return 0
+        code = self._codes[dimension].get(key)
+        if code is None:
+            code = len(self._labels[dimension])
+            self._labels[dimension].append(label.strip())
+            self._postings[dimension].append(array('I'))
+            self._codes[dimension][key] = code
+        return code
+
+    def query(self, industry: Union[str, List[str]] = None, location: Union[str, List[str]] = None,
+              employees: Union[str, List[str]] = None, revenue: Union[str, List[str]] = None,
+              limit: int = 50, cursor: str = None) -> LeadPage:
+        """Up to ``limit`` leads matching every given filter; a list matches any of its values."""
+        start = self._decode_cursor(cursor)
+        stop = len(self._leads)
+        if limit <= 0:
+            return LeadPage([], cursor)
+
+        wanted = []
+        for dimension, values in zip(DIMENSIONS, (industry, location, employees, revenue)):
+            if not values:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            if dimension in BANDED:
+                values = [band_filter(dimension, value) for value in values]
+            codes = {self._codes[dimension].get(_normalize(value)) for value in values}
+            codes.discard(None)
+            if not codes:
+                return LeadPage([], None)
+            wanted.append((dimension, codes))
+
+        if wanted:
+            wanted.sort(key=lambda item: sum(len(self._postings[item[0]][code]) for code in item[1]))
+            dimension, codes = wanted[0]
+            streams = [_postings_from(self._postings[dimension][code], start, stop) for code in codes]
+            lead_ids = streams[0] if len(streams) == 1 else heapq.merge(*streams)
+        else:
+            lead_ids = range(start, stop)
+        checks = [(self._columns[dimension], codes) for dimension, codes in wanted[1:]]
+
+        matched = []
+        for lead_id in lead_ids:
+            if all(column[lead_id] in codes for column, codes in checks):
+                if len(matched) == limit:
+                    return LeadPage([self._leads[index] for index in matched], str(lead_id))
+                matched.append(lead_id)
+        return LeadPage([self._leads[index] for index in matched], None)
+
+    def iter_leads(self, **filters) -> Iterator[Lead]:
+        cursor = None
+        while True:
+            page = self.query(limit=1000, cursor=cursor, **filters)
+            yield from page.leads
+            cursor = page.next_cursor
+            if cursor is None:
+                return
+
+    def facets(self, dimension: str) -> Dict[str, int]:
+        """Lead count per value of ``dimension``, in first-seen order."""
+        return {
+            label: len(posting)
+            for label, posting in zip(self._labels[dimension][1:], self._postings[dimension][1:])
+        }
+
+    def industries(self) -> List[str]:
+        return sorted(self._labels['industry'][1:], key=str.casefold)
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> int:
+        if not cursor:
+            return 0
+        try:
+            start = int(cursor)
+        except (TypeError, ValueError):
+            start = -1
+        if start < 0:
+            raise ValueError(f"Invalid cursor {cursor!r}")
+        return start
+
+
+def load_lead_source(path: str = LEAD_SOURCE_PATH) -> LeadIndex:
+    """Index the leads in ``path`` (.csv or .jsonl), or the built-in demo companies if no path is given."""
+    if not path:
+        return LeadIndex(SAMPLE_LEADS)
+    from lead_io import iter_leads
+
+    return LeadIndex(iter_leads(path))
+
+
+_shared_source: Shared[LeadIndex] = Shared(load_lead_source)
+
+
+def get_lead_source() -> LeadIndex:
+    return _shared_source.get()
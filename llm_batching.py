@@ -0,0 +1,88 @@
+import json
+import os
+import re
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, List, Optional
+
+LLM_BATCH_MODE = os.getenv('LLM_BATCH_MODE', 'false').lower() in ('1', 'true', 'yes')
+LLM_BATCH_TOKEN_BUDGET = int(os.getenv('LLM_BATCH_TOKEN_BUDGET', '6000'))
+LLM_BATCH_MAX_ITEMS = int(os.getenv('LLM_BATCH_MAX_ITEMS', '10'))
+
+JSON_BLOCK = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def plan_batches(items: List[Dict], cost: Callable[[Dict], int], token_budget: int = LLM_BATCH_TOKEN_BUDGET,
+                 max_items: int = LLM_BATCH_MAX_ITEMS) -> List[List[int]]:
+    batches = []
+    current = []
+    used = 0
+    for index, item in enumerate(items):
+        item_cost = cost(item)
+        if current and (used + item_cost > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current = []
+            used = 0
+        current.append(index)
+        used += item_cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_response(text: str, expected_ids: List[str], field: str) -> Dict[str, str]:
+    match = JSON_BLOCK.search(text or '')
+    if not match:
+        return {}
+    try:
+        payload = json.loads(match.group(0))
+    except ValueError:
+        return {}
+
+    entries = payload.get('results', []) if isinstance(payload, dict) else []
+    parsed = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        entry_id = str(entry.get('id', ''))
+        value = entry.get(field)
+        if entry_id in expected_ids and isinstance(value, str) and value.strip():
+            parsed[entry_id] = value.strip()
+    return parsed
+
+
+def build_batch_prompt(instructions: str, items: List[Dict], field: str) -> str:
+    return (
+        f"{instructions}\n\n"
+        f"Respond with a single JSON object of the form "
+        f'{{"results": [{{"id": "<id>", "{field}": "<text>"}}]}} '
+        f"containing exactly one entry per input id and nothing else.\n\n"
+        f"Inputs:\n{json.dumps(items, ensure_ascii=False)}"
+    )
+
+
+def run_batched(items: List[Dict], cost: Callable[[Dict], int], request_batch: Callable[[List[Dict]], Dict[str, str]],
+                fallback: Callable[[Dict], Optional[str]], token_budget: int = LLM_BATCH_TOKEN_BUDGET,
+                max_items: int = LLM_BATCH_MAX_ITEMS, scope: Callable[[List[Dict]], ContextManager] = None) -> List[Optional[str]]:
+    """``scope``, if given, wraps each batched request and each one-by-one fallback with the items it covers."""
+    scope = scope or (lambda batch_items: nullcontext())
+    results: List[Optional[str]] = [None] * len(items)
+    for batch in plan_batches(items, cost, token_budget, max_items):
+        batch_items = [items[index] for index in batch]
+        try:
+            with scope(batch_items):
+                answers = request_batch(batch_items) if len(batch_items) > 1 else {}
+        except Exception as e:
+            print(f"Error in batched LLM request: {e}")
+            answers = {}
+
+        for index, item in zip(batch, batch_items):
+            answer = answers.get(item['id'])
+            if answer is None:
+                with scope([item]):
+                    answer = fallback(item)
+            results[index] = answer
+    return results
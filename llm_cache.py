@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from shared import Shared
+
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join('data', 'llm_cache.db'))
+LLM_CACHE_MAX_MB = float(os.getenv('LLM_CACHE_MAX_MB', '64'))
+LLM_CACHE_TTL_HOURS = float(os.getenv('LLM_CACHE_TTL_HOURS', '168'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access);
+"""
+
+
+class LLMCache:
+    def __init__(self, path: str = LLM_CACHE_PATH, max_bytes: int = int(LLM_CACHE_MAX_MB * 1024 * 1024),
+                 ttl_seconds: float = LLM_CACHE_TTL_HOURS * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'expired': 0}
+        directory = os.path.dirname(path)
+        if directory and path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        self._total_bytes = conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_cache').fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict], **params) -> str:
+        payload = json.dumps({'model': model, 'messages': messages, 'params': params}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def get(self, key: str) -> Optional[str]:
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute('SELECT value, created_at, size FROM llm_cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+
+        value, created_at, size = row
+        if self.ttl_seconds and now - created_at > self.ttl_seconds:
+            with conn:
+                conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+            with self._lock:
+                self._total_bytes -= size
+                self._counters['expired'] += 1
+                self._counters['misses'] += 1
+            return None
+
+        with conn:
+            conn.execute('UPDATE llm_cache SET last_access = ? WHERE key = ?', (now, key))
+        self._count('hits')
+        return value
+
+    def set(self, key: str, value: str):
+        size = len(key) + len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            previous = conn.execute('SELECT size FROM llm_cache WHERE key = ?', (key,)).fetchone()
+            conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)',
+                (key, value, size, now, now)
+            )
+        with self._lock:
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._counters['writes'] += 1
+            over_budget = self._total_bytes > self.max_bytes
+
+        if over_budget:
+            self._evict()
+
+    def _evict(self):
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            if self.ttl_seconds:
+                expired = conn.execute('DELETE FROM llm_cache WHERE created_at < ?', (now - self.ttl_seconds,)).rowcount
+                self._count('expired', max(expired, 0))
+
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_cache').fetchone()[0]
+            target = int(self.max_bytes * 0.9)
+            evicted = 0
+            if total > target:
+                rows = conn.execute('SELECT key, size FROM llm_cache ORDER BY last_access').fetchall()
+                doomed = []
+                for key, size in rows:
+                    if total <= target:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                conn.executemany('DELETE FROM llm_cache WHERE key = ?', doomed)
+                evicted = len(doomed)
+
+        with self._lock:
+            self._total_bytes = total
+            self._counters['evictions'] += evicted
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM llm_cache')
+        with self._lock:
+            self._total_bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['bytes'] = self._total_bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups * 100, 1) if lookups else 0
+        return stats
+
+
+_shared_cache: Shared[LLMCache] = Shared(lambda: LLMCache() if LLM_CACHE_ENABLED else None)
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    return _shared_cache.get()
+
+
+def get_cache_stats() -> Dict:
+    cache = get_llm_cache()
+    if not cache:
+        return {'enabled': False, 'hits': 0, 'misses': 0, 'hit_rate': 0}
+    return {'enabled': True, **cache.stats()}
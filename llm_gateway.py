@@ -0,0 +1,293 @@
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from llm_cache import LLMCache, get_llm_cache
+from llm_batching import estimate_tokens
+from resilience import BreakerRegistry, CircuitOpenError, DeadlineExceeded, current_deadline, get_provider_breakers
+from scraping import parse_retry_after
+from shared import Shared
+
+LLM_RPM = float(os.getenv('LLM_RPM', '30'))
+LLM_TPM = float(os.getenv('LLM_TPM', '0'))
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+LLM_MIN_CONCURRENCY = int(os.getenv('LLM_MIN_CONCURRENCY', '1'))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '4'))
+LLM_BACKOFF = float(os.getenv('LLM_BACKOFF', '1.0'))
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '30'))
+LLM_STREAMING = os.getenv('LLM_STREAMING', 'true').lower() in ('1', 'true', 'yes')
+
+THROTTLE_STATUSES = {429}
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units evenly over a minute; holds at most one minute's worth."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1) -> float:
+        if self.rate <= 0:
+            return 0.0
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def drain(self, seconds: float):
+        """Hold the bucket empty for ``seconds`` after the provider says to back off."""
+        with self._lock:
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+            self._updated = time.monotonic()
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight calls: +1 per window of successes, halved on throttling."""
+
+    def __init__(self, maximum: int = LLM_MAX_CONCURRENCY, minimum: int = LLM_MIN_CONCURRENCY, initial: int = None):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = float(initial or self.maximum)
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False):
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    if headers.get('retry-after-ms'):
+        try:
+            return float(headers['retry-after-ms']) / 1000
+        except ValueError:
+            pass
+    return parse_retry_after(headers.get('retry-after'))
+
+
+class LLMGateway:
+    """Single entry point for chat completions shared by every generator.
+
+    Calls are served from the LLM cache when possible; otherwise they wait for
+    request and token budget, take an adaptive concurrency slot and retry
+    throttling and transient failures, honoring the provider's Retry-After.
+    Under a deadline (see ``resilience``) each request's timeout is cut to the
+    time left and retries that could not finish in time are not attempted.
+    While the provider's circuit is open calls fail fast with
+    ``CircuitOpenError``, which the generators answer with their templates.
+    """
+
+    def __init__(self, client=None, rpm: float = LLM_RPM, tpm: float = LLM_TPM,
+                 max_concurrency: int = LLM_MAX_CONCURRENCY, min_concurrency: int = LLM_MIN_CONCURRENCY,
+                 max_retries: int = LLM_MAX_RETRIES, backoff: float = LLM_BACKOFF, cache: Optional[LLMCache] = None,
+                 provider: str = 'groq', breakers: BreakerRegistry = None, use_cache: bool = True, use_breakers: bool = True):
+        self.client = client
+        self.provider = provider
+        self.breakers = (breakers or get_provider_breakers()) if use_breakers else None
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = AdaptiveConcurrency(max_concurrency, min_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = (cache or get_llm_cache()) if use_cache else None
+        self._lock = threading.Lock()
+        self._stats = {
+            'calls': 0, 'cache_hits': 0, 'requests': 0, 'streamed': 0, 'retries': 0, 'throttled': 0,
+            'failures': 0, 'fallbacks': 0, 'circuit_open': 0, 'deadline_exceeded': 0, 'tokens_reserved': 0,
+            'rate_wait_seconds': 0.0
+        }
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
+    def _count(self, name: str, amount: float = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def record_fallback(self):
+        self._count('fallbacks')
+
+    def complete(self, messages: List[Dict], model: str, on_delta: Callable[[str], None] = None, **params) -> str:
+        """Return the completion text; with ``on_delta`` it is streamed and each piece forwarded as it arrives."""
+        self._count('calls')
+        key = LLMCache.make_key(model, messages, **params) if self.cache is not None else None
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count('cache_hits')
+                if on_delta:
+                    on_delta(cached)
+                return cached
+
+        deadline = current_deadline()
+        self._check_deadline(deadline)
+        if self.breakers is not None and not self.breakers.allow(self.provider):
+            self._count('circuit_open')
+            raise CircuitOpenError(f"{self.provider} circuit is open")
+        try:
+            if on_delta:
+                content = self._request(messages, model, deadline, consume=lambda stream: _consume_stream(stream, on_delta),
+                                        stream=True, **params).strip()
+                self._count('streamed')
+            else:
+                content = self._request(messages, model, deadline, **params).choices[0].message.content.strip()
+        except DeadlineExceeded:
+            if self.breakers is not None:
+                self.breakers.cancel(self.provider)
+            raise
+        except Exception as e:
+            if self.breakers is not None:
+                self.breakers.record(self.provider, not _provider_fault(e))
+            raise
+        if self.breakers is not None:
+            self.breakers.record(self.provider, True)
+        if self.cache is not None:
+            self.cache.set(key, content)
+        return content
+
+    def _check_deadline(self, deadline, before: str = 'the LLM call'):
+        if deadline is not None and deadline.expired:
+            self._count('deadline_exceeded')
+            deadline.check(before)
+
+    def _request(self, messages: List[Dict], model: str, deadline=None, consume: Callable = None, **params):
+        cost = sum(estimate_tokens(message['content']) for message in messages) + params.get('max_tokens', 0)
+        emitted = [False]
+        for attempt in range(self.max_retries + 1):
+            waited = self.requests.acquire() + self.tokens.acquire(cost)
+            self._count('tokens_reserved', cost)
+            self._count('rate_wait_seconds', waited)
+            if attempt == 0:
+                self._check_deadline(deadline, 'the LLM request')
+            if deadline is not None and deadline.bounded:
+                params['timeout'] = deadline.limit(LLM_TIMEOUT)
+
+            self.concurrency.acquire()
+            throttled = False
+            try:
+                self._count('requests')
+                response = self.client.chat.completions.create(messages=messages, model=model, **params)
+                if consume is None:
+                    return response
+                return consume(_watch_first(response, emitted))
+            except Exception as e:
+                status = _status_code(e)
+                throttled = status in THROTTLE_STATUSES
+                retryable = status in RETRY_STATUSES or (status is None and _is_connection_error(e))
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = self.backoff * (2 ** attempt)
+                # Text already shown to a listener can't be taken back, so a stream that
+                # broke part-way is not retried; nor is anything that could not finish in time.
+                out_of_time = deadline is not None and deadline.remaining() <= delay
+                if not retryable or emitted[0] or attempt == self.max_retries or out_of_time:
+                    self._count('failures')
+                    raise
+            finally:
+                self.concurrency.release(throttled)
+
+            self._count('retries')
+            if throttled:
+                self._count('throttled')
+            if throttled and self.requests.rate > 0:
+                # Every caller waits out the provider's back-off, not just this one.
+                self.requests.drain(delay)
+            else:
+                time.sleep(delay + random.uniform(0, self.backoff / 2))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['rate_wait_seconds'] = round(stats['rate_wait_seconds'], 2)
+        stats['concurrency_limit'] = round(self.concurrency.limit, 2)
+        stats['in_flight'] = self.concurrency.in_flight
+        stats['enabled'] = self.available
+        return stats
+
+
+def _watch_first(stream: Iterable, emitted: List[bool]) -> Iterator:
+    for chunk in stream:
+        emitted[0] = True
+        yield chunk
+
+
+def _consume_stream(stream: Iterable, on_delta: Callable[[str], None]) -> str:
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        piece = chunk.choices[0].delta.content
+        if piece:
+            parts.append(piece)
+            on_delta(piece)
+    return ''.join(parts)
+
+
+def _provider_fault(error: Exception) -> bool:
+    """Whether a failure says the provider is unhealthy, rather than that the request was bad."""
+    status = _status_code(error)
+    return status is None or status >= 500 or status in THROTTLE_STATUSES
+
+
+def _is_connection_error(error: Exception) -> bool:
+    return type(error).__name__ in ('APIConnectionError', 'APITimeoutError', 'ConnectionError', 'Timeout', 'TimeoutError')
+
+
+def _build_gateway() -> LLMGateway:
+    # Read at first use so a .env loaded after import still applies.
+    api_key = os.getenv('GROQ_API_KEY')
+    client = None
+    if api_key:
+        from groq import Groq
+        client = Groq(api_key=api_key, base_url=os.getenv('GROQ_BASE_URL'), max_retries=0, timeout=LLM_TIMEOUT)
+    return LLMGateway(client)
+
+
+_shared_gateway: Shared[LLMGateway] = Shared(_build_gateway)
+
+
+def get_llm_gateway() -> LLMGateway:
+    return _shared_gateway.get()
+
+
+def get_gateway_stats() -> Dict:
+    return get_llm_gateway().stats()
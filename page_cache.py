@@ -0,0 +1,162 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from shared import Shared
+
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+PAGE_CACHE_PATH = os.getenv('PAGE_CACHE_PATH', os.path.join('data', 'page_cache.db'))
+PAGE_CACHE_MAX_MB = float(os.getenv('PAGE_CACHE_MAX_MB', '128'))
+PAGE_CACHE_FRESH_HOURS = float(os.getenv('PAGE_CACHE_FRESH_HOURS', '24'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    domain TEXT PRIMARY KEY,
+    url TEXT,
+    text TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL,
+    summary TEXT,
+    summary_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages (last_access);
+"""
+
+
+def content_fingerprint(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or '').encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class PageCache:
+    def __init__(self, path: str = PAGE_CACHE_PATH, max_bytes: int = int(PAGE_CACHE_MAX_MB * 1024 * 1024),
+                 fresh_seconds: float = PAGE_CACHE_FRESH_HOURS * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {'fresh_hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'summaries_reused': 0}
+        directory = os.path.dirname(path)
+        if directory and path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        self._total_bytes = conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def get(self, domain: str) -> Optional[Dict]:
+        conn = self._connection()
+        row = conn.execute('SELECT * FROM pages WHERE domain = ?', (domain,)).fetchone()
+        if row is None:
+            return None
+        with conn:
+            conn.execute('UPDATE pages SET last_access = ? WHERE domain = ?', (time.time(), domain))
+        page = dict(row)
+        page['fresh'] = time.time() - page['fetched_at'] < self.fresh_seconds
+        return page
+
+    def conditional_headers(self, page: Optional[Dict]) -> Dict:
+        headers = {}
+        if page and page.get('etag'):
+            headers['If-None-Match'] = page['etag']
+        if page and page.get('last_modified'):
+            headers['If-Modified-Since'] = page['last_modified']
+        return headers
+
+    def mark_revalidated(self, domain: str, etag: str = None, last_modified: str = None):
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            conn.execute(
+                'UPDATE pages SET fetched_at = ?, last_access = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE domain = ?',
+                (now, now, etag, last_modified, domain)
+            )
+        self.count('revalidated')
+
+    def put(self, domain: str, url: str, text: str, etag: str = None, last_modified: str = None):
+        content_hash = content_fingerprint(text)
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            previous = conn.execute('SELECT size, content_hash, summary, summary_hash FROM pages WHERE domain = ?', (domain,)).fetchone()
+            unchanged = previous is not None and previous['content_hash'] == content_hash
+            conn.execute(
+                'INSERT OR REPLACE INTO pages (domain, url, text, content_hash, etag, last_modified, fetched_at, last_access, size, summary, summary_hash) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (domain, url, text, content_hash, etag, last_modified, now, now, size,
+                 previous['summary'] if unchanged else None, previous['summary_hash'] if unchanged else None)
+            )
+        with self._lock:
+            self._total_bytes += size - (previous['size'] if previous else 0)
+            self.stats['stores'] += 1
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def get_summary(self, domain: str, summary_hash: str) -> Optional[str]:
+        row = self._connection().execute(
+            'SELECT summary FROM pages WHERE domain = ? AND summary_hash = ?', (domain, summary_hash)
+        ).fetchone()
+        if row and row['summary']:
+            self.count('summaries_reused')
+            return row['summary']
+        return None
+
+    def store_summary(self, domain: str, summary_hash: str, summary: str):
+        # Only annotates a page that was actually fetched; creating a row here would
+        # let text that never came from the site (mock content) pass for a fresh page.
+        conn = self._connection()
+        with conn:
+            conn.execute('UPDATE pages SET summary = ?, summary_hash = ? WHERE domain = ?', (summary, summary_hash, domain))
+
+    def _evict(self):
+        conn = self._connection()
+        target = int(self.max_bytes * 0.9)
+        with conn:
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+            doomed = []
+            if total > target:
+                for row in conn.execute('SELECT domain, size FROM pages ORDER BY last_access').fetchall():
+                    if total <= target:
+                        break
+                    doomed.append((row['domain'],))
+                    total -= row['size']
+                conn.executemany('DELETE FROM pages WHERE domain = ?', doomed)
+        with self._lock:
+            self._total_bytes = total
+            self.stats['evictions'] += len(doomed)
+
+
+_shared_cache: Shared[PageCache] = Shared(lambda: PageCache() if PAGE_CACHE_ENABLED else None)
+
+
+def get_page_cache() -> Optional[PageCache]:
+    return _shared_cache.get()
@@ -0,0 +1,154 @@
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from scraping import RateLimiter
+
+PIPELINE_MODE = os.getenv('PIPELINE_MODE', 'false').lower() in ('1', 'true', 'yes')
+PIPELINE_SCRAPE_WORKERS = int(os.getenv('PIPELINE_SCRAPE_WORKERS', '8'))
+PIPELINE_SUMMARY_WORKERS = int(os.getenv('PIPELINE_SUMMARY_WORKERS', '4'))
+PIPELINE_EMAIL_WORKERS = int(os.getenv('PIPELINE_EMAIL_WORKERS', '4'))
+PIPELINE_SCRAPE_RPS = float(os.getenv('PIPELINE_SCRAPE_RPS', '0'))
+PIPELINE_SUMMARY_RPS = float(os.getenv('PIPELINE_SUMMARY_RPS', '0'))
+PIPELINE_EMAIL_RPS = float(os.getenv('PIPELINE_EMAIL_RPS', '0'))
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '16'))
+
+_DONE = object()
+
+
+class Stage:
+    def __init__(self, name: str, func: Callable, workers: int = 1, rate_per_second: float = 0,
+                 when: Callable = None):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.limiter = RateLimiter(rate_per_second)
+        self.when = when
+
+
+class Pipeline:
+    """Runs items through a chain of stages, each with its own worker threads.
+
+    Stages are connected by bounded queues, so a slow stage blocks the one
+    feeding it instead of letting work pile up. At most ``max_in_flight`` items
+    are admitted at once and results are yielded in input order.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = PIPELINE_QUEUE_SIZE, max_in_flight: int = None,
+                 on_error: Callable = None):
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.max_in_flight = max_in_flight or sum(stage.workers for stage in stages) + self.queue_size * len(stages)
+        self.on_error = on_error
+        self.stats = {
+            stage.name: {'processed': 0, 'passed_through': 0, 'busy_seconds': 0.0, 'blocked_seconds': 0.0}
+            for stage in stages
+        }
+        self._stats_lock = threading.Lock()
+
+    def _count(self, stage: Stage, processed: int = 0, passed_through: int = 0, busy: float = 0.0, blocked: float = 0.0):
+        with self._stats_lock:
+            stats = self.stats[stage.name]
+            stats['processed'] += processed
+            stats['passed_through'] += passed_through
+            stats['busy_seconds'] += busy
+            stats['blocked_seconds'] += blocked
+
+    def run(self, items: Iterable) -> Iterator:
+        queues = [queue.Queue(self.queue_size) for _ in self.stages] + [queue.Queue()]
+        admitted = threading.Semaphore(self.max_in_flight)
+        closed = threading.Event()
+        failure: List[BaseException] = []
+        threads = []
+
+        def feed():
+            seq = 0
+            try:
+                for item in items:
+                    while not admitted.acquire(timeout=0.1):
+                        if closed.is_set():
+                            return
+                    if closed.is_set():
+                        return
+                    queues[0].put((seq, item))
+                    seq += 1
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                for _ in range(self.stages[0].workers):
+                    queues[0].put(_DONE)
+
+        def work(index: int, stage: Stage, remaining: List[int], remaining_lock: threading.Lock):
+            inbox, outbox = queues[index], queues[index + 1]
+            while True:
+                entry = inbox.get()
+                if entry is _DONE:
+                    break
+                seq, item = entry
+                if closed.is_set() or (stage.when is not None and not stage.when(item)):
+                    self._count(stage, passed_through=1)
+                else:
+                    stage.limiter.acquire()
+                    started = time.perf_counter()
+                    try:
+                        item = stage.func(item)
+                    except Exception as e:
+                        if self.on_error is None:
+                            failure.append(e)
+                            closed.set()
+                        else:
+                            item = self.on_error(item, e)
+                    self._count(stage, processed=1, busy=time.perf_counter() - started)
+                started = time.perf_counter()
+                outbox.put((seq, item))
+                self._count(stage, blocked=time.perf_counter() - started)
+
+            with remaining_lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+                for _ in range(downstream):
+                    outbox.put(_DONE)
+
+        threads.append(threading.Thread(target=feed, name='pipeline-feed', daemon=True))
+        for index, stage in enumerate(self.stages):
+            remaining, remaining_lock = [stage.workers], threading.Lock()
+            for number in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=work, args=(index, stage, remaining, remaining_lock),
+                    name=f'pipeline-{stage.name}-{number}', daemon=True
+                ))
+        for thread in threads:
+            thread.start()
+
+        reorder: Dict[int, object] = {}
+        next_seq = 0
+        try:
+            while True:
+                entry = queues[-1].get()
+                if entry is _DONE:
+                    break
+                if failure:
+                    raise failure[0]
+                seq, item = entry
+                reorder[seq] = item
+                while next_seq in reorder:
+                    yield reorder.pop(next_seq)
+                    next_seq += 1
+                    admitted.release()
+            if failure:
+                raise failure[0]
+        finally:
+            closed.set()
+
+    def summary(self, elapsed: Optional[float] = None) -> Dict:
+        summary = {}
+        for stage in self.stages:
+            stats = dict(self.stats[stage.name])
+            if elapsed:
+                stats['utilization'] = round(stats['busy_seconds'] / (elapsed * stage.workers), 3)
+            summary[stage.name] = stats
+        return summary
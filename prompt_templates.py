@@ -0,0 +1,292 @@
+import json
+import os
+import string
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from shared import Shared
+
+EMAIL_TEMPLATES_PATH = os.getenv('EMAIL_TEMPLATES_PATH', '')
+
+DEFAULT_EMAIL_TYPE = 'partnership'
+
+
+def _short_name(company_name: str) -> str:
+    words = company_name.split()
+    return words[0] if words else company_name
+
+
+# Fields a template may reference. Derived ones are computed from their source
+# field at render time, and only by templates that use them.
+FIELDS = ('company_name', 'domain', 'industry', 'content', 'business_summary', 'email_type')
+FIELD_NAMES = frozenset(FIELDS)
+DERIVED: Dict[str, Tuple[str, Callable[[str], str]]] = {
+    'company_short_name': ('company_name', _short_name),
+    'business_summary_lower': ('business_summary', str.lower)
+}
+CONVERSIONS: Dict[str, Callable[[object], str]] = {'s': str, 'r': repr, 'a': ascii}
+
+# Prompt text is kept byte-for-byte as it was sent before, so completions
+# already in the LLM cache keep matching.
+PROMPTS = {
+    'summary_system': "You are a business analyst that creates concise company summaries.",
+    'summary': """
+            Create a concise 2-3 sentence business summary for {company_name} ({domain}).
+
+            Based on this content: {content}
+
+            The summary should describe:
+            1. What the company does
+            2. Their main products/services  
+            3. Their value proposition
+
+            Make it professional and factual.
+            """,
+    'summary_batch': (
+        "For each company below, create a concise 2-3 sentence business summary based on its website content. "
+        "Each summary should describe what the company does, their main products/services and their value proposition. "
+        "Make it professional and factual."
+    ),
+    'summary_fallback': (
+        "{company_name} is a business operating at {domain}. They provide quality services in their industry "
+        "with a focus on customer satisfaction and professional delivery."
+    ),
+    'summary_error_fallback': "{company_name} is a business operating at {domain}. They provide services in their respective industry.",
+    'email_system': "You are an expert email copywriter that creates compelling outreach emails.",
+    'email': """
+            Create a personalized outreach email for {company_name} in the {industry} industry.
+
+            Company Context: {business_summary}
+
+            Email Type: {email_type}
+            
+            Create a professional email that:
+            - References their business specifically
+            - Mentions their industry context
+            - Introduces digital marketing services
+            - Suggests a partnership/collaboration
+            - Includes a clear call-to-action
+
+            Keep it professional and concise (150-200 words).
+            Use placeholders: [Your Name], [Your Company], [Your Title]
+            """,
+    'email_batch': (
+        "For each company below, create a personalized {email_type} outreach email. "
+        "Each email should reference their business specifically, mention their industry context, "
+        "introduce digital marketing services, suggest a partnership/collaboration and include a clear call-to-action. "
+        "Keep each email professional and concise (150-200 words). "
+        "Use placeholders: [Your Name], [Your Company], [Your Title]"
+    )
+}
+
+EMAIL_TYPES = {
+    'partnership': {
+        'label': 'Partnership Outreach',
+        'hint': "I'm reaching out to explore partnership opportunities...",
+        'fallback': """Dear {company_name} Team,
+
+I was impressed by your work in {business_summary_lower} and believe there's a great opportunity for partnership.
+
+At [Your Company], we specialize in helping {company_short_name} scale their digital presence through data-driven marketing strategies.
+
+Would you be open to a quick 15-minute call next week to explore potential synergies?
+
+Best regards,
+[Your Name]
+[Your Title]
+[Your Company]"""
+    },
+    'collaboration': {
+        'label': 'Collaboration Proposal',
+        'hint': "I'm impressed by your work and would like to discuss collaboration...",
+        'fallback': """Hello {company_name} Team,
+
+I've been following your company's progress in {business_summary_lower} and am impressed by your innovative approach.
+
+We at [Your Company] have expertise that could complement your efforts and drive mutual growth.
+
+Could we schedule a brief call to discuss collaboration opportunities?
+
+Warm regards,
+[Your Name]
+[Your Title]
+[Your Company]"""
+    },
+    'service_intro': {
+        'label': 'Service Introduction',
+        'hint': "I'd like to introduce our services that could complement your business...",
+        'fallback': """Hi {company_name} Team,
+
+I'd like to introduce [Your Company] and the services we offer to {industry} businesses like yours.
+
+From what I've seen, {business_summary}
+
+We help teams like {company_short_name} grow their digital presence through targeted, data-driven marketing, and I think there's a good fit here.
+
+Would you have 15 minutes next week for a short introductory call?
+
+Kind regards,
+[Your Name]
+[Your Title]
+[Your Company]"""
+    }
+}
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class CompiledTemplate:
+    """A ``str.format`` template validated and split into literal and field parts once.
+
+    ``render`` joins the parts, so no format string is parsed per call. Fields
+    left out of ``render`` come out empty.
+    """
+
+    __slots__ = ('name', 'source', 'fields', '_pieces', '_slots', '_derived')
+
+    def __init__(self, name: str, source: str):
+        try:
+            parsed = list(string.Formatter().parse(source))
+        except ValueError as e:
+            raise TemplateError(f"Template {name!r} is malformed: {e}") from None
+
+        fields = set()
+        pieces: List[str] = []
+        slots = []
+        for literal, field, spec, conversion in parsed:
+            if literal:
+                pieces.append(literal)
+            if field is None:
+                continue
+            if field not in FIELDS and field not in DERIVED:
+                allowed = ', '.join(FIELDS + tuple(DERIVED))
+                raise TemplateError(f"Template {name!r} uses unknown field {{{field}}}; allowed: {allowed}")
+            if '{' in spec or '}' in spec:
+                raise TemplateError(f"Template {name!r} has an unsupported format spec {spec!r}")
+            if conversion and conversion not in CONVERSIONS:
+                raise TemplateError(f"Template {name!r} has an unknown conversion !{conversion}")
+            fields.add(field)
+            slots.append((len(pieces), field, CONVERSIONS.get(conversion), spec))
+            pieces.append('')
+
+        self.name = name
+        self.source = source
+        self.fields = frozenset(fields)
+        self._pieces = pieces
+        self._slots = tuple(slots)
+        self._derived = tuple((field, *DERIVED[field]) for field in sorted(fields & DERIVED.keys()))
+        try:
+            self.render()
+        except (ValueError, TypeError) as e:
+            raise TemplateError(f"Template {name!r} does not render: {e}") from None
+
+    def render(self, **values: str) -> str:
+        if not values.keys() <= FIELD_NAMES:
+            unknown = ', '.join(sorted(values.keys() - FIELD_NAMES))
+            raise TypeError(f"render() got unexpected fields: {unknown}")
+        for field, base, derive in self._derived:
+            values[field] = derive(values.get(base, ''))
+        pieces = self._pieces.copy()
+        for index, field, convert, spec in self._slots:
+            value = values.get(field, '')
+            if convert is not None:
+                value = convert(value)
+            pieces[index] = format(value, spec)
+        return ''.join(pieces)
+
+
+class EmailType:
+    __slots__ = ('name', 'label', 'hint', 'fallback', 'prompt')
+
+    def __init__(self, name: str, label: str, hint: str, fallback: CompiledTemplate, prompt: Optional[CompiledTemplate]):
+        self.name = name
+        self.label = label
+        self.hint = hint
+        self.fallback = fallback
+        self.prompt = prompt
+
+
+class TemplateRegistry:
+    """Compiled prompts and per-``email_type`` fallback templates, looked up by name."""
+
+    def __init__(self, load_defaults: bool = True):
+        self._prompts: Dict[str, CompiledTemplate] = {}
+        self._email_types: Dict[str, EmailType] = {}
+        self._lock = threading.Lock()
+        if load_defaults:
+            for name, source in PROMPTS.items():
+                self.register_prompt(name, source)
+            for name, spec in EMAIL_TYPES.items():
+                self.register_email_type(name, **spec)
+
+    def register_prompt(self, name: str, source: str) -> CompiledTemplate:
+        compiled = CompiledTemplate(name, source)
+        with self._lock:
+            self._prompts[name] = compiled
+        return compiled
+
+    def register_email_type(self, name: str, fallback: str, label: str = None, hint: str = '',
+                            prompt: str = None) -> EmailType:
+        """Add or replace an email type; ``prompt`` overrides the shared LLM prompt for it."""
+        if not name or not name.replace('_', '').isalnum():
+            raise TemplateError(f"Invalid email type name {name!r}")
+        email_type = EmailType(
+            name,
+            label or name.replace('_', ' ').title(),
+            hint,
+            CompiledTemplate(f'{name}.fallback', fallback),
+            CompiledTemplate(f'{name}.prompt', prompt) if prompt else None
+        )
+        with self._lock:
+            self._email_types[name] = email_type
+        return email_type
+
+    def load_file(self, path: str):
+        """Register templates from a JSON file shaped like ``{"prompts": {...}, "email_types": {...}}``."""
+        with open(path, encoding='utf-8') as f:
+            spec = json.load(f)
+        for name, source in spec.get('prompts', {}).items():
+            if name not in PROMPTS:
+                raise TemplateError(f"Unknown prompt {name!r} in {path}")
+            self.register_prompt(name, source)
+        for name, email_spec in spec.get('email_types', {}).items():
+            if 'fallback' not in email_spec:
+                raise TemplateError(f"Email type {name!r} in {path} has no fallback template")
+            self.register_email_type(name, **email_spec)
+
+    def prompt(self, name: str) -> CompiledTemplate:
+        return self._prompts[name]
+
+    def email_type(self, name: str) -> EmailType:
+        return self._email_types.get(name) or self._email_types[DEFAULT_EMAIL_TYPE]
+
+    def email_types(self) -> List[EmailType]:
+        return list(self._email_types.values())
+
+    def email_prompt(self, email_type: str) -> CompiledTemplate:
+        return self.email_type(email_type).prompt or self._prompts['email']
+
+    def render_fallback_email(self, email_type: str, company_name: str, business_summary: str, industry: str = '') -> str:
+        return self.email_type(email_type).fallback.render(
+            company_name=company_name, business_summary=business_summary, industry=industry, email_type=email_type
+        )
+
+
+def _build_registry() -> TemplateRegistry:
+    registry = TemplateRegistry()
+    if EMAIL_TEMPLATES_PATH:
+        registry.load_file(EMAIL_TEMPLATES_PATH)
+    return registry
+
+
+_shared_registry: Shared[TemplateRegistry] = Shared(_build_registry)
+
+
+def get_template_registry() -> TemplateRegistry:
+    return _shared_registry.get()
+
+
+def register_email_type(name: str, fallback: str, label: str = None, hint: str = '', prompt: str = None) -> EmailType:
+    return get_template_registry().register_email_type(name, fallback, label, hint, prompt)
@@ -0,0 +1,161 @@
+from array import array
+from enum import IntEnum
+from typing import Dict, List, Optional
+
+LEAD_FIELDS = ('company_name', 'email', 'website', 'domain', 'industry', 'phone', 'location', 'employees', 'revenue')
+RESULT_FIELDS = (
+    'company', 'email', 'website', 'industry', 'location', 'employees', 'revenue', 'phone',
+    'status', 'error', 'domain', 'summary', 'email_content', 'email_type', 'processing_steps', 'processing_time', 'degraded'
+)
+# Result fields computed from other state rather than stored on the instance.
+DERIVED_RESULT_FIELDS = ('processing_steps',)
+
+
+class Step(IntEnum):
+    DOMAIN = 1
+    DEDUP = 2
+    SCRAPED = 3
+    SCRAPE_FAILED = 4
+    SUMMARIZED = 5
+    EMAILED = 6
+    ERROR = 7
+
+
+# Every step's text is rebuilt from the result's own fields, so a step costs one
+# byte and one float however long its message is.
+STEP_TEXT = {
+    Step.DOMAIN: lambda result: f"✅ Domain extraction: {result.domain or result.error}",
+    Step.DEDUP: lambda result: f"⏭️ Deduplication: {result.error}",
+    Step.SCRAPED: lambda result: "✅ Web scraping: Success",
+    Step.SCRAPE_FAILED: lambda result: "✅ Web scraping: Failed",
+    Step.SUMMARIZED: lambda result: "✅ AI summarization: Completed",
+    Step.EMAILED: lambda result: "✅ Email generation: Completed",
+    Step.ERROR: lambda result: f"❌ Error: {result.error}",
+}
+
+
+class Lead:
+    """One input lead. Reads like the dict it replaces: ``lead['company_name']``, ``lead.get('industry')``."""
+
+    __slots__ = LEAD_FIELDS
+
+    def __init__(self, company_name: str = None, email: str = None, website: str = None, domain: str = None,
+                 industry: str = None, phone: str = None, location: str = None, employees: str = None, revenue: str = None):
+        self.company_name = company_name
+        self.email = email
+        self.website = website
+        self.domain = domain
+        self.industry = industry
+        self.phone = phone
+        self.location = location
+        self.employees = employees
+        self.revenue = revenue
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Lead':
+        return cls(**{field: data[field] for field in LEAD_FIELDS if field in data})
+
+    def keys(self) -> List[str]:
+        return [field for field in LEAD_FIELDS if getattr(self, field) is not None]
+
+    def __getitem__(self, key: str):
+        if key not in LEAD_FIELDS or getattr(self, key) is None:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None) if key in LEAD_FIELDS else None
+        return default if value is None else value
+
+    def __repr__(self):
+        return f"Lead({self.company_name!r}, domain={self.domain!r})"
+
+
+class LeadResult:
+    """Outcome of processing one lead.
+
+    Processing steps are kept as ``Step`` codes with the seconds each took and
+    only turned into text by ``processing_steps``, which templates and
+    ``dict(result)`` (and so every JSON/CSV writer) go through.
+    """
+
+    __slots__ = tuple(field for field in RESULT_FIELDS if field not in DERIVED_RESULT_FIELDS) + ('_steps', '_timings')
+
+    def __init__(self, company: str, email: str = None, website: str = None, industry: str = None, location: str = None,
+                 employees: str = None, revenue: str = None, phone: str = None, email_type: str = None):
+        self.company = company
+        self.email = email
+        self.website = website
+        self.industry = industry
+        self.location = location
+        self.employees = employees
+        self.revenue = revenue
+        self.phone = phone
+        self.status = 'Pending'
+        self.error: Optional[str] = None
+        self.domain: Optional[str] = None
+        self.summary: Optional[str] = None
+        self.email_content: Optional[str] = None
+        self.email_type = email_type
+        self.processing_time = 0
+        # Comma-separated reasons a stage fell back or was cut short, e.g. "summary_deadline".
+        self.degraded: Optional[str] = None
+        self._steps = array('B')
+        self._timings = array('f')
+
+    @classmethod
+    def for_lead(cls, lead, email_type: str) -> 'LeadResult':
+        return cls(lead['company_name'], lead.get('email'), lead.get('website'), lead.get('industry'), lead.get('location'),
+                   lead.get('employees'), lead.get('revenue'), lead.get('phone'), email_type)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LeadResult':
+        """Rebuild a result written by ``dict(result)``, e.g. from a checkpoint journal."""
+        result = cls(data.get('company'))
+        for field in RESULT_FIELDS:
+            if field in data and field not in DERIVED_RESULT_FIELDS:
+                setattr(result, field, data[field])
+        codes = {STEP_TEXT[step](result): step for step in Step}
+        timings = data.get('step_timings') or []
+        for position, text in enumerate(data.get('processing_steps') or []):
+            if text in codes:
+                result.add_step(codes[text], timings[position] if position < len(timings) else 0.0)
+        return result
+
+    def add_step(self, step: Step, seconds: float = 0.0):
+        self._steps.append(step)
+        self._timings.append(seconds)
+
+    def degrade(self, reason: str):
+        if not self.degraded:
+            self.degraded = reason
+        elif reason not in self.degraded.split(', '):
+            self.degraded = f"{self.degraded}, {reason}"
+
+    @property
+    def steps(self) -> List[Step]:
+        return [Step(code) for code in self._steps]
+
+    @property
+    def processing_steps(self) -> List[str]:
+        return [STEP_TEXT[code](self) for code in self._steps]
+
+    @property
+    def step_timings(self) -> List[float]:
+        return [round(seconds, 3) for seconds in self._timings]
+
+    def keys(self) -> tuple:
+        return RESULT_FIELDS + ('step_timings',)
+
+    def __getitem__(self, key: str):
+        if key not in RESULT_FIELDS and key != 'step_timings':
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        if key not in RESULT_FIELDS and key != 'step_timings':
+            return default
+        return getattr(self, key)
+
+    def __repr__(self):
+        return f"LeadResult({self.company!r}, status={self.status!r})"
@@ -0,0 +1,245 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from shared import Shared
+
+RUN_BUDGET_SECONDS = float(os.getenv('RUN_BUDGET_SECONDS', '0'))
+LEAD_BUDGET_SECONDS = float(os.getenv('LEAD_BUDGET_SECONDS', '0'))
+SCRAPE_BUDGET_SHARE = float(os.getenv('SCRAPE_BUDGET_SHARE', '0.4'))
+SUMMARY_BUDGET_SHARE = float(os.getenv('SUMMARY_BUDGET_SHARE', '0.5'))
+STAGE_MIN_SECONDS = float(os.getenv('STAGE_MIN_SECONDS', '0.25'))
+
+BREAKER_ENABLED = os.getenv('BREAKER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+BREAKER_WINDOW = int(os.getenv('BREAKER_WINDOW', '20'))
+BREAKER_MIN_CALLS = int(os.getenv('BREAKER_MIN_CALLS', '5'))
+# A run fetches each site about once, so domain circuits open on far fewer outcomes than provider ones.
+BREAKER_DOMAIN_MIN_CALLS = int(os.getenv('BREAKER_DOMAIN_MIN_CALLS', '2'))
+BREAKER_FAILURE_RATE = float(os.getenv('BREAKER_FAILURE_RATE', '0.5'))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv('BREAKER_COOLDOWN_SECONDS', '30'))
+BREAKER_MAX_KEYS = int(os.getenv('BREAKER_MAX_KEYS', '10000'))
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class Deadline:
+    """A point on the monotonic clock by which some work has to be done.
+
+    Deadlines nest: a lead's deadline never outlives the run's, and each stage
+    gets a share of whatever its lead has left. ``reason`` names the budget
+    that actually binds, and ``owner`` is the result that degradations noted
+    under this deadline are attributed to.
+    """
+
+    __slots__ = ('expires_at', 'reason', 'owner', 'parent')
+
+    def __init__(self, seconds: float = 0, parent: 'Deadline' = None, reason: str = 'lead', owner=None):
+        self.expires_at = time.monotonic() + seconds if seconds > 0 else math.inf
+        self.reason = reason
+        self.owner = owner
+        self.parent = parent
+        if parent is not None:
+            self._clamp()
+            if owner is None:
+                self.owner = parent.owner
+
+    def _clamp(self):
+        if self.parent.expires_at <= self.expires_at:
+            self.expires_at, self.reason = self.parent.expires_at, self.parent.reason
+
+    @property
+    def bounded(self) -> bool:
+        return self.expires_at != math.inf
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() < STAGE_MIN_SECONDS
+
+    def limit(self, timeout: float) -> float:
+        """``timeout`` cut down to what is left, for handing to a socket or client."""
+        return min(timeout, self.remaining()) if self.bounded else timeout
+
+    def resume(self, paused_at: float):
+        """Give back the time since ``paused_at`` (monotonic), e.g. spent waiting in a queue.
+
+        Only this deadline's own budget is extended; a parent's still binds.
+        """
+        if not self.bounded:
+            return
+        self.expires_at += max(0.0, time.monotonic() - paused_at)
+        if self.parent is not None:
+            self._clamp()
+
+    def stage(self, share: float, name: str) -> 'Deadline':
+        if not self.bounded:
+            return self
+        return Deadline(self.remaining() * share, self, name)
+
+    def check(self, before: str):
+        if self.expired:
+            raise DeadlineExceeded(f"{self.reason} budget exhausted before {before}")
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar('deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def cause_of(error: Exception) -> str:
+    if isinstance(error, DeadlineExceeded):
+        return 'deadline'
+    if isinstance(error, CircuitOpenError):
+        return 'circuit_open'
+    return 'error'
+
+
+def note_degraded(stage: str, cause: str):
+    """Attribute a fallback to the result whose deadline is in scope, if any."""
+    deadline = _current.get()
+    if deadline is not None and deadline.owner is not None:
+        deadline.owner.degrade(f"{stage}_{cause}")
+
+
+class _Circuit:
+    __slots__ = ('outcomes', 'failures', 'opened_at', 'trial')
+
+    def __init__(self, window: int):
+        self.outcomes = deque(maxlen=window)
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial = False
+
+
+class BreakerRegistry:
+    """Circuit breakers keyed by site or provider name.
+
+    A key opens once at least ``min_calls`` of its last ``window`` calls were
+    made and ``failure_rate`` of them failed; callers then fail fast for
+    ``cooldown`` seconds. After that a single trial call is let through, and
+    its outcome closes the circuit again or restarts the cooldown. Only the
+    ``max_keys`` most recently used keys are tracked.
+    """
+
+    def __init__(self, name: str, window: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 failure_rate: float = BREAKER_FAILURE_RATE, cooldown: float = BREAKER_COOLDOWN_SECONDS,
+                 max_keys: int = BREAKER_MAX_KEYS):
+        self.name = name
+        self.window = max(1, window)
+        self.min_calls = max(1, min(min_calls, self.window))
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.max_keys = max_keys
+        self._circuits: 'OrderedDict[str, _Circuit]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'opened': 0, 'rejected': 0, 'trials': 0, 'closed': 0}
+
+    def _circuit(self, key: str) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit(self.window)
+            while len(self._circuits) > self.max_keys:
+                self._circuits.popitem(last=False)
+        else:
+            self._circuits.move_to_end(key)
+        return circuit
+
+    def allow(self, key: str) -> bool:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.opened_at is None:
+                return True
+            if circuit.trial or time.monotonic() - circuit.opened_at < self.cooldown:
+                self._counters['rejected'] += 1
+                return False
+            circuit.trial = True
+            self._counters['trials'] += 1
+            return True
+
+    def record(self, key: str, ok: bool):
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.opened_at is not None:
+                if not circuit.trial:
+                    # A call admitted before the circuit opened; the trial decides.
+                    return
+                circuit.trial = False
+                if ok:
+                    circuit.opened_at = None
+                    circuit.outcomes.clear()
+                    circuit.failures = 0
+                    self._counters['closed'] += 1
+                else:
+                    circuit.opened_at = time.monotonic()
+                return
+            if len(circuit.outcomes) == circuit.outcomes.maxlen and not circuit.outcomes[0]:
+                circuit.failures -= 1
+            circuit.outcomes.append(ok)
+            if not ok:
+                circuit.failures += 1
+                if len(circuit.outcomes) >= self.min_calls and circuit.failures >= self.failure_rate * len(circuit.outcomes):
+                    circuit.opened_at = time.monotonic()
+                    self._counters['opened'] += 1
+
+    def cancel(self, key: str):
+        """Give back a trial that ended without reaching the upstream."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is not None:
+                circuit.trial = False
+
+    def is_open(self, key: str) -> bool:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return circuit is not None and circuit.opened_at is not None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['open'] = sum(1 for circuit in self._circuits.values() if circuit.opened_at is not None)
+            stats['tracked'] = len(self._circuits)
+        return stats
+
+
+_shared_domain_breakers: Shared[BreakerRegistry] = Shared(
+    lambda: BreakerRegistry('domain', min_calls=BREAKER_DOMAIN_MIN_CALLS) if BREAKER_ENABLED else None)
+_shared_provider_breakers: Shared[BreakerRegistry] = Shared(lambda: BreakerRegistry('provider') if BREAKER_ENABLED else None)
+
+
+def get_domain_breakers() -> Optional[BreakerRegistry]:
+    return _shared_domain_breakers.get()
+
+
+def get_provider_breakers() -> Optional[BreakerRegistry]:
+    return _shared_provider_breakers.get()
+
+
+def get_breaker_stats() -> Dict:
+    stats = {'enabled': BREAKER_ENABLED}
+    for name, breakers in (('domain', get_domain_breakers()), ('provider', get_provider_breakers())):
+        stats[name] = breakers.stats() if breakers else {'opened': 0, 'rejected': 0, 'trials': 0, 'closed': 0, 'open': 0, 'tracked': 0}
+    return stats
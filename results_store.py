@@ -0,0 +1,120 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from shared import Shared
+
+RESULTS_DB_PATH = os.getenv('RESULTS_DB_PATH', os.path.join('data', 'results.db'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    timestamp TEXT,
+    metrics TEXT,
+    filters TEXT,
+    total INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT,
+    company TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (run_id, position)
+);
+"""
+
+
+class ResultStore:
+    def __init__(self, path: str = RESULTS_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory and path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def save_run(self, run_id: str, metrics: Dict, filters: Dict, timestamp: str, results: Iterable[Dict]) -> str:
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO runs (run_id, created_at, timestamp, metrics, filters, total) VALUES (?, ?, ?, ?, ?, 0)',
+                (run_id, datetime.now().isoformat(), timestamp, json.dumps(metrics, default=str), json.dumps(filters))
+            )
+            conn.execute('DELETE FROM results WHERE run_id = ?', (run_id,))
+        self.add_results(run_id, results)
+        return run_id
+
+    def add_results(self, run_id: str, results: Iterable[Dict], start_position: int = None) -> int:
+        conn = self._connection()
+        with conn:
+            if start_position is None:
+                start_position = conn.execute('SELECT total FROM runs WHERE run_id = ?', (run_id,)).fetchone()['total']
+            rows = (
+                (run_id, start_position + offset, result.get('status'), result.get('company'), json.dumps(dict(result), default=str))
+                for offset, result in enumerate(results)
+            )
+            conn.executemany(
+                'INSERT OR REPLACE INTO results (run_id, position, status, company, data) VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+            conn.execute(
+                'UPDATE runs SET total = (SELECT COUNT(*) FROM results WHERE run_id = ?) WHERE run_id = ?',
+                (run_id, run_id)
+            )
+            return conn.execute('SELECT total FROM runs WHERE run_id = ?', (run_id,)).fetchone()['total']
+
+    def get_run(self, run_id: str) -> Optional[Dict]:
+        row = self._connection().execute('SELECT * FROM runs WHERE run_id = ?', (run_id,)).fetchone()
+        if not row:
+            return None
+        return {
+            'run_id': row['run_id'],
+            'timestamp': row['timestamp'],
+            'metrics': json.loads(row['metrics'] or '{}'),
+            'filters': json.loads(row['filters'] or '{}'),
+            'total': row['total']
+        }
+
+    def get_results(self, run_id: str, offset: int = 0, limit: int = 20) -> List[Dict]:
+        rows = self._connection().execute(
+            'SELECT data FROM results WHERE run_id = ? AND position >= ? ORDER BY position LIMIT ?',
+            (run_id, offset, limit)
+        )
+        return [json.loads(row['data']) for row in rows]
+
+    def iter_results(self, run_id: str, batch_size: int = 500):
+        offset = 0
+        while True:
+            batch = self.get_results(run_id, offset, batch_size)
+            if not batch:
+                return
+            yield from batch
+            offset += len(batch)
+
+    def delete_run(self, run_id: str):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM results WHERE run_id = ?', (run_id,))
+            conn.execute('DELETE FROM runs WHERE run_id = ?', (run_id,))
+
+
+_shared_store: Shared[ResultStore] = Shared(ResultStore)
+
+
+def get_result_store() -> ResultStore:
+    return _shared_store.get()
@@ -0,0 +1,345 @@
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from resilience import Deadline, current_deadline, note_degraded
+from shared import Shared
+
+SCRAPER_TIMEOUT = float(os.getenv('SCRAPER_TIMEOUT', '10'))
+SCRAPER_CONNECT_TIMEOUT = float(os.getenv('SCRAPER_CONNECT_TIMEOUT', '5'))
+SCRAPER_MAX_RETRIES = int(os.getenv('SCRAPER_MAX_RETRIES', '2'))
+SCRAPER_BACKOFF = float(os.getenv('SCRAPER_BACKOFF', '0.5'))
+SCRAPER_MAX_BYTES = int(os.getenv('SCRAPER_MAX_BYTES', str(2 * 1024 * 1024)))
+SCRAPER_MAX_CHARS = int(os.getenv('SCRAPER_MAX_CHARS', '4000'))
+SCRAPER_MAX_CONCURRENCY = int(os.getenv('SCRAPER_MAX_CONCURRENCY', '32'))
+SCRAPER_PER_DOMAIN_CONCURRENCY = int(os.getenv('SCRAPER_PER_DOMAIN_CONCURRENCY', '2'))
+SCRAPER_GLOBAL_RPS = float(os.getenv('SCRAPER_GLOBAL_RPS', '0'))
+SCRAPER_DOMAIN_RPS = float(os.getenv('SCRAPER_DOMAIN_RPS', '1'))
+SCRAPER_POOL_HOSTS = int(os.getenv('SCRAPER_POOL_HOSTS', '256'))
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'head', 'iframe'}
+BLOCK_TAGS = {'p', 'div', 'li', 'br', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'article', 'td', 'tr'}
+WHITESPACE = re.compile(r'\s+')
+
+
+def parse_retry_after(value: Optional[str], cap: float = 60.0) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return min(float(value), cap)
+    except ValueError:
+        try:
+            return min(max((parsedate_to_datetime(value).timestamp() - time.time()), 0.0), cap)
+        except (TypeError, ValueError):
+            return None
+
+
+class RateLimiter:
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    @property
+    def idle(self) -> bool:
+        """No slot handed out that is still in the future."""
+        return self._next_slot <= time.monotonic()
+
+
+class _DomainControls:
+    __slots__ = ('slot', 'rate', 'users')
+
+    def __init__(self, concurrency: int, rps: float):
+        self.slot = threading.BoundedSemaphore(concurrency)
+        self.rate = RateLimiter(rps)
+        self.users = 0
+
+
+class _TextCollector:
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.parts = []
+        self.length = 0
+        self.skip_depth = 0
+        # Set once text had to be left out, as opposed to merely filling up.
+        self.dropped = False
+
+    @property
+    def full(self) -> bool:
+        return self.length >= self.max_chars
+
+    def start(self, tag, attrib):
+        tag = tag.lower() if isinstance(tag, str) else ''
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def end(self, tag):
+        tag = tag.lower() if isinstance(tag, str) else ''
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def data(self, data):
+        if self.skip_depth:
+            return
+        if self.full:
+            self.dropped = self.dropped or not data.isspace()
+            return
+        self.parts.append(data)
+        self.length += len(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return self.text()
+
+    def text(self) -> str:
+        text = WHITESPACE.sub(' ', ''.join(self.parts)).strip()
+        if len(text) > self.max_chars:
+            self.dropped = True
+        return text[:self.max_chars]
+
+
+class StreamingTextExtractor:
+    def __init__(self, max_chars: int = SCRAPER_MAX_CHARS):
+        from lxml import etree
+
+        self.collector = _TextCollector(max_chars)
+        self.parser = etree.HTMLParser(target=self.collector, recover=True, no_network=True)
+        self._closed = False
+
+    @property
+    def done(self) -> bool:
+        return self.collector.full
+
+    @property
+    def dropped(self) -> bool:
+        return self.collector.dropped
+
+    def feed(self, chunk: bytes):
+        self.parser.feed(chunk)
+
+    def close(self) -> str:
+        if not self._closed:
+            self._closed = True
+            from lxml import etree
+
+            try:
+                self.parser.close()
+            except etree.LxmlError:
+                pass
+        return self.collector.text()
+
+
+def extract_text(html: bytes, max_chars: int = SCRAPER_MAX_CHARS) -> str:
+    extractor = StreamingTextExtractor(max_chars)
+    extractor.feed(html)
+    return extractor.close()
+
+
+class FetchEngine:
+    def __init__(self, timeout: float = SCRAPER_TIMEOUT, connect_timeout: float = SCRAPER_CONNECT_TIMEOUT,
+                 max_retries: int = SCRAPER_MAX_RETRIES, backoff: float = SCRAPER_BACKOFF,
+                 max_bytes: int = SCRAPER_MAX_BYTES, max_chars: int = SCRAPER_MAX_CHARS,
+                 max_concurrency: int = SCRAPER_MAX_CONCURRENCY, per_domain_concurrency: int = SCRAPER_PER_DOMAIN_CONCURRENCY,
+                 global_rps: float = SCRAPER_GLOBAL_RPS, domain_rps: float = SCRAPER_DOMAIN_RPS,
+                 schemes: Tuple[str, ...] = ('https', 'http'), max_domains: int = SCRAPER_POOL_HOSTS):
+        self.timeout = (connect_timeout, timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.per_domain_concurrency = per_domain_concurrency
+        self.domain_rps = domain_rps
+        self.schemes = schemes
+        self.max_domains = max(1, max_domains)
+        self._session = None
+
+        self._global_slots = threading.BoundedSemaphore(max_concurrency)
+        self._global_rate = RateLimiter(global_rps)
+        # Least recently used first; see _domain_controls.
+        self._domains: 'OrderedDict[str, _DomainControls]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0, 'bytes': 0, 'truncated': 0, 'deadline_exceeded': 0}
+
+    @property
+    def session(self):
+        # requests is only imported, and the pool only built, once something is actually fetched.
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    session.headers.update({
+                        'User-Agent': USER_AGENT,
+                        'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.5',
+                        'Accept-Language': 'en-US,en;q=0.8',
+                        'Connection': 'keep-alive'
+                    })
+                    adapter = HTTPAdapter(pool_connections=self.max_domains, pool_maxsize=max(self.per_domain_concurrency, 1), max_retries=0)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _domain_controls(self, domain: str) -> _DomainControls:
+        # Only the most recently used domains are kept. An entry is evicted only
+        # while idle, i.e. nobody is fetching from it and its rate limiter has no
+        # future slot outstanding, so eviction never loosens a domain's limits.
+        with self._lock:
+            controls = self._domains.get(domain)
+            if controls is None:
+                controls = self._domains[domain] = _DomainControls(self.per_domain_concurrency, self.domain_rps)
+            else:
+                self._domains.move_to_end(domain)
+            controls.users += 1
+            self._prune_domains()
+            return controls
+
+    def _release_domain(self, controls: _DomainControls):
+        with self._lock:
+            controls.users -= 1
+            self._prune_domains()
+
+    def _prune_domains(self):
+        excess = len(self._domains) - self.max_domains
+        if excess <= 0:
+            return
+        for domain in [domain for domain, entry in self._domains.items() if not entry.users and entry.rate.idle][:excess]:
+            del self._domains[domain]
+
+    def fetch_text(self, domain: str) -> Optional[str]:
+        result = self.fetch_page(domain)
+        return result['text'] if result else None
+
+    def fetch_page(self, domain: str, headers: Dict = None) -> Optional[Dict]:
+        for scheme in self.schemes:
+            result = self.fetch(f"{scheme}://{domain}/", domain, headers)
+            if result and (result['text'] or result['status'] == 304):
+                return result
+        return None
+
+    def fetch(self, url: str, domain: str = None, headers: Dict = None) -> Optional[Dict]:
+        domain = domain or url.split('://', 1)[-1].split('/', 1)[0]
+        controls = self._domain_controls(domain)
+        try:
+            return self._fetch(url, headers, controls)
+        finally:
+            self._release_domain(controls)
+
+    def _fetch(self, url: str, headers: Optional[Dict], controls: _DomainControls) -> Optional[Dict]:
+        import requests
+
+        deadline = current_deadline()
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            # Wait for rate slots first, so nobody sleeps on them while holding a concurrency slot.
+            controls.rate.acquire()
+            self._global_rate.acquire()
+            with controls.slot:
+                with self._global_slots:
+                    if deadline is not None and deadline.expired:
+                        self._count('deadline_exceeded')
+                        note_degraded('scrape', 'deadline')
+                        return None
+                    try:
+                        result = self._fetch_once(url, headers, deadline)
+                        if result['status'] not in RETRY_STATUSES:
+                            return result
+                        retry_after = parse_retry_after(result['headers'].get('Retry-After'))
+                    except (requests.ConnectionError, requests.Timeout) as e:
+                        if attempt == self.max_retries:
+                            print(f"Error fetching {url}: {e}")
+                    except requests.RequestException as e:
+                        print(f"Error fetching {url}: {e}")
+                        self._count('failures')
+                        return None
+
+            if attempt < self.max_retries:
+                delay = retry_after if retry_after is not None else self.backoff * (2 ** attempt)
+                if deadline is not None and deadline.remaining() <= delay:
+                    break
+                self._count('retries')
+                time.sleep(delay + random.uniform(0, self.backoff / 2))
+
+        self._count('failures')
+        return None
+
+    def _fetch_once(self, url: str, headers: Dict = None, deadline: Deadline = None) -> Dict:
+        self._count('requests')
+        timeout = self.timeout
+        if deadline is not None and deadline.bounded:
+            timeout = (deadline.limit(timeout[0]), deadline.limit(timeout[1]))
+        with self.session.get(url, headers=headers, timeout=timeout, stream=True, allow_redirects=True) as response:
+            result = {
+                'url': response.url,
+                'status': response.status_code,
+                'headers': dict(response.headers),
+                'text': None,
+                'truncated': False
+            }
+            content_type = response.headers.get('Content-Type', 'text/html')
+            if response.status_code != 200 or ('html' not in content_type and 'text' not in content_type):
+                return result
+
+            extractor = StreamingTextExtractor(self.max_chars)
+            received = 0
+            chunks = response.iter_content(chunk_size=16384)
+            for chunk in chunks:
+                received += len(chunk)
+                extractor.feed(chunk)
+                if extractor.done or received >= self.max_bytes:
+                    # Peek at one more chunk: a page that ends right at a limit is not truncated.
+                    rest = next(chunks, b'')
+                    if received >= self.max_bytes:
+                        result['truncated'] = bool(rest)
+                    elif rest:
+                        extractor.feed(rest)
+                    received += len(rest)
+                    break
+                if deadline is not None and deadline.remaining() <= 0:
+                    # Keep what arrived; a slow trickle of bytes never trips the read timeout.
+                    result['truncated'] = True
+                    self._count('deadline_exceeded')
+                    note_degraded('scrape', 'deadline')
+                    break
+
+            self._count('bytes', received)
+            result['text'] = extractor.close() or None
+            result['truncated'] = result['truncated'] or extractor.dropped
+            if result['truncated']:
+                self._count('truncated')
+            return result
+
+
+_shared_engine: Shared[FetchEngine] = Shared(FetchEngine)
+
+
+def get_fetch_engine() -> FetchEngine:
+    return _shared_engine.get()
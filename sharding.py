@@ -0,0 +1,177 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+import traceback
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+WORKFLOW_SHARDS = int(os.getenv('WORKFLOW_SHARDS', '0'))
+SHARD_CHUNK_SIZE = int(os.getenv('SHARD_CHUNK_SIZE', '32'))
+SHARD_START_METHOD = os.getenv('SHARD_START_METHOD', 'spawn')
+SHARD_POLL_SECONDS = 1.0
+
+
+def shard_for(key: Optional[str], shards: int) -> int:
+    # crc32 rather than hash(), which is salted differently in every process.
+    return zlib.crc32((key or '').encode('utf-8')) % shards
+
+
+def _serve(build: Callable, inbox, outbox):
+    handler = build()
+    while True:
+        task = inbox.get()
+        if task is None:
+            return
+        token, options, sequence, items = task
+
+        # Side records go out ahead of the chunk's results, tagged with no sequence.
+        def report(record, token=token):
+            outbox.put((token, None, record, None))
+
+        try:
+            outbox.put((token, sequence, handler(items, options, report), None))
+        except Exception:
+            outbox.put((token, sequence, None, traceback.format_exc()))
+
+
+class ShardPool:
+    """Long-lived worker processes, each owning a fixed slice of the key space.
+
+    Items are routed by ``shard_for(key)``, so a key always lands in the same
+    process and reuses whatever that process keeps warm for it. ``build`` runs
+    once per process and returns a handler called with a chunk of items, the
+    run options and a ``report`` callable, returning one result per item; it
+    must be picklable. Anything passed to ``report`` reaches the parent while
+    the chunk is still running. Results are yielded in input order, with at
+    most ``max_in_flight`` items outstanding so a slow shard cannot make the
+    reorder buffer grow unbounded.
+
+    Several ``map`` calls may run at once: every reply carries its run's
+    token and a router thread hands it to that run's own queue.
+    """
+
+    def __init__(self, shards: int, build: Callable, chunk_size: int = SHARD_CHUNK_SIZE,
+                 start_method: str = SHARD_START_METHOD, max_in_flight: int = None):
+        context = multiprocessing.get_context(start_method)
+        self.shards = shards
+        self.chunk_size = max(1, chunk_size)
+        self.max_in_flight = max_in_flight or shards * self.chunk_size * 4
+        self.stats = {'runs': 0, 'chunks': 0, 'items': [0] * shards}
+        self._outbox = context.Queue()
+        self._inboxes = [context.Queue() for _ in range(shards)]
+        self._processes = [
+            context.Process(target=_serve, args=(build, inbox, self._outbox), name=f'lead-shard-{n}', daemon=True)
+            for n, inbox in enumerate(self._inboxes)
+        ]
+        for process in self._processes:
+            process.start()
+        self._lock = threading.Lock()
+        self._token = 0
+        self._runs: Dict[int, queue.Queue] = {}
+        self._closed = False
+        self._router = threading.Thread(target=self._route, name='lead-shard-router', daemon=True)
+        self._router.start()
+        atexit.register(self.close)
+
+    def map(self, items: Iterable[tuple], options: Union[Dict, Callable[[], Dict]] = None,
+            on_record: Callable = None) -> Iterator:
+        """Yields the handler's result for each ``(key, item)`` pair, in input order.
+
+        ``options`` go out with every chunk; a callable is asked afresh for each one.
+        Records the handler reports are passed to ``on_record`` as they arrive.
+        """
+        with self._lock:
+            self._token += 1
+            token = self._token
+            self.stats['runs'] += 1
+            replies = self._runs[token] = queue.Queue()
+        pending: List[List[tuple]] = [[] for _ in range(self.shards)]
+        done: Dict[int, object] = {}
+        submitted = 0
+        next_out = 0
+
+        def send(shard: int):
+            chunk = pending[shard]
+            if chunk:
+                pending[shard] = []
+                chunk_options = options() if callable(options) else options
+                self._inboxes[shard].put((token, chunk_options, [seq for seq, _ in chunk], [item for _, item in chunk]))
+                with self._lock:
+                    self.stats['chunks'] += 1
+
+        def collect():
+            sequence, results, error = replies.get()
+            if error is not None:
+                raise RuntimeError(error)
+            if sequence is None:
+                if on_record is not None:
+                    on_record(results)
+                return
+            done.update(zip(sequence, results))
+
+        # A run abandoned midway unregisters here; replies still in flight for
+        # its token are dropped by the router.
+        try:
+            for key, item in items:
+                shard = shard_for(key, self.shards)
+                pending[shard].append((submitted, item))
+                with self._lock:
+                    self.stats['items'][shard] += 1
+                submitted += 1
+                if len(pending[shard]) >= self.chunk_size:
+                    send(shard)
+                while submitted - next_out >= self.max_in_flight:
+                    for shard in range(self.shards):
+                        send(shard)
+                    collect()
+                    while next_out in done:
+                        yield done.pop(next_out)
+                        next_out += 1
+
+            for shard in range(self.shards):
+                send(shard)
+            while next_out < submitted:
+                if next_out not in done:
+                    collect()
+                    continue
+                yield done.pop(next_out)
+                next_out += 1
+        finally:
+            with self._lock:
+                self._runs.pop(token, None)
+
+    def _route(self):
+        while not self._closed:
+            try:
+                token, sequence, results, error = self._outbox.get(timeout=SHARD_POLL_SECONDS)
+            except queue.Empty:
+                dead = [process.name for process in self._processes if not process.is_alive()]
+                if dead and not self._closed:
+                    self._broadcast(f"Shard process exited: {', '.join(dead)}")
+                continue
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                replies = self._runs.get(token)
+            if replies is not None:
+                replies.put((sequence, results, None if error is None else f"Shard worker failed:\n{error}"))
+
+    def _broadcast(self, error: str):
+        with self._lock:
+            runs = list(self._runs.values())
+        for replies in runs:
+            replies.put((None, None, error))
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._broadcast('Shard pool closed')
@@ -0,0 +1,26 @@
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class Shared(Generic[T]):
+    """A process-wide instance, built by ``factory`` the first time it is asked for.
+
+    ``factory`` returns None for a component that configuration switches off;
+    that answer is kept as well, so the factory only ever runs once.
+    """
+
+    def __init__(self, factory: Callable[[], Optional[T]]):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._built = False
+        self._instance: Optional[T] = None
+
+    def get(self) -> Optional[T]:
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self._instance = self._factory()
+                    self._built = True
+        return self._instance
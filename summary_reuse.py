@@ -0,0 +1,152 @@
+import os
+import random
+import re
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from dedup import company_key
+from shared import Shared
+
+SUMMARY_REUSE_ENABLED = os.getenv('SUMMARY_REUSE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+SUMMARY_REUSE_THRESHOLD = float(os.getenv('SUMMARY_REUSE_THRESHOLD', '0.9'))
+SUMMARY_REUSE_MAX_ENTRIES = int(os.getenv('SUMMARY_REUSE_MAX_ENTRIES', '50000'))
+SUMMARY_REUSE_PERMUTATIONS = int(os.getenv('SUMMARY_REUSE_PERMUTATIONS', '128'))
+SUMMARY_REUSE_BANDS = int(os.getenv('SUMMARY_REUSE_BANDS', '16'))
+SUMMARY_REUSE_SHINGLE = int(os.getenv('SUMMARY_REUSE_SHINGLE', '3'))
+
+WORD = re.compile(r'[a-z0-9]+')
+MERSENNE_PRIME = (1 << 61) - 1
+# Stand-ins for the lead's own name and domain in stored summaries; never part of real text.
+COMPANY_SLOT = '\x00company\x00'
+DOMAIN_SLOT = '\x00domain\x00'
+# Their counterparts when masking page content, which must survive WORD tokenizing as one word.
+COMPANY_TOKEN = ' zzcompany '
+DOMAIN_TOKEN = ' zzdomain '
+
+
+class SummaryIndex:
+    """Near-duplicate lookup from scraped page text to an already paid-for summary.
+
+    Pages are reduced to word shingles with the lead's own company name and
+    domain masked out, so boilerplate that only differs by who it is about
+    matches exactly. Shingle sets are MinHashed and banded for LSH, and a
+    candidate is reused only if its estimated Jaccard similarity reaches
+    ``threshold``. Summaries are stored with the source company's name and
+    domain as slots and filled in for the lead that reuses them; a summary
+    that still names its source company some other way is never reused.
+    """
+
+    def __init__(self, threshold: float = SUMMARY_REUSE_THRESHOLD, max_entries: int = SUMMARY_REUSE_MAX_ENTRIES,
+                 permutations: int = SUMMARY_REUSE_PERMUTATIONS, bands: int = SUMMARY_REUSE_BANDS,
+                 shingle_size: int = SUMMARY_REUSE_SHINGLE, seed: int = 1):
+        if permutations % bands:
+            raise ValueError(f"permutations ({permutations}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.shingle_size = shingle_size
+        self.rows = permutations // bands
+        rng = random.Random(seed)
+        self._coefficients = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME)) for _ in range(permutations)]
+        self._entries: 'OrderedDict[int, Tuple[tuple, str]]' = OrderedDict()
+        self._buckets: List[Dict[tuple, set]] = [defaultdict(set) for _ in range(bands)]
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._counters = {'lookups': 0, 'hits': 0, 'added': 0, 'unadaptable': 0, 'evictions': 0}
+
+    def signature(self, company_name: str, domain: str, content: Optional[str]) -> Optional[tuple]:
+        text = (content or '').lower()
+        for needle, slot in sorted(((domain or '', DOMAIN_TOKEN), (company_name or '', COMPANY_TOKEN)), key=lambda item: -len(item[0])):
+            if needle.strip():
+                text = text.replace(needle.strip().lower(), slot)
+        words = WORD.findall(text)
+        if not words:
+            return None
+        size = min(self.shingle_size, len(words))
+        hashes = {zlib.crc32(' '.join(words[i:i + size]).encode('utf-8')) for i in range(len(words) - size + 1)}
+        return tuple(min((a * value + b) % MERSENNE_PRIME for value in hashes) for a, b in self._coefficients)
+
+    def _band_keys(self, signature: tuple) -> List[tuple]:
+        return [signature[start:start + self.rows] for start in range(0, len(signature), self.rows)]
+
+    def match(self, company_name: str, domain: str, content: Optional[str]) -> Tuple[Optional[str], Optional[tuple]]:
+        """A summary adapted from the closest near-duplicate page, and the signature to ``add`` on a miss."""
+        signature = self.signature(company_name, domain, content)
+        if signature is None:
+            return None, None
+        best_score, best_template = 0.0, None
+        with self._lock:
+            self._counters['lookups'] += 1
+            candidates = set()
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(buckets.get(key, ()))
+            for entry_id in candidates:
+                other, template = self._entries[entry_id]
+                score = sum(1 for mine, theirs in zip(signature, other) if mine == theirs) / len(signature)
+                if score > best_score:
+                    best_score, best_template = score, template
+            if best_template is None or best_score < self.threshold:
+                return None, signature
+            self._counters['hits'] += 1
+        return best_template.replace(COMPANY_SLOT, company_name or '').replace(DOMAIN_SLOT, domain or ''), signature
+
+    def add(self, signature: Optional[tuple], company_name: str, domain: str, summary: Optional[str]):
+        if signature is None or not summary:
+            return
+        template = _templatize(summary, company_name, domain)
+        with self._lock:
+            if template is None:
+                self._counters['unadaptable'] += 1
+                return
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (signature, template)
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                buckets[key].add(entry_id)
+            self._counters['added'] += 1
+            while len(self._entries) > self.max_entries:
+                old_id, (old_signature, _) = self._entries.popitem(last=False)
+                for buckets, key in zip(self._buckets, self._band_keys(old_signature)):
+                    bucket = buckets.get(key)
+                    if bucket is not None:
+                        bucket.discard(old_id)
+                        if not bucket:
+                            del buckets[key]
+                self._counters['evictions'] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+        stats['llm_calls_avoided'] = stats['hits']
+        stats['hit_rate'] = round(stats['hits'] / stats['lookups'] * 100, 1) if stats['lookups'] else 0
+        return stats
+
+
+def _templatize(summary: str, company_name: str, domain: str) -> Optional[str]:
+    template = summary
+    if domain:
+        template = template.replace(domain, DOMAIN_SLOT)
+    if company_name:
+        template = template.replace(company_name, COMPANY_SLOT)
+    lowered = template.lower()
+    # A short form like "TechCorp" for "TechCorp Solutions" would leak into another lead's summary.
+    names = [(domain or '').split('.')[0].lower()] + company_key(company_name).split()[:1]
+    if any(len(name) >= 4 and name in lowered for name in names):
+        return None
+    return template
+
+
+_shared_index: Shared[SummaryIndex] = Shared(lambda: SummaryIndex() if SUMMARY_REUSE_ENABLED else None)
+
+
+def get_summary_index() -> Optional[SummaryIndex]:
+    return _shared_index.get()
+
+
+def get_summary_reuse_stats() -> Dict:
+    index = get_summary_index()
+    if not index:
+        return {'enabled': False, 'lookups': 0, 'hits': 0, 'llm_calls_avoided': 0, 'hit_rate': 0}
+    return {'enabled': True, **index.stats()}
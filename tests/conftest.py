@@ -0,0 +1,20 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix='leadgen-tests-')
+
+# Set before any project module is imported, since settings are read at import
+# time; shard processes inherit the environment too.
+os.environ.update({
+    'GROQ_API_KEY': '',
+    'ANALYTICS_DB_PATH': os.path.join(WORKDIR, 'analytics.db'),
+    'LLM_CACHE_ENABLED': 'false',
+    'PAGE_CACHE_ENABLED': 'false',
+    'DEDUP_ENABLED': 'false',
+    'SUMMARY_REUSE_ENABLED': 'false',
+    'SCRAPER_MODE': 'mock',
+})
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
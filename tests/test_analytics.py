@@ -0,0 +1,103 @@
+import threading
+
+from analytics import AnalyticsStore
+
+DAY = '2026-01-15'
+
+
+def make_store(tmp_path) -> AnalyticsStore:
+    return AnalyticsStore(str(tmp_path / 'analytics.db'), flush_seconds=0)
+
+
+def run_threads(count: int, target, *args):
+    threads = [threading.Thread(target=target, args=args) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def record(store: AnalyticsStore, leads: int):
+    for n in range(leads):
+        store.record_lead('Completed' if n % 4 else 'Error', 0.5, day=DAY)
+        store.observe('scrape', 0.02, industry='Retail', day=DAY)
+
+
+def test_flush_writes_each_shard_delta_once(tmp_path):
+    store = make_store(tmp_path)
+    store.incr('runs', 2, day=DAY)
+    store.flush()
+    store.flush()
+    store.incr('runs', day=DAY)
+
+    assert store.snapshot()['total_runs'] == 3
+    assert store.snapshot()['total_runs'] == 3
+
+
+def test_shards_of_finished_threads_are_dropped_after_flush(tmp_path):
+    store = make_store(tmp_path)
+    run_threads(8, record, store, 100)
+
+    assert len(store._shards) == 8
+    store.flush()
+    assert store._shards == []
+
+    snapshot = store.snapshot()
+    assert snapshot['total_leads_processed'] == 800
+    assert (snapshot['successful_generations'], snapshot['failed_generations']) == (600, 200)
+    assert store.histograms()[('scrape',)]['count'] == 800
+
+
+def test_counts_survive_a_restart(tmp_path):
+    store = make_store(tmp_path)
+    record(store, 10)
+    store.close()
+
+    reopened = make_store(tmp_path)
+    record(reopened, 10)
+
+    snapshot = reopened.snapshot()
+    assert snapshot['total_leads_processed'] == 20
+    assert snapshot['daily_stats'][DAY]['average_processing_time'] == 0.5
+
+
+def test_workers_sharing_a_database_are_merged(tmp_path):
+    # Two stores on one file stand in for two processes writing the same database.
+    first, second = make_store(tmp_path), make_store(tmp_path)
+    run_threads(4, record, first, 50)
+    run_threads(4, record, second, 25)
+    second.flush()
+
+    for store in (first, second):
+        assert store.snapshot()['total_leads_processed'] == 300
+        assert store.latency_report()[0]['count'] == 300
+
+
+def test_flushing_while_threads_keep_writing_loses_nothing(tmp_path):
+    store = make_store(tmp_path)
+    stop = threading.Event()
+    errors = []
+
+    def flusher():
+        try:
+            while not stop.is_set():
+                store.flush()
+        except Exception as e:
+            errors.append(e)
+
+    def writer():
+        # New keys keep growing the shard's dict while the flusher copies it.
+        for n in range(3000):
+            store.incr(f'event:{n % 500}', day=DAY)
+            store.incr('runs', day=DAY)
+
+    background = threading.Thread(target=flusher)
+    background.start()
+    run_threads(4, writer)
+    stop.set()
+    background.join()
+
+    assert errors == []
+    assert store.snapshot()['total_runs'] == 12000
+    rows = store._connection().execute("SELECT SUM(value) FROM counters WHERE name LIKE 'event:%'").fetchone()
+    assert rows[0] == 12000
@@ -0,0 +1,100 @@
+import hashlib
+import multiprocessing
+import os
+from collections import Counter
+
+from checkpoint import CheckpointJournal
+from fake_groq import FakeGroqClient
+from llm_gateway import LLMGateway
+from workflow import LeadGenerationWorkflow
+
+LEADS = 20
+CRASH_AFTER = 15
+UNREACHABLE = {'company2.com', 'company5.com'}
+
+
+class LedgerClient(FakeGroqClient):
+    """Logs every completion it delivers; with ``crash_after`` set, kills the process on that request."""
+
+    def __init__(self, ledger_path: str, crash_after: int = 0):
+        super().__init__()
+        self.ledger_path = ledger_path
+        self.crash_after = crash_after
+
+    def create(self, messages, model, stream: bool = False, **params):
+        if self.crash_after and self.request_count >= self.crash_after:
+            os._exit(137)
+        response = super().create(messages, model, stream=stream, **params)
+        with open(self.ledger_path, 'a', encoding='utf-8') as ledger:
+            ledger.write(hashlib.sha1(messages[-1]['content'].encode('utf-8')).hexdigest() + '\n')
+        return response
+
+
+class FlakyScraper:
+    def __init__(self, unreachable=()):
+        self.unreachable = set(unreachable)
+
+    def scrape_website_content(self, domain: str):
+        return None if domain in self.unreachable else f"{domain} builds software for modern businesses."
+
+
+def make_leads():
+    return [
+        {'company_name': f'Company {i}', 'email': f'info@company{i}.com', 'website': f'https://company{i}.com',
+         'industry': 'Technology'}
+        for i in range(LEADS)
+    ]
+
+
+def run(workdir: str, crash_after: int, unreachable=()):
+    journal = CheckpointJournal(os.path.join(workdir, 'journal.jsonl'))
+    workflow = LeadGenerationWorkflow(max_workers=1, checkpoint=journal, batch_llm=False, pipeline=False, shards=0,
+                                      run_budget=0, lead_budget=0)
+    workflow.web_scraper = FlakyScraper(unreachable)
+    gateway = LLMGateway(LedgerClient(os.path.join(workdir, 'ledger.txt'), crash_after), rpm=0, tpm=0, use_cache=False)
+    workflow.summarizer.gateway = gateway
+    workflow.email_generator.gateway = gateway
+    metrics = {}
+    try:
+        return list(workflow.run_stream(make_leads(), metrics=metrics)), metrics
+    finally:
+        journal.close()
+
+
+def test_resume_after_crash_finishes_every_lead_once(tmp_path):
+    workdir = str(tmp_path)
+    crashed = multiprocessing.get_context('spawn').Process(target=run, args=(workdir, CRASH_AFTER, UNREACHABLE))
+    crashed.start()
+    crashed.join(60)
+    assert crashed.exitcode == 137
+
+    with open(os.path.join(workdir, 'ledger.txt'), encoding='utf-8') as handle:
+        before_crash = sum(1 for _ in handle)
+    assert before_crash == CRASH_AFTER
+
+    results, metrics = run(workdir, 0)
+
+    companies = [result.company for result in results]
+    assert sorted(companies) == sorted(f'Company {i}' for i in range(LEADS))
+    assert [result.status for result in results] == ['Completed'] * LEADS
+    # Leads finished before the crash were replayed; the unscrapable ones were retried.
+    assert 0 < metrics['resumed'] < LEADS
+    assert {result.company for result in results if result.domain in UNREACHABLE} == {'Company 2', 'Company 5'}
+    with open(os.path.join(workdir, 'ledger.txt'), encoding='utf-8') as handle:
+        deliveries = Counter(line.strip() for line in handle)
+    assert sum(deliveries.values()) == LEADS * 2
+    assert max(deliveries.values()) == 1
+
+
+def test_scrape_failures_are_journaled_as_retryable(tmp_path):
+    workdir = str(tmp_path)
+    results, _ = run(workdir, 0, UNREACHABLE)
+    assert sorted(result.company for result in results if result.status == 'Skipped') == ['Company 2', 'Company 5']
+
+    journal = CheckpointJournal(os.path.join(workdir, 'journal.jsonl'))
+    try:
+        assert journal.stats()['finished'] == LEADS - len(UNREACHABLE)
+        assert journal.finished(make_leads()[2]) is None
+        assert journal.finished(make_leads()[3]).status == 'Completed'
+    finally:
+        journal.close()
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+import cli
+from workflow import ContentSummarizer
+
+
+@pytest.fixture
+def leads(tmp_path, monkeypatch):
+    path = tmp_path / 'leads.csv'
+    path.write_text('company,email,website\n'
+                    'Acme,info@acme.com,\n'
+                    'Broken One,,broken1.com\n'
+                    'Globex,,globex.com\n'
+                    'Broken Two,,broken2.com\n'
+                    'NoSite,someone@gmail.com,\n', encoding='utf-8')
+    generate_summary = ContentSummarizer.generate_summary
+
+    def failing_summary(self, company_name, domain, content):
+        if company_name.startswith('Broken'):
+            raise RuntimeError('summarizer crashed')
+        return generate_summary(self, company_name, domain, content)
+
+    monkeypatch.setattr(ContentSummarizer, 'generate_summary', failing_summary)
+    return str(path)
+
+
+def run(leads, tmp_path, *flags):
+    output = str(tmp_path / 'results.jsonl')
+    status = cli.main(['-i', leads, '-o', output, '--workers', '1', '--progress-every', '0', *flags])
+    with open(output, encoding='utf-8') as handle:
+        return status, [json.loads(line)['status'] for line in handle]
+
+
+def test_a_run_under_the_error_thresholds_succeeds(leads, tmp_path):
+    # Skipped leads (a free-mail address here) are not errors.
+    assert run(leads, tmp_path, '--max-error-rate', '0.5') == (cli.EXIT_OK, ['Completed', 'Error', 'Completed', 'Error', 'Skipped'])
+    assert run(leads, tmp_path, '--max-errors', '3')[0] == cli.EXIT_OK
+
+
+def test_error_thresholds_fail_the_run(leads, tmp_path):
+    assert run(leads, tmp_path, '--max-error-rate', '0.2')[0] == cli.EXIT_FAILURE_THRESHOLD
+    # --max-errors stops at the threshold instead of finishing the input.
+    assert run(leads, tmp_path, '--max-errors', '1') == (cli.EXIT_FAILURE_THRESHOLD, ['Completed', 'Error'])
+
+
+def test_usage_errors_are_told_apart_from_failed_runs(leads, tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['-i', leads])
+    assert exit_info.value.code == cli.EXIT_USAGE
+    assert 'required: --output' in capsys.readouterr().err
+
+    checkpoint = tmp_path / 'journal.jsonl'
+    checkpoint.write_text('{}\n', encoding='utf-8')
+    assert cli.main(['-i', leads, '-o', str(tmp_path / 'out.jsonl'), '--checkpoint', str(checkpoint)]) == cli.EXIT_USAGE
+    assert 'pass --resume' in capsys.readouterr().err
+
+    assert cli.main(['-i', leads, '-o', str(tmp_path / 'out.jsonl'), '--dry-run']) == cli.EXIT_OK
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from dedup import DedupIndex
+from llm_gateway import LLMGateway
+from workflow import ContentSummarizer, EmailGenerator, LeadGenerationWorkflow, WebScraper
+
+DAY = 86400
+
+
+def make_index(tmp_path, **kwargs) -> DedupIndex:
+    return DedupIndex(str(tmp_path / 'dedup.db'), **kwargs)
+
+
+def test_second_lead_for_the_same_site_is_skipped_within_a_run(tmp_path):
+    gateway = LLMGateway(None, use_cache=False, use_breakers=False)
+    workflow = LeadGenerationWorkflow(max_workers=4, dedup_index=make_index(tmp_path), batch_llm=False, pipeline=False, shards=0,
+                                      run_budget=0, lead_budget=0)
+    workflow.web_scraper = WebScraper(live=False, use_page_cache=False, use_breakers=False)
+    workflow.summarizer = ContentSummarizer(use_page_cache=False, gateway=gateway, use_summary_index=False)
+    workflow.email_generator = EmailGenerator(gateway=gateway)
+    leads = [
+        {'company_name': 'Acme', 'domain': 'acme.com'},
+        {'company_name': 'Acme Shop', 'domain': 'shop.acme.com'},
+        {'company_name': 'Globex', 'domain': 'globex.com'},
+    ]
+
+    results = list(workflow.run_stream(leads, 'partnership'))
+
+    assert [result['status'] for result in results] == ['Completed', 'Skipped', 'Completed']
+    assert 'earlier in this run' in results[1]['error']
+    # A second run skips them all as already contacted.
+    assert all(result['status'] == 'Skipped' for result in workflow.run_stream(leads, 'partnership'))
+
+
+def test_contacts_only_count_within_the_window(tmp_path):
+    index = make_index(tmp_path, window_days=30)
+    now = time.time()
+    index.bulk_record([('recent.com', 'Recent', now - 10 * DAY), ('stale.com', 'Stale', now - 40 * DAY)])
+
+    assert 'already contacted 10 days ago' in index.check('www.recent.com')
+    assert index.check('stale.com') is None
+    assert 'stale.com' not in index and 'recent.com' in index
+
+    index.record('stale.com', 'Stale')
+    assert index.check('stale.com') is not None
+    assert make_index(tmp_path, window_days=0).check('stale.com', 'Stale') is not None
+
+
+def test_bulk_load_takes_completed_results_and_persists(tmp_path):
+    results = [
+        {'company': 'Done Inc', 'domain': 'done.com', 'status': 'Completed'},
+        {'company': 'Failed', 'domain': 'failed.com', 'status': 'Error'},
+        {'company': 'No Domain', 'domain': None, 'status': 'Completed'},
+    ] + [{'company': f'Company {n}', 'domain': f'company{n}.com', 'status': 'Completed'} for n in range(25)]
+
+    assert make_index(tmp_path).bulk_load(iter(results), batch_size=10) == 26
+
+    reopened = make_index(tmp_path)
+    assert len(reopened) == 26
+    assert 'done.com' in reopened and 'failed.com' not in reopened
+
+
+def test_fuzzy_names_only_compare_within_the_first_token_block(tmp_path):
+    index = make_index(tmp_path, name_threshold=0.9)
+    index.record('acme-analytics.com', 'Acme Analytics Ltd')
+
+    assert 'acme-analytics.com' in index.check('acmeanalytics.io', 'ACME Analytic Inc.')
+    # Same words in another order land in another block and are not compared.
+    assert index.check('analytics-acme.io', 'Analytics Acme') is None
+    assert index.check('other.io', 'Acme Robotics') is None
+    assert make_index(tmp_path, fuzzy_names=False).check('acmeanalytics.io', 'Acme Analytic') is None
+
+
+def test_only_one_thread_claims_a_site_until_it_is_released(tmp_path):
+    index = make_index(tmp_path)
+    barrier = threading.Barrier(16)
+    claimed = []
+
+    def claim(n):
+        barrier.wait()
+        if index.claim('www.acme.com' if n % 2 else 'blog.acme.com', f'Acme {n}') is None:
+            claimed.append(n)
+
+    threads = [threading.Thread(target=claim, args=(n,)) for n in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(claimed) == 1
+    assert index.stats['duplicate_in_run'] == 15
+    index.release('acme.com')
+    assert index.claim('acme.com') is None
@@ -0,0 +1,39 @@
+from domains import canonical_host, is_free_mail, registrable_domain, site_key
+from workflow import DomainExtractor
+
+LEADS = [
+    {'company_name': 'Acme', 'domain': 'https://www.Acme.com/about'},
+    {'company_name': 'Brit', 'domain': '', 'email': 'jane@shop.brit.co.uk'},
+    {'company_name': 'Free', 'domain': '', 'email': 'founder@gmail.com', 'website': 'free.io'},
+    {'company_name': 'Gmail only', 'email': 'someone@yahoo.co.uk'},
+    {'company_name': 'Bare suffix', 'domain': 'co.uk', 'website': 'http://bare.example.org:8080/x'},
+    {'company_name': 'Nothing', 'domain': 'not a host', 'email': 'broken@', 'website': ''},
+    {'company_name': 'Pages', 'website': 'https://acme.github.io/site'},
+    {'company_name': 'Missing'},
+]
+
+
+def test_bulk_resolution_matches_row_by_row_extraction():
+    assert DomainExtractor.extract_domains(LEADS) == [DomainExtractor.extract_domain(lead) for lead in LEADS]
+
+
+def test_bulk_resolution_skips_free_mail_and_invalid_hosts():
+    domains = [domain for domain, _ in DomainExtractor.extract_domains(LEADS)]
+
+    assert domains == ['acme.com', 'shop.brit.co.uk', 'free.io', None, 'bare.example.org:8080', None, 'acme.github.io', None]
+
+
+def test_registrable_domain_follows_the_public_suffix_list():
+    assert registrable_domain('shop.example.co.uk') == 'example.co.uk'
+    assert registrable_domain('a.b.example.com.au') == 'example.com.au'
+    assert registrable_domain('acme.github.io') == 'acme.github.io'
+    assert registrable_domain('co.uk') is None
+    assert canonical_host('github.io') is None
+    assert site_key('www.shop.example.co.uk') == site_key('example.co.uk')
+
+
+def test_free_mail_covers_subdomains_of_free_providers():
+    assert is_free_mail('gmail.com')
+    assert is_free_mail('mail.yahoo.co.uk')
+    assert not is_free_mail('example.co.uk')
+    assert not is_free_mail(None)
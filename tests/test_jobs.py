@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+
+import pytest
+
+import app as app_module
+import results_store
+from jobs import JobManager
+from results_store import ResultStore
+from shared import Shared
+
+
+class StubWorkflow:
+    """Streams ``lead_count`` fake leads through the job callbacks, optionally pausing after the first."""
+
+    def __init__(self, gate: threading.Event = None, fail: bool = False):
+        self.gate = gate
+        self.fail = fail
+
+    def run_full_workflow(self, lead_count, industry_filter, email_type, progress_callback=None, email_delta_callback=None):
+        results = []
+        for n in range(lead_count):
+            result = {'company': f'Company {n}', 'status': 'Completed', 'summary': f'Summary {n}',
+                      'email_content': f'Dear Company {n} team', 'processing_steps': ['Domain extracted']}
+            email_delta_callback(result, 'Dear ')
+            email_delta_callback(result, f'Company {n} team')
+            progress_callback(result, lead_count)
+            results.append(result)
+            if self.gate is not None:
+                self.gate.wait(5)
+        if self.fail:
+            raise RuntimeError('LLM provider down')
+        return {'metrics': {'total_processed': lead_count}, 'filters': {'industry_filter': industry_filter},
+                'processed_results': results}
+
+
+def wait_until_finished(job, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.finished
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / 'results.db'))
+    monkeypatch.setattr(results_store, '_shared_store', Shared(lambda: store))
+    return store
+
+
+def use_manager(monkeypatch, manager: JobManager):
+    monkeypatch.setattr(app_module, '_job_manager', Shared(lambda: manager))
+
+
+def test_completed_job_keeps_only_start_and_completion_events(store):
+    manager = JobManager(StubWorkflow, store)
+    job = manager.submit(3, 'all', 'partnership')
+    wait_until_finished(job)
+
+    assert job.status == 'completed'
+    assert [event['type'] for event in job.events] == ['started', 'completed']
+    assert job.events[-1]['seq'] == job.next_seq - 1 == 10
+    assert job.to_dict(5)['events'] == job.events[-1:]
+    # Late subscribers find the leads in the ResultStore instead.
+    run = store.get_run(job.events[-1]['run_id'])
+    assert run['total'] == 3
+    assert [row['email_content'] for row in store.get_results(run['run_id'])] == [f'Dear Company {n} team' for n in range(3)]
+
+
+def test_failed_job_keeps_lead_events_but_drops_drafts(store):
+    manager = JobManager(lambda: StubWorkflow(fail=True), store)
+    job = manager.submit(2, 'all', 'partnership')
+    wait_until_finished(job)
+
+    assert job.status == 'failed' and job.error == 'LLM provider down'
+    assert [event['type'] for event in job.events] == ['started', 'lead', 'lead', 'failed']
+    assert job.events[1]['summary'] == 'Summary 0'
+    assert job.to_dict()['run_id'] is None
+
+
+def test_oldest_finished_jobs_are_evicted(store):
+    manager = JobManager(StubWorkflow, store, max_jobs=2)
+    jobs = [manager.submit(1, 'all', 'partnership') for _ in range(2)]
+    for job in jobs:
+        wait_until_finished(job)
+    latest = manager.submit(1, 'all', 'partnership')
+
+    assert manager.get(jobs[0].id) is None
+    assert manager.get(jobs[1].id) is jobs[1] and manager.get(latest.id) is latest
+
+
+def test_submit_returns_202_and_status_url_reports_progress(store, monkeypatch):
+    use_manager(monkeypatch, JobManager(StubWorkflow, store))
+    client = app_module.app.test_client()
+
+    response = client.post('/run_workflow', data={'lead_count': '2', 'industry_filter': 'all', 'email_type': 'partnership'})
+    assert response.status_code == 202
+    body = response.get_json()
+
+    deadline = time.monotonic() + 5
+    while (status := client.get(body['status_url']).get_json())['status'] != 'completed' and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert (status['completed'], status['total'], status['run_id']) == (2, 2, body['job_id'])
+    assert client.get(body['results_url']).headers['Location'].endswith('/results')
+    assert client.get('/api/jobs/unknown').status_code == 404
+
+
+def parse_sse(chunk: bytes):
+    fields = dict(line.split(': ', 1) for line in chunk.decode().strip().splitlines() if not line.startswith(':'))
+    return int(fields['id']), json.loads(fields['data'])
+
+
+def test_event_stream_delivers_live_events_and_resumes_after_compaction(store, monkeypatch):
+    gate = threading.Event()
+    manager = JobManager(lambda: StubWorkflow(gate), store)
+    use_manager(monkeypatch, manager)
+    job = manager.submit(2, 'all', 'partnership')
+    client = app_module.app.test_client()
+
+    response = client.get(f'/api/jobs/{job.id}/events')
+    assert response.mimetype == 'text/event-stream'
+    events = []
+    chunks = iter(response.response)
+    for chunk in chunks:
+        if chunk.startswith(b':'):
+            continue
+        events.append(parse_sse(chunk))
+        if events[-1][1]['type'] == 'lead':
+            # Paused after the first lead: its summary and email arrive while the job runs.
+            assert events[-1][1]['summary'] == 'Summary 0'
+            gate.set()
+            wait_until_finished(job)
+    response.close()
+
+    # The second lead's events were compacted away before this subscriber read them; it skips to the
+    # completion event, whose run_id points at the stored results.
+    assert [event['type'] for _, event in events] == ['started', 'email_delta', 'email_delta', 'lead', 'completed']
+    assert [seq for seq, _ in events] == [0, 1, 2, 3, 7]
+    assert events[-1][1]['run_id'] == job.id
+    assert len(store.get_results(job.id)) == 2
+
+    resumed = client.get(f'/api/jobs/{job.id}/events', headers={'Last-Event-ID': '2'})
+    assert [parse_sse(chunk)[1]['type'] for chunk in resumed.response] == ['completed']
@@ -0,0 +1,73 @@
+import itertools
+import json
+
+from lead_io import ResultWriter, batched, iter_leads, lead_key, read_results, result_key
+from records import Lead, LeadResult, Step
+
+
+def make_result(n: int) -> LeadResult:
+    result = LeadResult.for_lead(Lead(f'Company {n}', email=f'info@company{n}.com'), 'partnership')
+    result.status = 'Completed'
+    result.domain = f'company{n}.com'
+    result.add_step(Step.DOMAIN)
+    result.add_step(Step.SCRAPED)
+    return result
+
+
+def test_csv_headers_are_mapped_onto_lead_fields(tmp_path):
+    path = tmp_path / 'leads.csv'
+    path.write_text('\ufeffCompany Name,URL,Sector,Employee Count,Notes\r\n'
+                    'Acme, https://acme.com ,Retail,50,call back\r\n'
+                    ',,,,\r\n'
+                    'Globex,globex.com,Energy,,\r\n', encoding='utf-8')
+
+    leads = list(iter_leads(str(path)))
+
+    assert [dict(lead) for lead in leads] == [
+        {'company_name': 'Acme', 'website': 'https://acme.com', 'industry': 'Retail', 'employees': '50'},
+        {'company_name': 'Globex', 'website': 'globex.com', 'industry': 'Energy', 'employees': ''},
+    ]
+
+
+def test_jsonl_leads_stream_past_bad_lines(tmp_path, capsys):
+    path = tmp_path / 'leads.jsonl'
+    lines = [json.dumps({'company': f'Company {n}', 'email': f'info@company{n}.com'}) for n in range(1000)]
+    lines[1:1] = ['', '{not json', '["not", "a", "lead"]']
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    leads = iter_leads(str(path))
+    # Leads are yielded as they are read rather than loaded up front.
+    assert [lead['company_name'] for lead in itertools.islice(leads, 2)] == ['Company 0', 'Company 1']
+    assert 'Skipping invalid JSON on line 3' in capsys.readouterr().err
+    assert sum(1 for _ in leads) == 998
+
+
+def test_results_round_trip_through_both_formats(tmp_path):
+    for name in ('results.csv', 'results.jsonl'):
+        path = str(tmp_path / name)
+        with ResultWriter(path) as writer:
+            writer.write(make_result(0))
+        # Appending continues the file without a second CSV header.
+        with ResultWriter(path, append=True) as writer:
+            writer.write(make_result(1))
+
+        rows = list(read_results(path))
+        assert [row['company'] for row in rows] == ['Company 0', 'Company 1']
+        assert rows[1]['processing_steps'] == ['✅ Domain extraction: company1.com', '✅ Web scraping: Success']
+        assert result_key(rows[0]) == lead_key(Lead('Company 0', email='info@company0.com'))
+
+
+def test_writer_flushes_every_batch_of_rows(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    writer = ResultWriter(str(path), flush_every=2)
+    writer.write(make_result(0))
+    writer.write(make_result(1))
+    writer.write(make_result(2))
+
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 2
+    writer.close()
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 3
+
+
+def test_batched_keeps_the_remainder():
+    assert list(batched(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from bench_lead_source import make_leads
+from lead_source import LeadIndex, employee_band, revenue_band
+
+LEADS = make_leads(20000)
+
+
+@pytest.fixture(scope='module')
+def index():
+    return LeadIndex(LEADS)
+
+
+def expected(industry=None, location=None, employees=None, revenue=None):
+    return [
+        lead['company_name'] for lead in LEADS
+        if (industry is None or lead['industry'].casefold() in {value.casefold() for value in industry})
+        and (location is None or lead['location'] == location)
+        and (employees is None or employee_band(lead['employees']) == employees)
+        and (revenue is None or revenue_band(lead['revenue']) == revenue)
+    ]
+
+
+def names(leads):
+    return [lead.company_name for lead in leads]
+
+
+def test_filters_intersect_posting_lists(index):
+    leads = list(index.iter_leads(industry=['healthcare', 'Niche Industry 3'], employees='201-1000', revenue='1-10M'))
+
+    assert names(leads) == expected(['Healthcare', 'Niche Industry 3'], employees='201-1000', revenue='$1M-$10M')
+    assert leads
+    assert names(index.query(location='City 7,In', industry='Retail', limit=10000).leads) == expected(['Retail'], location='City 7,In')
+    assert index.query(industry='Mining').leads == []
+
+
+def test_cursor_pages_are_stable_while_leads_are_appended():
+    index = LeadIndex(LEADS[:1000])
+    seen = []
+    cursor = None
+    while True:
+        page = index.query(industry='Technology', limit=37, cursor=cursor)
+        seen.extend(names(page.leads))
+        # Appending between pages never shifts or repeats what was already served.
+        index.extend([{'company_name': f'Late {len(index)}', 'industry': 'Technology'}])
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    technology = [lead['company_name'] for lead in LEADS[:1000] if lead['industry'] == 'Technology']
+    assert seen[:len(technology)] == technology
+    assert len(seen) == len(set(seen))
+    assert all(name.startswith('Late ') for name in seen[len(technology):])
+
+
+def test_industries_are_derived_from_the_leads():
+    index = LeadIndex([{'company_name': 'A', 'industry': 'retail'}, {'company_name': 'B', 'industry': 'Agritech'},
+                       {'company_name': 'C', 'industry': 'Retail '}, {'company_name': 'D'}])
+
+    assert index.industries() == ['Agritech', 'retail']
+    index.extend([{'company_name': 'E', 'industry': 'Biotech'}])
+    assert index.industries() == ['Agritech', 'Biotech', 'retail']
+    assert index.facets('industry') == {'retail': 2, 'Agritech': 1, 'Biotech': 1}
+
+
+def test_ranges_off_band_boundaries_are_rejected(index):
+    with pytest.raises(ValueError, match='201-1000, 1001-5000'):
+        index.query(employees='500-1000')
+    with pytest.raises(ValueError, match=r'\$100M-\$500M'):
+        index.query(revenue='$500M-$1B')
+    assert names(index.query(employees='201 - 1,000', limit=5).leads) == names(index.query(employees='750', limit=5).leads)
+
+
+def test_filtered_queries_take_milliseconds(index):
+    started = time.perf_counter()
+    for n in range(100):
+        page = index.query(industry=f'Niche Industry {n % 40}', location=f'City {n % 200},In', limit=50)
+        assert len(page.leads) <= 50
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert elapsed_ms / 100 < 5
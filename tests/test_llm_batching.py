@@ -0,0 +1,91 @@
+import json
+
+from fake_groq import FakeGroqClient
+from lead_source import LeadIndex
+from llm_batching import plan_batches, run_batched
+from llm_cache import LLMCache
+from llm_gateway import LLMGateway
+from workflow import ApifyClient, ContentSummarizer, EmailGenerator, LeadGenerationWorkflow, WebScraper
+
+LEADS = 12
+
+
+def make_workflow(client: FakeGroqClient, cache: LLMCache = None) -> LeadGenerationWorkflow:
+    gateway = LLMGateway(client, rpm=0, tpm=0, cache=cache, use_cache=cache is not None, use_breakers=False)
+    workflow = LeadGenerationWorkflow(max_workers=4, batch_llm=True, pipeline=False, shards=0, run_budget=0, lead_budget=0)
+    workflow.apify_client = ApifyClient(LeadIndex([
+        {'company_name': f'Company {i}', 'domain': f'company{i}.com', 'industry': 'Technology'} for i in range(LEADS)
+    ]))
+    workflow.web_scraper = WebScraper(live=False, use_page_cache=False)
+    workflow.summarizer = ContentSummarizer(use_page_cache=False, gateway=gateway, use_summary_index=False)
+    workflow.email_generator = EmailGenerator(gateway=gateway)
+    return workflow
+
+
+def batch_sizes(client: FakeGroqClient, field: str):
+    sizes = []
+    for request in client.requests:
+        prompt = request['messages'][-1]['content']
+        if 'Inputs:\n' in prompt and f'"{field}"' in prompt:
+            sizes.append(len(json.loads(prompt.split('Inputs:\n', 1)[1])))
+    return sizes
+
+
+def test_plan_batches_respects_token_budget_and_item_cap():
+    items = [{'cost': cost} for cost in (400, 400, 400, 900, 100, 100, 100, 100)]
+    assert plan_batches(items, lambda item: item['cost'], token_budget=1000, max_items=3) == [[0, 1], [2], [3, 4], [5, 6, 7]]
+
+
+def test_leads_share_batched_requests():
+    client = FakeGroqClient()
+    results = make_workflow(client).run_full_workflow(LEADS, 'all', 'partnership')
+
+    assert results['metrics']['completed'] == LEADS
+    assert [result.summary for result in results['processed_results']] == [f'Fake summary for Company {i}' for i in range(LEADS)]
+    assert [result.email_content for result in results['processed_results']] == [f'Fake email for Company {i}' for i in range(LEADS)]
+    # Default cap of 10 items per batch: 10 + 2 for each of summaries and emails, nothing one by one.
+    assert batch_sizes(client, 'summary') == [10, 2]
+    assert batch_sizes(client, 'email') == [10, 2]
+    assert client.request_count == 4
+
+
+def test_repeated_run_is_served_from_cache(tmp_path):
+    cache = LLMCache(str(tmp_path / 'llm_cache.db'))
+    client = FakeGroqClient()
+    first = make_workflow(client, cache).run_full_workflow(LEADS, 'all', 'partnership')
+    requests = client.request_count
+
+    workflow = make_workflow(client, cache)
+    second = workflow.run_full_workflow(LEADS, 'all', 'partnership')
+
+    assert client.request_count == requests
+    assert workflow.summarizer.gateway.stats()['cache_hits'] == requests
+    assert [dict(result)['email_content'] for result in second['processed_results']] == \
+        [dict(result)['email_content'] for result in first['processed_results']]
+
+
+def test_unparseable_batches_fall_back_to_per_lead_calls():
+    client = FakeGroqClient(malformed_batches=True)
+    results = make_workflow(client).run_full_workflow(LEADS, 'all', 'partnership')
+
+    assert results['metrics']['completed'] == LEADS
+    assert all(result.summary and result.email_content for result in results['processed_results'])
+    # Two failed batches for each stage, then one call per lead.
+    assert client.request_count == 2 * (2 + LEADS)
+    assert results['processed_results'][0].summary.startswith('Fake completion for: ')
+
+
+def test_only_items_missing_from_a_partial_answer_fall_back():
+    items = [{'id': str(i), 'text': 'x' * 40} for i in range(5)]
+    fallbacks = []
+
+    def request_batch(batch):
+        return {item['id']: f"batched {item['id']}" for item in batch if item['id'] != '3'}
+
+    def fallback(item):
+        fallbacks.append(item['id'])
+        return f"single {item['id']}"
+
+    results = run_batched(items, lambda item: 10, request_batch, fallback)
+    assert results == ['batched 0', 'batched 1', 'batched 2', 'single 3', 'batched 4']
+    assert fallbacks == ['3']
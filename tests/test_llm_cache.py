@@ -0,0 +1,78 @@
+import time
+
+import llm_cache
+from fake_groq import FakeGroqClient
+from lead_generator import LeadGenerator
+from llm_cache import LLMCache, get_cache_stats
+from llm_gateway import LLMGateway
+from shared import Shared
+
+MESSAGES = [{'role': 'user', 'content': 'Summarize Acme'}]
+
+
+def test_key_covers_model_messages_and_params():
+    key = LLMCache.make_key('model-a', MESSAGES, max_tokens=100, temperature=0.3)
+
+    assert key == LLMCache.make_key('model-a', [dict(MESSAGES[0])], temperature=0.3, max_tokens=100)
+    assert key != LLMCache.make_key('model-b', MESSAGES, max_tokens=100, temperature=0.3)
+    assert key != LLMCache.make_key('model-a', [{'role': 'user', 'content': 'Summarize Acme.'}], max_tokens=100, temperature=0.3)
+    assert key != LLMCache.make_key('model-a', MESSAGES, max_tokens=150, temperature=0.3)
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = LLMCache(str(tmp_path / 'llm_cache.db'), ttl_seconds=0.05)
+    cache.set('key', 'value')
+
+    assert cache.get('key') == 'value'
+    time.sleep(0.1)
+    assert cache.get('key') is None
+    assert cache.stats()['expired'] == 1
+    assert cache.stats()['bytes'] == 0
+
+
+def test_least_recently_used_entries_are_evicted_over_the_size_budget(tmp_path):
+    # Every entry is 10 + 90 = 100 bytes; the sixth goes over 550 and the
+    # cache is trimmed to 90% of it, dropping the two least recently used.
+    cache = LLMCache(str(tmp_path / 'llm_cache.db'), max_bytes=550, ttl_seconds=0)
+    for n in range(5):
+        cache.set(f'key-{n:06d}', 'x' * 90)
+        time.sleep(0.002)
+    cache.get('key-000000')
+    time.sleep(0.002)
+    cache.set('key-000005', 'x' * 90)
+
+    kept = [n for n in range(6) if cache.get(f'key-{n:06d}') is not None]
+    assert kept == [0, 3, 4, 5]
+    assert cache.stats()['evictions'] == 2
+    assert cache.stats()['bytes'] == 400
+
+
+def test_hits_and_misses_surface_in_analytics(tmp_path, monkeypatch):
+    cache = LLMCache(str(tmp_path / 'llm_cache.db'))
+    monkeypatch.setattr(llm_cache, '_shared_cache', Shared(lambda: cache))
+    client = FakeGroqClient()
+    gateway = LLMGateway(client, rpm=0, tpm=0, cache=cache, use_breakers=False)
+
+    first = gateway.complete(MESSAGES, model='model-a', max_tokens=100)
+    second = gateway.complete(MESSAGES, model='model-a', max_tokens=100)
+
+    assert first == second
+    assert client.request_count == 1
+    assert gateway.stats()['cache_hits'] == 1
+    stats = get_cache_stats()
+    assert stats['enabled'] is True
+    assert (stats['hits'], stats['misses'], stats['writes']) == (1, 1, 1)
+    assert stats['hit_rate'] == 50.0
+
+
+def test_standalone_generator_summaries_go_through_the_cache(tmp_path):
+    client = FakeGroqClient()
+    gateway = LLMGateway(client, rpm=0, tpm=0, cache=LLMCache(str(tmp_path / 'llm_cache.db')), use_breakers=False)
+    generator = LeadGenerator(workflow=object(), gateway=gateway)
+
+    summaries = [generator.generate_summary('Acme', 'acme.com', 'Technology') for _ in range(3)]
+
+    assert len(set(summaries)) == 1
+    assert client.request_count == 1
+    assert LeadGenerator(workflow=object(), gateway=LLMGateway(None, use_cache=False)).generate_summary(
+        'Acme', 'acme.com', 'Technology') == 'Acme is a Technology company operating at acme.com.'
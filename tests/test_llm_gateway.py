@@ -0,0 +1,251 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from groq import Groq
+
+from fake_groq import FakeGroqClient
+from llm_gateway import AdaptiveConcurrency, LLMGateway, TokenBucket
+from local_http import FakeLLMHandler, start_llm_server, stop_servers
+from resilience import BreakerRegistry
+from workflow import ContentSummarizer
+
+MESSAGES = [{'role': 'user', 'content': 'Write something'}]
+
+
+class APIStatusError(Exception):
+    def __init__(self, status_code: int, headers=None):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class ScriptedClient(FakeGroqClient):
+    """Raises the scripted errors on the first calls, then answers like the fake client."""
+
+    def __init__(self, errors=(), break_stream_after: int = 0):
+        super().__init__()
+        self.errors = list(errors)
+        self.break_stream_after = break_stream_after
+        self.called_at = []
+
+    def create(self, messages, model, stream: bool = False, **params):
+        self.called_at.append(time.monotonic())
+        response = super().create(messages, model, stream=stream, **params)
+        if self.errors:
+            raise self.errors.pop(0)
+        if stream and self.break_stream_after:
+            return self._broken(response)
+        return response
+
+    def _broken(self, chunks):
+        for number, chunk in enumerate(chunks):
+            if number == self.break_stream_after:
+                raise APIStatusError(503)
+            yield chunk
+
+
+def make_gateway(client, **kwargs) -> LLMGateway:
+    options = {'rpm': 0, 'tpm': 0, 'max_retries': 3, 'backoff': 0.01, 'use_cache': False, 'use_breakers': False}
+    options.update(kwargs)
+    return LLMGateway(client, **options)
+
+
+def test_429_waits_for_retry_after_then_succeeds():
+    client = ScriptedClient([APIStatusError(429, {'retry-after': '0.3'})])
+    gateway = make_gateway(client)
+
+    assert gateway.complete(MESSAGES, 'model').startswith('Fake completion')
+    assert client.called_at[1] - client.called_at[0] >= 0.3
+    stats = gateway.stats()
+    assert (stats['requests'], stats['retries'], stats['throttled'], stats['failures']) == (2, 1, 1, 0)
+
+
+def test_429_drains_shared_request_budget_for_every_caller():
+    client = ScriptedClient([APIStatusError(429, {'retry-after-ms': '400'})])
+    gateway = make_gateway(client, rpm=6000)
+
+    first = threading.Thread(target=gateway.complete, args=(MESSAGES, 'model'))
+    first.start()
+    time.sleep(0.1)
+    # A second caller that was never throttled itself still waits out the back-off.
+    gateway.complete([{'role': 'user', 'content': 'Something else'}], 'model')
+    first.join()
+    assert len(client.called_at) == 3
+    assert min(client.called_at[1:]) - client.called_at[0] >= 0.38
+
+
+def test_non_retryable_status_fails_at_once():
+    client = ScriptedClient([APIStatusError(400)])
+    gateway = make_gateway(client)
+
+    with pytest.raises(APIStatusError):
+        gateway.complete(MESSAGES, 'model')
+    assert gateway.stats()['requests'] == 1
+
+
+def test_token_bucket_allows_a_burst_then_throttles_to_rate():
+    bucket = TokenBucket(6000)
+    assert bucket.acquire(6000) == 0.0
+
+    started = time.monotonic()
+    waited = sum(bucket.acquire() for _ in range(20))
+    elapsed = time.monotonic() - started
+    # 100 units a second: 20 more take about 0.2s.
+    assert 0.15 <= elapsed < 0.5
+    assert waited == pytest.approx(elapsed, abs=0.05)
+
+
+def test_gateway_token_budget_spaces_out_requests():
+    client = ScriptedClient()
+    gateway = make_gateway(client, tpm=12000)
+    prompt = [{'role': 'user', 'content': 'x' * 396}]  # 100 estimated tokens per call
+
+    for _ in range(122):
+        gateway.complete(prompt, 'model')
+    # A minute's 12000 tokens go at once; the next 200 refill at 200 tokens a second.
+    assert client.called_at[119] - client.called_at[0] < 0.5
+    assert client.called_at[-1] - client.called_at[119] >= 0.95
+    assert gateway.stats()['rate_wait_seconds'] >= 0.95
+
+
+def test_adaptive_concurrency_halves_on_throttling_and_grows_additively():
+    limiter = AdaptiveConcurrency(maximum=8, minimum=1)
+    for expected in (4, 2, 1, 1):
+        limiter.acquire()
+        limiter.release(throttled=True)
+        assert limiter.limit == expected
+
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release()
+    # 1 -> 2 -> 2.5 -> 2.9: one slot more per window of successes.
+    assert limiter.limit == pytest.approx(2.9)
+
+
+def test_adaptive_concurrency_blocks_beyond_the_limit():
+    limiter = AdaptiveConcurrency(maximum=2, minimum=1)
+    limiter.acquire()
+    limiter.acquire()
+    entered = threading.Event()
+
+    def third():
+        limiter.acquire()
+        entered.set()
+        limiter.release()
+
+    thread = threading.Thread(target=third)
+    thread.start()
+    assert not entered.wait(0.2)
+    limiter.release()
+    assert entered.wait(1)
+    thread.join()
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+def test_stream_is_not_retried_once_a_delta_was_emitted():
+    client = ScriptedClient(break_stream_after=3)
+    gateway = make_gateway(client)
+    deltas = []
+
+    with pytest.raises(APIStatusError):
+        gateway.complete(MESSAGES, 'model', on_delta=deltas.append)
+    assert len(deltas) == 3
+    assert gateway.stats()['requests'] == 1
+
+
+def test_stream_failing_before_any_delta_is_retried():
+    client = ScriptedClient([APIStatusError(503)])
+    gateway = make_gateway(client)
+    deltas = []
+
+    content = gateway.complete(MESSAGES, 'model', on_delta=deltas.append)
+    assert content == ''.join(deltas)
+    assert gateway.stats()['requests'] == 2
+
+
+@pytest.fixture
+def llm_client(monkeypatch):
+    """A real Groq client talking to the local fake provider, with the SDK's own retries off."""
+    for name, value in (('latency', 0.0), ('requests_per_second', 1000), ('max_concurrent', 64), ('retry_after', '0.3')):
+        monkeypatch.setattr(FakeLLMHandler, name, value)
+    server = start_llm_server()
+    yield Groq(api_key='local-test-key', base_url=f"http://127.0.0.1:{server.server_address[1]}", max_retries=0, timeout=5)
+    stop_servers([server])
+
+
+def test_http_429_is_retried_after_retry_after_and_halves_concurrency(llm_client, monkeypatch):
+    monkeypatch.setattr(FakeLLMHandler, 'requests_per_second', 2)
+    gateway = make_gateway(llm_client, rpm=6000, max_concurrency=8, max_retries=5)
+    gateway.complete(MESSAGES, 'model')
+    gateway.complete(MESSAGES, 'model')
+
+    started = time.monotonic()
+    assert gateway.complete(MESSAGES, 'model') == 'Fake completion for: Write something'
+    elapsed = time.monotonic() - started
+
+    stats = gateway.stats()
+    throttled = FakeLLMHandler.throttled
+    assert throttled >= 1
+    assert (stats['throttled'], stats['retries'], stats['failures'], stats['requests']) == (throttled, throttled, 0, 3 + throttled)
+    # Each 429 drains the request bucket for the provider's 0.3s Retry-After.
+    assert elapsed >= 0.3 * throttled
+    # AIMD: halved per 429, then one success adds 1/limit.
+    halved = 8 / 2 ** throttled
+    assert stats['concurrency_limit'] == pytest.approx(round(halved + 1 / halved, 2))
+
+    monkeypatch.setattr(FakeLLMHandler, 'requests_per_second', 1000)
+    for _ in range(5):
+        gateway.complete(MESSAGES, 'model')
+    assert gateway.stats()['concurrency_limit'] > stats['concurrency_limit'] + 1
+
+
+def test_http_429_holds_back_callers_that_were_not_throttled(llm_client, monkeypatch):
+    monkeypatch.setattr(FakeLLMHandler, 'requests_per_second', 1)
+    gateway = make_gateway(llm_client, rpm=6000)
+    gateway.complete(MESSAGES, 'model')
+
+    throttled = threading.Thread(target=gateway.complete, args=(MESSAGES, 'model'))
+    throttled.start()
+    while gateway.stats()['throttled'] == 0:
+        time.sleep(0.005)
+    # The provider has capacity again, so any wait is the drained bucket's.
+    monkeypatch.setattr(FakeLLMHandler, 'requests_per_second', 1000)
+    started = time.monotonic()
+    gateway.complete([{'role': 'user', 'content': 'Something else'}], 'model')
+    waited = time.monotonic() - started
+    throttled.join()
+
+    assert waited >= 0.25
+    stats = gateway.stats()
+    assert (stats['requests'], stats['throttled'], stats['failures']) == (4, 1, 0)
+
+
+def test_http_server_errors_are_retried_without_cutting_concurrency(llm_client):
+    FakeLLMHandler.fail_next = 1
+    gateway = make_gateway(llm_client)
+
+    assert gateway.complete(MESSAGES, 'model') == 'Fake completion for: Write something'
+    stats = gateway.stats()
+    assert (stats['requests'], stats['retries'], stats['throttled'], stats['concurrency_limit']) == (2, 1, 0, 8)
+    assert FakeLLMHandler.failed == 1
+
+
+def test_provider_outage_falls_back_to_templates_then_opens_the_circuit(llm_client):
+    FakeLLMHandler.fail_next = 100
+    breakers = BreakerRegistry('provider', min_calls=1)
+    gateway = make_gateway(llm_client, max_retries=1, breakers=breakers, use_breakers=True)
+    summarizer = ContentSummarizer(gateway=gateway, use_page_cache=False, use_summary_index=False)
+    fallback = summarizer.templates.prompt('summary_error_fallback')
+
+    for company, domain in (('Acme', 'acme.com'), ('Globex', 'globex.com')):
+        summary = summarizer.generate_summary(company, domain, f"{company} sells things.")
+        assert summary == fallback.render(company_name=company, domain=domain)
+
+    stats = gateway.stats()
+    # The first call spends its retry against the server; the second fails fast on the open circuit.
+    assert (stats['requests'], stats['retries'], stats['failures'], stats['circuit_open'], stats['fallbacks']) == (2, 1, 1, 1, 2)
+    assert FakeLLMHandler.failed == 2
+    assert breakers.is_open(gateway.provider)
@@ -0,0 +1,113 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from page_cache import PageCache
+from scraping import FetchEngine
+from workflow import WebScraper
+
+LAST_MODIFIED = 'Thu, 15 Jan 2026 10:00:00 GMT'
+
+
+class ValidatingHandler(BaseHTTPRequestHandler):
+    """Serves one page that answers 304 to a matching ETag or If-Modified-Since."""
+
+    protocol_version = 'HTTP/1.1'
+    version = 1
+    send_etag = True
+    requests = []
+
+    def do_GET(self):
+        cls = ValidatingHandler
+        cls.requests.append({name: self.headers.get(name) for name in ('If-None-Match', 'If-Modified-Since')})
+        etag = f'"v{cls.version}"'
+        unchanged = (self.headers.get('If-None-Match') == etag if cls.send_etag
+                     else self.headers.get('If-Modified-Since') == LAST_MODIFIED and cls.version == 1)
+        validators = [('ETag', etag)] if cls.send_etag else []
+        validators.append(('Last-Modified', LAST_MODIFIED))
+        if unchanged:
+            self.send_response(304)
+            for name, value in validators:
+                self.send_header(name, value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        data = f"<html><body><p>Version {cls.version} of our services page.</p></body></html>".encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in validators:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    ValidatingHandler.version, ValidatingHandler.send_etag, ValidatingHandler.requests = 1, True, []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ValidatingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_scraper(tmp_path, fresh_seconds: float) -> WebScraper:
+    cache = PageCache(str(tmp_path / 'pages.db'), fresh_seconds=fresh_seconds)
+    engine = FetchEngine(schemes=('http',), max_retries=0, domain_rps=0)
+    return WebScraper(live=True, engine=engine, page_cache=cache, use_breakers=False)
+
+
+def test_fresh_pages_are_served_without_a_request(tmp_path, site):
+    scraper = make_scraper(tmp_path, fresh_seconds=3600)
+
+    first = scraper.scrape_website_content(site)
+    assert 'Version 1' in first
+    assert scraper.scrape_website_content(site) == first
+
+    assert len(ValidatingHandler.requests) == 1
+    assert (scraper.page_cache.stats['misses'], scraper.page_cache.stats['fresh_hits']) == (1, 1)
+
+
+def test_stale_pages_revalidate_by_etag_and_keep_their_summary_on_304(tmp_path, site):
+    scraper = make_scraper(tmp_path, fresh_seconds=0)
+    cache = scraper.page_cache
+    text = scraper.scrape_website_content(site)
+    cache.store_summary(site, 'hash', 'Cached summary')
+    stored_at = cache.get(site)['fetched_at']
+
+    assert scraper.scrape_website_content(site) == text
+    assert ValidatingHandler.requests[-1] == {'If-None-Match': '"v1"', 'If-Modified-Since': LAST_MODIFIED}
+    assert cache.stats['revalidated'] == 1
+    assert cache.get(site)['fetched_at'] > stored_at
+    assert cache.get_summary(site, 'hash') == 'Cached summary'
+
+    # A changed page comes back whole, replaces the cached text and drops the stale summary.
+    ValidatingHandler.version = 2
+    assert 'Version 2' in scraper.scrape_website_content(site)
+    assert cache.get(site)['etag'] == '"v2"'
+    assert cache.get_summary(site, 'hash') is None
+    assert (cache.stats['misses'], cache.stats['revalidated']) == (2, 1)
+
+
+def test_pages_without_an_etag_revalidate_by_last_modified(tmp_path, site):
+    ValidatingHandler.send_etag = False
+    scraper = make_scraper(tmp_path, fresh_seconds=0)
+    text = scraper.scrape_website_content(site)
+
+    assert scraper.scrape_website_content(site) == text
+    assert ValidatingHandler.requests[-1] == {'If-None-Match': None, 'If-Modified-Since': LAST_MODIFIED}
+    assert scraper.page_cache.stats['revalidated'] == 1
+
+
+def test_summaries_only_annotate_fetched_pages(tmp_path):
+    cache = PageCache(str(tmp_path / 'pages.db'))
+    cache.store_summary('mock.example', 'hash', 'Summary of demo text')
+
+    assert cache.get('mock.example') is None
+    assert cache.get_summary('mock.example', 'hash') is None
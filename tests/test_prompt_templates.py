@@ -0,0 +1,47 @@
+import pytest
+
+from prompt_templates import CompiledTemplate, TemplateError, TemplateRegistry
+
+
+def test_missing_fields_render_empty():
+    template = CompiledTemplate('t', "{company_name} at {domain} ({industry})")
+
+    assert template.render(company_name='Acme') == 'Acme at  ()'
+    assert template.fields == {'company_name', 'domain', 'industry'}
+
+
+def test_doubled_braces_come_out_literal():
+    template = CompiledTemplate('t', "{{company_name}} is {company_name!r}, {{ {industry:>5} }}")
+
+    assert template.render(company_name='Acme', industry='IT') == "{company_name} is 'Acme', {    IT }"
+
+
+def test_unknown_fields_and_malformed_templates_are_rejected_at_load():
+    with pytest.raises(TemplateError, match='unknown field'):
+        CompiledTemplate('t', "Hello {first_name}")
+    with pytest.raises(TemplateError, match='malformed'):
+        CompiledTemplate('t', "Hello {company_name")
+    with pytest.raises(TemplateError, match='does not render'):
+        CompiledTemplate('t', "{company_name:d}")
+    with pytest.raises(TypeError):
+        CompiledTemplate('t', "{company_name}").render(first_name='Ada')
+
+
+def test_service_intro_fallback_uses_derived_fields():
+    registry = TemplateRegistry()
+
+    email = registry.render_fallback_email('service_intro', 'Acme Analytics Ltd', 'they build dashboards.', industry='SaaS')
+
+    assert email.startswith('Hi Acme Analytics Ltd Team,')
+    assert 'services we offer to SaaS businesses' in email
+    assert 'From what I\'ve seen, they build dashboards.' in email
+    assert 'We help teams like Acme grow' in email
+
+
+def test_unknown_email_type_falls_back_to_partnership():
+    registry = TemplateRegistry()
+
+    email = registry.render_fallback_email('cold_call', 'Acme', 'Cloud Software')
+
+    assert email == registry.render_fallback_email('partnership', 'Acme', 'Cloud Software')
+    assert 'your work in cloud software' in email
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from records import DERIVED_RESULT_FIELDS, LEAD_FIELDS, RESULT_FIELDS, Lead, LeadResult, Step
+
+
+def make_result() -> LeadResult:
+    result = LeadResult.for_lead(Lead('Acme', email='sales@acme.com', industry='Retail'), 'partnership')
+    result.domain = 'acme.com'
+    result.add_step(Step.DOMAIN, 0.0012)
+    result.add_step(Step.SCRAPED, 0.25)
+    result.add_step(Step.SUMMARIZED, 1.5)
+    result.summary = 'Acme sells things.'
+    result.status = 'Completed'
+    result.degrade('summary_deadline')
+    return result
+
+
+def test_records_keep_only_slots():
+    lead, result = Lead('Acme'), LeadResult('Acme')
+
+    assert not hasattr(lead, '__dict__') and not hasattr(result, '__dict__')
+    assert Lead.__slots__ == LEAD_FIELDS
+    assert set(LeadResult.__slots__) == set(RESULT_FIELDS) - set(DERIVED_RESULT_FIELDS) | {'_steps', '_timings'}
+    with pytest.raises(AttributeError):
+        result.notes = 'not a field'
+    # Steps are one byte each, timings one float.
+    assert (result._steps.itemsize, result._timings.itemsize) == (1, 4)
+
+
+def test_leads_read_like_dicts():
+    lead = Lead.from_dict({'company_name': 'Acme', 'domain': 'acme.com', 'unused': 'x'})
+
+    assert dict(lead) == {'company_name': 'Acme', 'domain': 'acme.com'}
+    assert lead.get('industry', 'all') == 'all' and lead.get('unused') is None
+    with pytest.raises(KeyError):
+        lead['industry']
+
+
+def test_steps_survive_a_round_trip_through_json():
+    result = make_result()
+    data = json.loads(json.dumps(dict(result)))
+
+    assert data['processing_steps'] == ['✅ Domain extraction: acme.com', '✅ Web scraping: Success', '✅ AI summarization: Completed']
+    assert data['step_timings'] == [0.001, 0.25, 1.5]
+
+    restored = LeadResult.from_dict(data)
+    assert restored.steps == [Step.DOMAIN, Step.SCRAPED, Step.SUMMARIZED]
+    assert dict(restored) == data
+    assert restored.degraded == 'summary_deadline'
+
+
+def test_steps_that_quote_the_error_round_trip():
+    result = LeadResult('Acme')
+    result.error = 'already contacted 3 days ago'
+    result.add_step(Step.DOMAIN)
+    result.add_step(Step.DEDUP)
+
+    restored = LeadResult.from_dict(dict(result))
+    assert restored.steps == [Step.DOMAIN, Step.DEDUP]
+    assert restored.processing_steps == ['✅ Domain extraction: already contacted 3 days ago',
+                                         '⏭️ Deduplication: already contacted 3 days ago']
@@ -0,0 +1,124 @@
+import threading
+import time
+
+from records import LeadResult
+from resilience import Deadline, BreakerRegistry, current_deadline, deadline_scope, get_domain_breakers, note_degraded
+from workflow import WebScraper
+
+COOLDOWN = 0.05
+
+
+class DownEngine:
+    """A fetch engine whose sites never answer."""
+
+    def __init__(self):
+        self.fetched = []
+
+    def fetch_page(self, domain, headers=None):
+        self.fetched.append(domain)
+        return None
+
+
+def test_circuit_opens_then_a_single_trial_closes_it():
+    breakers = BreakerRegistry('test', window=4, min_calls=2, failure_rate=0.5, cooldown=COOLDOWN)
+    breakers.record('acme.com', True)
+    assert breakers.allow('acme.com')
+    breakers.record('acme.com', False)
+
+    assert breakers.is_open('acme.com')
+    assert not breakers.allow('acme.com')
+    assert breakers.allow('globex.com')
+
+    time.sleep(COOLDOWN)
+    # Half-open: one trial goes through, everyone else still fails fast until it reports back.
+    assert breakers.allow('acme.com')
+    assert not breakers.allow('acme.com')
+    breakers.record('acme.com', True)
+
+    assert not breakers.is_open('acme.com') and breakers.allow('acme.com')
+    assert breakers.stats() == {'opened': 1, 'rejected': 2, 'trials': 1, 'closed': 1, 'open': 0, 'tracked': 1}
+
+
+def test_failed_trial_restarts_the_cooldown():
+    breakers = BreakerRegistry('test', window=4, min_calls=2, cooldown=COOLDOWN)
+    breakers.record('acme.com', False)
+    breakers.record('acme.com', False)
+    time.sleep(COOLDOWN)
+    assert breakers.allow('acme.com')
+    breakers.record('acme.com', False)
+
+    assert breakers.is_open('acme.com') and not breakers.allow('acme.com')
+    time.sleep(COOLDOWN)
+    assert breakers.allow('acme.com')
+    # A trial that never reached the upstream is handed back to the next caller.
+    breakers.cancel('acme.com')
+    assert breakers.allow('acme.com')
+
+
+def test_outcomes_slide_out_of_the_window():
+    breakers = BreakerRegistry('test', window=4, min_calls=4, failure_rate=0.75)
+    for ok in (False, False, True, True, True, False):
+        breakers.record('acme.com', ok)
+
+    assert not breakers.is_open('acme.com')
+    breakers.record('acme.com', False)
+    breakers.record('acme.com', False)
+    assert breakers.is_open('acme.com')
+
+
+def test_subdomains_of_a_site_trip_one_domain_circuit():
+    assert get_domain_breakers().min_calls == 2
+    engine = DownEngine()
+    scraper = WebScraper(live=True, engine=engine, use_page_cache=False, breakers=BreakerRegistry('domain', min_calls=2))
+
+    for domain in ('acme.co.uk', 'shop.acme.co.uk', 'blog.acme.co.uk', 'globex.com'):
+        assert scraper.scrape_website_content(domain) is None
+
+    assert engine.fetched == ['acme.co.uk', 'shop.acme.co.uk', 'globex.com']
+    assert scraper.breakers.is_open('acme.co.uk')
+
+
+def test_nested_deadlines_bind_to_the_tightest_budget():
+    run = Deadline(1, reason='run')
+    lead = Deadline(60, run)
+    assert (lead.reason, lead.expires_at) == ('run', run.expires_at)
+
+    scrape = Deadline(60).stage(0.5, 'scrape')
+    assert scrape.reason == 'scrape' and 29 < scrape.remaining() <= 30
+    assert Deadline().stage(0.5, 'scrape').bounded is False
+    assert Deadline(0.1).limit(5) <= 0.1 and Deadline().limit(5) == 5
+
+
+def test_deadline_scope_is_per_thread_and_attributes_degradations():
+    result = LeadResult('Acme')
+    seen_by_thread = []
+
+    with deadline_scope(Deadline(30, owner=result)) as lead:
+        with deadline_scope(lead.stage(0.4, 'scrape')):
+            assert current_deadline().reason == 'scrape'
+            note_degraded('scrape', 'circuit_open')
+            thread = threading.Thread(target=lambda: seen_by_thread.append(current_deadline()))
+            thread.start()
+            thread.join()
+        assert current_deadline() is lead
+        note_degraded('summary', 'deadline')
+    assert current_deadline() is None
+
+    # A new thread starts with no deadline in scope; workers open their own scope per lead.
+    assert seen_by_thread == [None]
+    assert result.degraded == 'scrape_circuit_open, summary_deadline'
+
+
+def test_expired_deadline_skips_the_fetch_without_blaming_the_site():
+    engine = DownEngine()
+    breakers = BreakerRegistry('domain', min_calls=1)
+    scraper = WebScraper(live=True, engine=engine, use_page_cache=False, breakers=breakers)
+    result = LeadResult('Acme')
+
+    with deadline_scope(Deadline(0.01, owner=result)):
+        time.sleep(0.02)
+        assert scraper.scrape_website_content('acme.com') is None
+
+    assert engine.fetched == []
+    assert breakers.stats()['tracked'] == 0
+    assert result.degraded == 'scrape_deadline'
@@ -0,0 +1,56 @@
+import pytest
+
+import app as app_module
+import results_store
+from results_store import ResultStore
+from shared import Shared
+
+METRICS = {'total_processed': 45, 'completed': 30, 'skipped': 15, 'errors': 15, 'average_processing_time': 0.4,
+           'total_processing_time': 12.5}
+RESULTS = [{'company': f'Company {n}', 'status': 'Completed' if n % 3 else 'Skipped', 'summary': f'Summary {n}'} for n in range(45)]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / 'results.db'))
+    monkeypatch.setattr(results_store, '_shared_store', Shared(lambda: store))
+    return store
+
+
+def test_runs_persist_across_store_instances(tmp_path):
+    path = str(tmp_path / 'results.db')
+    ResultStore(path).save_run('run-1', {'total_processed': 45}, {'industry': 'all'}, '2026-01-15 10:00:00', iter(RESULTS))
+
+    reopened = ResultStore(path)
+    run = reopened.get_run('run-1')
+    assert (run['total'], run['metrics'], run['filters']) == (45, {'total_processed': 45}, {'industry': 'all'})
+    assert list(reopened.iter_results('run-1', batch_size=7)) == RESULTS
+
+    reopened.delete_run('run-1')
+    assert ResultStore(path).get_run('run-1') is None
+
+
+def test_pages_follow_positions_and_appends_continue_them(store):
+    store.save_run('run-1', {}, {}, '', RESULTS[:30])
+    assert store.add_results('run-1', RESULTS[30:]) == 45
+
+    assert store.get_results('run-1', 0, 20) == RESULTS[:20]
+    assert store.get_results('run-1', 40, 20) == RESULTS[40:]
+    assert store.get_results('run-1', 45, 20) == []
+    # Saving again replaces the run rather than appending to it.
+    store.save_run('run-1', {}, {}, '', RESULTS[:5])
+    assert store.get_run('run-1')['total'] == 5
+
+
+def test_results_page_is_served_by_run_id(store):
+    store.save_run('run-1', METRICS, {'industry_filter': 'all'}, '2026-01-15 10:00:00', RESULTS)
+    client = app_module.app.test_client()
+
+    page = client.get('/results?run_id=run-1&page=3&per_page=20')
+    assert page.status_code == 200
+    html = page.get_data(as_text=True)
+    assert 'Company 40' in html and 'Company 44' in html and 'Company 39' not in html
+
+    assert client.get('/results?run_id=missing').status_code == 302
+    api = client.get('/api/results/run-1?offset=43&limit=10').get_json()
+    assert (api['total'], api['offset'], [row['company'] for row in api['processed_results']]) == (45, 43, ['Company 43', 'Company 44'])
@@ -0,0 +1,169 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scraping import FetchEngine
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    lock = threading.Lock()
+    paragraphs = 10
+    latency = 0.0
+    unavailable = 0
+    retry_after = '0'
+    page = None
+    in_flight = 0
+    peak = 0
+    seen = 0
+
+    @classmethod
+    def reset(cls, **settings):
+        cls.paragraphs, cls.latency, cls.unavailable, cls.retry_after, cls.page = 10, 0.0, 0, '0', None
+        cls.in_flight = cls.peak = cls.seen = 0
+        for name, value in settings.items():
+            setattr(cls, name, value)
+
+    def do_GET(self):
+        cls = SiteHandler
+        with cls.lock:
+            cls.seen += 1
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+            unavailable = cls.seen <= cls.unavailable
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if unavailable:
+                self.send_response(503)
+                self.send_header('Retry-After', self.retry_after)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = ''.join(f"<p>Paragraph {i} about our services.</p>" for i in range(self.paragraphs))
+            data = (self.page or f"<html><head><script>var x = 1;</script></head><body><h1>Welcome</h1>{body}</body></html>").encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Streaming reads that stop early close the connection mid-response.
+        pass
+
+
+@pytest.fixture
+def site():
+    SiteHandler.reset()
+    server = QuietServer(('127.0.0.1', 0), SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_engine(**kwargs) -> FetchEngine:
+    options = {'schemes': ('http',), 'max_retries': 2, 'backoff': 0.01, 'domain_rps': 0}
+    options.update(kwargs)
+    return FetchEngine(**options)
+
+
+def test_page_text_is_extracted_without_scripts(site):
+    engine = make_engine()
+    result = engine.fetch_page(site)
+
+    assert result['status'] == 200 and not result['truncated']
+    assert result['text'].startswith('Welcome Paragraph 0 about our services.')
+    assert 'var x' not in result['text']
+
+
+def test_long_pages_are_truncated_while_streaming(site):
+    SiteHandler.reset(paragraphs=20000)
+    engine = make_engine(max_chars=500, max_bytes=10 ** 8)
+    result = engine.fetch_page(site)
+
+    assert result['truncated']
+    assert len(result['text']) == 500
+    # Reading stopped early instead of pulling the whole ~800KB page.
+    assert engine.stats['bytes'] < 100000
+    assert engine.stats['truncated'] == 1
+
+
+def test_page_filling_max_chars_exactly_is_not_truncated(site):
+    text = 'x' * 500
+    SiteHandler.reset(page=f"<html><body><p>{text}</p>\n</body></html>\n")
+    engine = make_engine(max_chars=500)
+    result = engine.fetch_page(site)
+
+    assert result['text'] == text
+    assert not result['truncated']
+    assert engine.stats['truncated'] == 0
+
+    SiteHandler.reset(page=f"<html><body><p>{text}</p><p>!</p></body></html>")
+    result = engine.fetch_page(site)
+
+    assert result['text'] == text
+    assert result['truncated']
+
+
+def test_byte_cap_stops_reading(site):
+    SiteHandler.reset(paragraphs=20000)
+    engine = make_engine(max_chars=10 ** 7, max_bytes=50000)
+    result = engine.fetch_page(site)
+
+    assert result['truncated']
+    # At most one chunk past the cap, peeked at to tell whether anything was left.
+    assert 50000 <= engine.stats['bytes'] <= 50000 + 2 * 16384
+
+
+def test_503_is_retried_after_retry_after(site):
+    SiteHandler.reset(unavailable=1, retry_after='0.3')
+    engine = make_engine()
+    started = time.monotonic()
+    result = engine.fetch_page(site)
+
+    assert result['status'] == 200 and result['text']
+    assert time.monotonic() - started >= 0.3
+    assert (engine.stats['requests'], engine.stats['retries'], engine.stats['failures']) == (2, 1, 0)
+
+
+def test_gives_up_after_max_retries(site):
+    SiteHandler.reset(unavailable=10)
+    engine = make_engine(max_retries=2)
+
+    assert engine.fetch_page(site) is None
+    assert (engine.stats['requests'], engine.stats['failures']) == (3, 1)
+
+
+def test_per_domain_concurrency_is_bounded(site):
+    SiteHandler.reset(latency=0.1)
+    engine = make_engine(per_domain_concurrency=2, max_concurrency=16)
+    threads = [threading.Thread(target=engine.fetch_text, args=(site,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert SiteHandler.seen == 8
+    assert SiteHandler.peak == 2
+
+
+def test_idle_domain_controls_are_evicted_beyond_the_cap(site):
+    engine = make_engine(max_domains=2)
+    for path in ('a', 'b', 'c', 'd'):
+        engine.fetch(f"http://{site}/{path}", domain=f"host-{path}")
+
+    assert list(engine._domains) == ['host-c', 'host-d']
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from checkpoint import CheckpointJournal
+from fake_groq import FakeGroqClient
+from lead_source import LeadIndex
+from llm_gateway import LLMGateway
+from sharding import ShardPool, shard_for
+from workflow import ApifyClient, ContentSummarizer, EmailGenerator, LeadGenerationWorkflow, WebScraper
+
+LEADS = 40
+
+
+def make_leads(count: int = LEADS):
+    return [
+        {'company_name': f'Company {i}', 'domain': f'company{i % 12}.com', 'email': f'info@company{i % 12}.com',
+         'industry': 'Technology'}
+        for i in range(count)
+    ]
+
+
+def make_workflow(shards: int = 0, checkpoint: CheckpointJournal = None) -> LeadGenerationWorkflow:
+    gateway = LLMGateway(FakeGroqClient(), rpm=0, tpm=0, use_cache=False)
+    workflow = LeadGenerationWorkflow(max_workers=4, shards=shards, shard_factory=make_workflow, checkpoint=checkpoint,
+                                      batch_llm=False, pipeline=False, run_budget=0, lead_budget=0)
+    workflow.apify_client = ApifyClient(LeadIndex(make_leads()))
+    workflow.web_scraper = WebScraper(live=False, use_page_cache=False)
+    workflow.summarizer = ContentSummarizer(use_page_cache=False, gateway=gateway, use_summary_index=False)
+    workflow.email_generator = EmailGenerator(gateway=gateway)
+    return workflow
+
+
+def outputs(results):
+    return [(result.company, result.status, result.domain, result.summary, result.email_content)
+            for result in results['processed_results']]
+
+
+def test_sharded_output_matches_in_process():
+    in_process = make_workflow()
+    workflow = make_workflow(shards=2)
+    try:
+        for mode in ({}, {'pipeline': True}, {'batch_llm': True}):
+            expected = outputs(in_process.run_full_workflow(LEADS, 'all', 'partnership', **mode))
+            results = workflow.run_full_workflow(LEADS, 'all', 'partnership', **mode)
+            assert outputs(results) == expected, mode
+            assert results['metrics']['completed'] == LEADS
+    finally:
+        workflow.close()
+
+
+def test_shard_summaries_are_journaled_by_parent(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    with CheckpointJournal(path) as journal:
+        # A summary paid for by an earlier, interrupted run.
+        journal.record_summary({'company': 'Company 3', 'email': 'info@company3.com'}, 'Summary from the interrupted run')
+        workflow = make_workflow(shards=2, checkpoint=journal)
+        try:
+            results = workflow.run_full_workflow(LEADS, 'all', 'partnership')
+        finally:
+            workflow.close()
+
+    assert results['processed_results'][3].summary == 'Summary from the interrupted run'
+    reopened = CheckpointJournal(path)
+    try:
+        assert reopened.stats() == {'results': LEADS, 'finished': LEADS, 'summaries': LEADS}
+    finally:
+        reopened.close()
+
+
+def build_slow_handler():
+    return slow_handler
+
+
+def slow_handler(items, options, report):
+    time.sleep(options['delay'])
+    report({'chunk': len(items)})
+    return [item * 2 for item in items]
+
+
+def test_concurrent_maps_do_not_serialize():
+    pool = ShardPool(2, build_slow_handler, chunk_size=4)
+    try:
+        # Warm both processes so start-up time does not count.
+        assert list(pool.map([(str(i), i) for i in range(8)], {'delay': 0})) == [i * 2 for i in range(8)]
+        keys = {shard_for(str(n), 2): str(n) for n in range(20)}
+        outcomes, records = {}, {}
+
+        def run(shard: int):
+            seen = records[shard] = []
+            outcomes[shard] = list(pool.map([(keys[shard], i) for i in range(4)], {'delay': 0.5}, seen.append))
+
+        threads = [threading.Thread(target=run, args=(shard,)) for shard in (0, 1)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        assert outcomes == {0: [0, 2, 4, 6], 1: [0, 2, 4, 6]}
+        assert records == {0: [{'chunk': 4}], 1: [{'chunk': 4}]}
+        assert elapsed < 0.9
+    finally:
+        pool.close()
@@ -0,0 +1,67 @@
+import pytest
+
+from summary_reuse import SummaryIndex
+
+WORDS = [f"word{i}" for i in range(200)]
+
+
+def page(company: str, changed: int = 0) -> str:
+    """A 200-word page about ``company`` with ``changed`` of its words, ten apart, swapped out."""
+    words = list(WORDS)
+    for n in range(changed):
+        words[5 + 10 * n] = f"other{n}"
+    return f"{company} offers " + ' '.join(words) + f" Contact {company} today."
+
+
+def remember(index: SummaryIndex, company: str, domain: str, content: str, summary: str):
+    reused, signature = index.match(company, domain, content)
+    assert reused is None
+    index.add(signature, company, domain, summary)
+
+
+def test_boilerplate_pages_reuse_a_summary_adapted_to_the_lead():
+    index = SummaryIndex()
+    remember(index, 'Acme Analytics', 'acme.io', page('Acme Analytics'), 'Acme Analytics (acme.io) sells analytics.')
+
+    reused, _ = index.match('Globex Corp', 'globex.com', page('Globex Corp', changed=1))
+
+    assert reused == 'Globex Corp (globex.com) sells analytics.'
+    assert index.stats()['hits'] == index.stats()['llm_calls_avoided'] == 1
+
+
+def test_only_pages_above_the_similarity_threshold_match():
+    index = SummaryIndex(threshold=0.9)
+    remember(index, 'Acme', 'acme.io', page('Acme'), 'Acme sells analytics.')
+
+    # One changed word shares ~97% of shingles; twenty changed words share about half.
+    assert index.match('Globex', 'globex.com', page('Globex', changed=1))[0] == 'Globex sells analytics.'
+    assert index.match('Globex', 'globex.com', page('Globex', changed=20))[0] is None
+    assert index.match('Globex', 'globex.com', 'Completely different words on this page')[0] is None
+
+    strict = SummaryIndex(threshold=1.0)
+    remember(strict, 'Acme', 'acme.io', page('Acme'), 'Acme sells analytics.')
+    assert strict.match('Globex', 'globex.com', page('Globex', changed=1))[0] is None
+    assert strict.match('Globex', 'globex.com', page('Globex'))[0] == 'Globex sells analytics.'
+
+
+def test_summaries_that_still_name_their_source_are_not_stored():
+    index = SummaryIndex()
+    _, signature = index.match('Acme Analytics', 'acme.io', page('Acme Analytics'))
+    index.add(signature, 'Acme Analytics', 'acme.io', 'Acme is the analytics leader.')
+
+    assert index.stats()['unadaptable'] == 1 and index.stats()['entries'] == 0
+
+
+def test_oldest_entries_are_evicted_from_every_band():
+    index = SummaryIndex(max_entries=1)
+    remember(index, 'Acme', 'acme.io', page('Acme'), 'Acme sells analytics.')
+    remember(index, 'Initech', 'initech.com', 'Initech builds printers for offices everywhere', 'Initech builds printers.')
+
+    assert index.match('Globex', 'globex.com', page('Globex'))[0] is None
+    assert index.stats()['evictions'] == 1
+    assert sum(len(buckets) for buckets in index._buckets) == len(index._buckets)
+
+
+def test_bands_must_divide_the_permutations():
+    with pytest.raises(ValueError, match='multiple of bands'):
+        SummaryIndex(permutations=100, bands=16)
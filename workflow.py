@@ -0,0 +1,1010 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional
+
+from analytics import AnalyticsStore, get_analytics_store
+from checkpoint import CheckpointJournal, CheckpointRelay
+from dedup import DedupIndex, get_dedup_index
+from domains import domain_from_email, is_free_mail, normalize_host, site_key
+from lead_io import batched, lead_key
+from lead_source import LeadIndex, get_lead_source
+from llm_batching import LLM_BATCH_MODE, build_batch_prompt, estimate_tokens, parse_batch_response, run_batched
+from llm_gateway import LLM_STREAMING, LLMGateway, get_llm_gateway
+from page_cache import PageCache, content_fingerprint, get_page_cache
+from pipeline import (
+    PIPELINE_EMAIL_RPS, PIPELINE_EMAIL_WORKERS, PIPELINE_MODE, PIPELINE_QUEUE_SIZE, PIPELINE_SCRAPE_RPS,
+    PIPELINE_SCRAPE_WORKERS, PIPELINE_SUMMARY_RPS, PIPELINE_SUMMARY_WORKERS, Pipeline, Stage
+)
+from prompt_templates import TemplateRegistry, get_template_registry
+from records import Lead, LeadResult, Step
+from resilience import (
+    LEAD_BUDGET_SECONDS, RUN_BUDGET_SECONDS, SCRAPE_BUDGET_SHARE, SUMMARY_BUDGET_SHARE, BreakerRegistry, Deadline,
+    cause_of, current_deadline, deadline_scope, get_domain_breakers, note_degraded
+)
+from scraping import FetchEngine, get_fetch_engine
+from sharding import WORKFLOW_SHARDS, ShardPool
+from shared import Shared
+from summary_reuse import SummaryIndex, get_summary_index
+
+WORKFLOW_CONCURRENCY = int(os.getenv('WORKFLOW_CONCURRENCY', '4'))
+SCRAPER_MODE = os.getenv('SCRAPER_MODE', 'mock')
+
+
+class DomainExtractor:
+    @staticmethod
+    def extract_domain_from_email(email: str) -> Optional[str]:
+        if not email or '@' not in email:
+            return None
+        return domain_from_email(email)
+    
+    @staticmethod
+    def extract_domain_from_url(url: str) -> Optional[str]:
+        if not url:
+            return None
+        return normalize_host(url)
+    
+    @staticmethod
+    def is_free_mail(domain: Optional[str]) -> bool:
+        return is_free_mail(domain)
+    
+    @staticmethod
+    def extract_domain(lead_data: dict) -> tuple[Optional[str], Optional[str]]:
+        return DomainExtractor._resolve(
+            lead_data.get('company_name', ''),
+            lead_data.get('domain') or '',
+            lead_data.get('email') or '',
+            lead_data.get('website') or ''
+        )
+    
+    @staticmethod
+    def extract_domains(leads: List[Dict]) -> List[tuple[Optional[str], Optional[str]]]:
+        domains, errors = DomainExtractor.extract_domains_bulk(
+            domains=[lead.get('domain') for lead in leads],
+            emails=[lead.get('email') for lead in leads],
+            websites=[lead.get('website') for lead in leads],
+            company_names=[lead.get('company_name', '') for lead in leads]
+        )
+        return list(zip(domains, errors))
+    
+    @staticmethod
+    def extract_domains_bulk(domains: List[str] = None, emails: List[str] = None, websites: List[str] = None,
+                             company_names: List[str] = None) -> tuple[List[Optional[str]], List[Optional[str]]]:
+        """Same answers as ``_resolve`` row by row, but one column at a time.
+
+        Each column is normalized in a single ``map`` over the rows still
+        unresolved, so a row only reaches the website column if neither its
+        domain nor its email gave a usable host.
+        """
+        size = max(len(column) for column in (domains, emails, websites, company_names) if column is not None)
+        resolved: List[Optional[str]] = [None] * size
+        free_mail: List[Optional[str]] = [None] * size
+        pending = list(range(size))
+        
+        for column, normalize in ((domains, normalize_host), (emails, domain_from_email), (websites, normalize_host)):
+            if not column or not pending:
+                continue
+            values = [column[row] or '' for row in pending]
+            hosts = map(lambda value: normalize(value) if value.strip() else None, values)
+            still_pending = []
+            for row, host in zip(pending, hosts):
+                if not host:
+                    still_pending.append(row)
+                elif not is_free_mail(host):
+                    resolved[row] = host
+                else:
+                    if normalize is domain_from_email:
+                        free_mail[row] = host
+                    still_pending.append(row)
+            pending = still_pending
+        
+        names = company_names or [''] * size
+        errors: List[Optional[str]] = [None] * size
+        for row in pending:
+            if free_mail[row]:
+                errors[row] = f"Free email provider ({free_mail[row]}) for {names[row] or ''}"
+            else:
+                errors[row] = f"No domain found for {names[row] or ''}"
+        return resolved, errors
+    
+    @staticmethod
+    def _resolve(company_name: str, domain: str, email: str, website: str) -> tuple[Optional[str], Optional[str]]:
+        free_mail_domain = None
+        
+        if domain and domain.strip():
+            normalized = normalize_host(domain)
+            if normalized and not is_free_mail(normalized):
+                return normalized, None
+        
+        if email and '@' in email:
+            normalized = domain_from_email(email)
+            if normalized:
+                if not is_free_mail(normalized):
+                    return normalized, None
+                free_mail_domain = normalized
+        
+        if website and website.strip():
+            normalized = normalize_host(website)
+            if normalized and not is_free_mail(normalized):
+                return normalized, None
+        
+        if free_mail_domain:
+            return None, f"Free email provider ({free_mail_domain}) for {company_name}"
+        return None, f"No domain found for {company_name}"
+
+class ApifyClient:
+    """Lead source for the workflow; serves the indexed local leads (see ``lead_source``)."""
+    
+    def __init__(self, source: LeadIndex = None):
+        self._source = source
+    
+    @property
+    def source(self) -> LeadIndex:
+        if self._source is None:
+            self._source = get_lead_source()
+        return self._source
+    
+    def get_company_leads(self, count: int = 5, industry_filter: str = None, **filters) -> List[Lead]:
+        industry = industry_filter if industry_filter and industry_filter != 'all' else None
+        return self.source.query(industry=industry, limit=count, **filters).leads
+
+class WebScraper:
+    def __init__(self, live: bool = None, engine: FetchEngine = None, page_cache: PageCache = None, breakers: BreakerRegistry = None,
+                 use_page_cache: bool = True, use_breakers: bool = True):
+        self.live = SCRAPER_MODE == 'live' if live is None else live
+        self.engine = engine or get_fetch_engine()
+        self.page_cache = (page_cache or get_page_cache()) if use_page_cache else None
+        self.breakers = (breakers or get_domain_breakers()) if use_breakers else None
+    
+    @property
+    def session(self):
+        return self.engine.session
+    
+    def scrape_website_content(self, domain: str) -> Optional[str]:
+        if domain == 'invalid-website':
+            return None
+            
+        try:
+            if self.live:
+                return self._fetch_with_cache(domain)
+            return self._get_mock_content(domain)
+        except Exception as e:
+            print(f"Error scraping {domain}: {e}")
+            return None
+    
+    def _fetch_with_cache(self, domain: str) -> Optional[str]:
+        if self.page_cache is None:
+            result = self._fetch_page(domain)
+            return result['text'] if result else None
+        
+        cached = self.page_cache.get(domain)
+        if cached and cached['fresh']:
+            self.page_cache.count('fresh_hits')
+            return cached['text']
+        
+        result = self._fetch_page(domain, self.page_cache.conditional_headers(cached))
+        if result is None:
+            return cached['text'] if cached else None
+        
+        if result['status'] == 304 and cached:
+            self.page_cache.mark_revalidated(domain, result['headers'].get('ETag'), result['headers'].get('Last-Modified'))
+            return cached['text']
+        
+        self.page_cache.count('misses')
+        if result['text']:
+            self.page_cache.put(domain, result['url'], result['text'], result['headers'].get('ETag'), result['headers'].get('Last-Modified'))
+        return result['text']
+    
+    def _fetch_page(self, domain: str, headers: Dict = None) -> Optional[Dict]:
+        # Out of time is our budget, not the domain's fault, so it never counts against the breaker.
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            note_degraded('scrape', 'deadline')
+            return None
+        # Subdomains of one site share a circuit, so a run's few fetches per site can trip it.
+        site = site_key(domain) or domain
+        if self.breakers is not None and not self.breakers.allow(site):
+            note_degraded('scrape', 'circuit_open')
+            return None
+        result = self.engine.fetch_page(domain, headers)
+        if self.breakers is not None:
+            self.breakers.record(site, result is not None)
+        return result
+    
+    def _get_mock_content(self, domain: str) -> str:
+        content_map = {
+            'techcorp.com': "TechCorp Solutions provides enterprise software development and cloud infrastructure services. We help businesses digitalize their operations through custom SaaS solutions and offer 24/7 technical support. Trusted by over 500 companies worldwide.",
+            'greenenergy.org': "GreenEnergy Inc is a renewable energy company focused on solar and wind power solutions. We provide sustainable energy systems for residential and commercial clients with installation and maintenance services. Committed to reducing carbon footprints.",
+            'medicaresys.com': "MediCare Systems offers healthcare management software and electronic medical records solutions. We streamline patient data management, appointment scheduling, and billing processes for medical practices. HIPAA compliant and secure.",
+            'cloudtech.io': "CloudTech Innovations helps businesses migrate to the cloud and optimize their infrastructure. We specialize in AWS, Azure, and Google Cloud Platform solutions with security consulting and DevOps services.",
+            'fintechglobal.com': "FinTech Global provides innovative financial technology solutions for banks and financial institutions. Our platform includes payment processing, risk management, and digital banking services.",
+            'edulearn.com': "EduLearn Academy offers interactive online courses and learning management systems. We serve schools, universities, and corporate training programs with advanced educational technology."
+        }
+        
+        return content_map.get(domain, f"{domain} is a professional company providing quality services to clients with a focus on innovation and customer satisfaction.")
+
+class ContentSummarizer:
+    def __init__(self, page_cache: PageCache = None, gateway: LLMGateway = None, templates: TemplateRegistry = None,
+                 summary_index: SummaryIndex = None, use_page_cache: bool = True, use_summary_index: bool = True):
+        self.gateway = gateway or get_llm_gateway()
+        self.page_cache = (page_cache or get_page_cache()) if use_page_cache else None
+        self.templates = templates or get_template_registry()
+        self.summary_index = (summary_index or get_summary_index()) if use_summary_index else None
+    
+    def generate_summary(self, company_name: str, domain: str, content: str) -> Optional[str]:
+        if not self.gateway.available:
+            return self.templates.prompt('summary_fallback').render(company_name=company_name, domain=domain)
+        
+        summary_hash = content_fingerprint(company_name, content)
+        if self.page_cache is not None:
+            reused = self.page_cache.get_summary(domain, summary_hash)
+            if reused:
+                return reused
+        
+        signature = None
+        if self.summary_index is not None:
+            reused, signature = self.summary_index.match(company_name, domain, content)
+            if reused:
+                return reused
+            
+        try:
+            prompt = self.templates.prompt('summary').render(company_name=company_name, domain=domain, content=content)
+            
+            summary = self.gateway.complete(
+                messages=[
+                    {
+                        "role": "system", 
+                        "content": self.templates.prompt('summary_system').render()
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                model="mixtral-8x7b-32768",
+                max_tokens=150,
+                temperature=0.3
+            )
+            
+            if self.page_cache is not None:
+                self.page_cache.store_summary(domain, summary_hash, summary)
+            if self.summary_index is not None:
+                self.summary_index.add(signature, company_name, domain, summary)
+            return summary
+            
+        except Exception as e:
+            print(f"Error generating summary: {e}")
+            self.gateway.record_fallback()
+            note_degraded('summary', cause_of(e))
+            return self.templates.prompt('summary_error_fallback').render(company_name=company_name, domain=domain)
+    
+    def generate_summaries_batch(self, items: List[Dict], scope: Callable[[List[Dict]], ContextManager] = None) -> List[Optional[str]]:
+        if not self.gateway.available:
+            return [self.generate_summary(item['company_name'], item['domain'], item['content']) for item in items]
+        
+        summaries: List[Optional[str]] = [None] * len(items)
+        signatures = {}
+        entries = []
+        for index, item in enumerate(items):
+            if self.page_cache is not None:
+                summaries[index] = self.page_cache.get_summary(item['domain'], content_fingerprint(item['company_name'], item['content']))
+            if summaries[index] is None and self.summary_index is not None:
+                summaries[index], signatures[index] = self.summary_index.match(item['company_name'], item['domain'], item['content'])
+            if summaries[index] is None:
+                entries.append({'id': str(index), 'company_name': item['company_name'], 'domain': item['domain'], 'content': item['content']})
+        
+        generated = run_batched(
+            entries,
+            cost=lambda entry: estimate_tokens(entry['content']) + 150 + 40,
+            request_batch=lambda batch: self._request_summary_batch(batch, signatures),
+            fallback=lambda entry: self.generate_summary(entry['company_name'], entry['domain'], entry['content']),
+            scope=scope
+        )
+        for entry, summary in zip(entries, generated):
+            summaries[int(entry['id'])] = summary
+        return summaries
+    
+    def _request_summary_batch(self, entries: List[Dict], signatures: Dict[int, tuple] = None) -> Dict[str, str]:
+        prompt = build_batch_prompt(
+            self.templates.prompt('summary_batch').render(),
+            entries,
+            'summary'
+        )
+        text = self.gateway.complete(
+            messages=[
+                {
+                    "role": "system",
+                    "content": self.templates.prompt('summary_system').render()
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model="mixtral-8x7b-32768",
+            max_tokens=150 * len(entries) + 50,
+            temperature=0.3,
+            response_format={"type": "json_object"}
+        )
+        summaries = parse_batch_response(text, [entry['id'] for entry in entries], 'summary')
+        if self.page_cache is not None:
+            for entry in entries:
+                if entry['id'] in summaries:
+                    summary_hash = content_fingerprint(entry['company_name'], entry['content'])
+                    self.page_cache.store_summary(entry['domain'], summary_hash, summaries[entry['id']])
+        if self.summary_index is not None and signatures:
+            for entry in entries:
+                if entry['id'] in summaries:
+                    self.summary_index.add(signatures.get(int(entry['id'])), entry['company_name'], entry['domain'], summaries[entry['id']])
+        return summaries
+
+class EmailGenerator:
+    def __init__(self, gateway: LLMGateway = None, templates: TemplateRegistry = None):
+        self.gateway = gateway or get_llm_gateway()
+        self.templates = templates or get_template_registry()
+    
+    @property
+    def email_templates(self) -> Dict[str, str]:
+        return {email_type.name: email_type.hint for email_type in self.templates.email_types()}
+    
+    def generate_personalized_email(self, lead_data: Dict, business_summary: str, email_type: str = 'partnership', on_delta=None) -> str:
+        company_name = lead_data.get('company_name', '')
+        industry = lead_data.get('industry', '')
+        
+        if not self.gateway.available:
+            return self._generate_fallback_email(company_name, business_summary, email_type, industry)
+            
+        try:
+            prompt = self.templates.email_prompt(email_type).render(
+                company_name=company_name, industry=industry, business_summary=business_summary, email_type=email_type
+            )
+            
+            return self.gateway.complete(
+                messages=[
+                    {
+                        "role": "system",
+                        "content": self.templates.prompt('email_system').render()
+                    },
+                    {
+                        "role": "user", 
+                        "content": prompt
+                    }
+                ],
+                model="mixtral-8x7b-32768",
+                on_delta=on_delta,
+                max_tokens=400,
+                temperature=0.7
+            )
+            
+        except Exception as e:
+            print(f"Error generating email: {e}")
+            self.gateway.record_fallback()
+            note_degraded('email', cause_of(e))
+            return self._generate_fallback_email(company_name, business_summary, email_type, industry)
+    
+    def generate_personalized_emails_batch(self, items: List[tuple], email_type: str = 'partnership',
+                                           scope: Callable[[List[Dict]], ContextManager] = None) -> List[str]:
+        if not self.gateway.available:
+            return [self.generate_personalized_email(lead, summary, email_type) for lead, summary in items]
+        
+        entries = [
+            {
+                'id': str(index),
+                'company_name': lead.get('company_name', ''),
+                'industry': lead.get('industry', ''),
+                'company_context': summary
+            }
+            for index, (lead, summary) in enumerate(items)
+        ]
+        return run_batched(
+            entries,
+            cost=lambda entry: estimate_tokens(entry['company_context']) + 400 + 40,
+            request_batch=lambda batch: self._request_email_batch(batch, email_type),
+            fallback=lambda entry: self.generate_personalized_email(items[int(entry['id'])][0], entry['company_context'], email_type),
+            scope=scope
+        )
+    
+    def _request_email_batch(self, entries: List[Dict], email_type: str) -> Dict[str, str]:
+        prompt = build_batch_prompt(
+            self.templates.prompt('email_batch').render(email_type=email_type),
+            entries,
+            'email'
+        )
+        text = self.gateway.complete(
+            messages=[
+                {
+                    "role": "system",
+                    "content": self.templates.prompt('email_system').render()
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model="mixtral-8x7b-32768",
+            max_tokens=400 * len(entries) + 50,
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+        return parse_batch_response(text, [entry['id'] for entry in entries], 'email')
+    
+    def _generate_fallback_email(self, company_name: str, business_summary: str, email_type: str, industry: str = '') -> str:
+        return self.templates.render_fallback_email(email_type, company_name, business_summary, industry)
+
+class LeadGenerationWorkflow:
+    def __init__(self, max_workers: int = None, batch_llm: bool = None, dedup_index: DedupIndex = None, analytics: AnalyticsStore = None,
+                 pipeline: bool = None, checkpoint: CheckpointJournal = None, shards: int = None,
+                 shard_factory: Callable[[], 'LeadGenerationWorkflow'] = None, run_budget: float = None, lead_budget: float = None,
+                 use_dedup: bool = True):
+        self.apify_client = ApifyClient()
+        self.web_scraper = WebScraper()
+        self.summarizer = ContentSummarizer()
+        self.email_generator = EmailGenerator()
+        self.domain_extractor = DomainExtractor()
+        self.max_workers = max_workers or WORKFLOW_CONCURRENCY
+        self.batch_llm = LLM_BATCH_MODE if batch_llm is None else batch_llm
+        self.dedup_index = (dedup_index if dedup_index is not None else get_dedup_index()) if use_dedup else None
+        self.analytics = analytics or get_analytics_store()
+        self.pipeline = PIPELINE_MODE if pipeline is None else pipeline
+        self.checkpoint = checkpoint
+        self.shards = WORKFLOW_SHARDS if shards is None else shards
+        # Builds the workflow inside each shard process; must be picklable.
+        self.shard_factory = shard_factory or LeadGenerationWorkflow
+        self._shard_pool: Optional[ShardPool] = None
+        self._shard_pool_lock = threading.Lock()
+        # Seconds; 0 means unbounded. A lead's budget starts when its processing does.
+        self.run_budget = RUN_BUDGET_SECONDS if run_budget is None else run_budget
+        self.lead_budget = LEAD_BUDGET_SECONDS if lead_budget is None else lead_budget
+        
+    def run_full_workflow(self, lead_count: int = 5, industry_filter: str = None, email_type: str = 'partnership', max_workers: int = None, progress_callback=None, batch_llm: bool = None, pipeline: bool = None, email_delta_callback=None, shards: int = None):
+        metrics = self._new_metrics()
+        run_deadline = Deadline(self.run_budget, reason='run')
+        
+        leads = self.apify_client.get_company_leads(lead_count, industry_filter)
+        batch_llm = self.batch_llm if batch_llm is None else batch_llm
+        pipeline = self.pipeline if pipeline is None else pipeline
+        shards = self.shards if shards is None else shards
+        
+        replayed = {}
+        if self.checkpoint is not None:
+            for index, lead in enumerate(leads):
+                finished = self.checkpoint.finished(lead)
+                if finished is not None:
+                    replayed[index] = finished
+        todo = [lead for index, lead in enumerate(leads) if index not in replayed]
+        
+        if shards > 1:
+            outcomes = self._shard_leads(todo, email_type, shards, max_workers or self.max_workers, batch_llm, pipeline,
+                                         progress_callback, len(todo), run_deadline)
+        elif batch_llm:
+            outcomes = self._process_leads_batched(todo, email_type, max_workers or self.max_workers, progress_callback,
+                                                   run_deadline=run_deadline)
+        elif pipeline:
+            outcomes = self._pipeline_leads(todo, email_type, progress_callback, len(todo), email_delta_callback,
+                                            run_deadline=run_deadline, metrics=metrics)
+        else:
+            outcomes = self._process_leads(todo, email_type, max_workers or self.max_workers, progress_callback, email_delta_callback,
+                                           run_deadline=run_deadline)
+        outcomes = iter(outcomes)
+        results = []
+        
+        for index in range(len(leads)):
+            if index in replayed:
+                lead_result = replayed[index]
+                self._record_outcome(metrics, lead_result, lead_result.processing_time or 0, replayed=True)
+            else:
+                lead_result, processing_time = next(outcomes)
+                self._record_outcome(metrics, lead_result, processing_time)
+            results.append(lead_result)
+        # Run the outcome generator to its end so it can close out its own bookkeeping.
+        deque(outcomes, maxlen=0)
+        
+        self._finalize_metrics(metrics)
+        self.analytics.incr('runs')
+        
+        return {
+            'input_leads': leads,
+            'processed_results': results,
+            'metrics': metrics,
+            'filters': {
+                'lead_count': lead_count,
+                'industry_filter': industry_filter,
+                'email_type': email_type
+            }
+        }
+    
+    def run_stream(self, leads: Iterable[Dict], email_type: str = 'partnership', max_workers: int = None, metrics: Dict = None, batch_llm: bool = None, pipeline: bool = None, shards: int = None) -> Iterator[LeadResult]:
+        metrics = metrics if metrics is not None else {}
+        metrics.update(self._new_metrics(keep_times=False))
+        run_deadline = Deadline(self.run_budget, reason='run')
+        
+        batch_llm = self.batch_llm if batch_llm is None else batch_llm
+        pipeline = self.pipeline if pipeline is None else pipeline
+        shards = self.shards if shards is None else shards
+        workers = max(1, max_workers or self.max_workers)
+        
+        replayed = deque()
+        if self.checkpoint is not None:
+            leads = self._skip_finished(leads, replayed)
+        
+        if shards > 1:
+            outcomes = self._shard_leads(leads, email_type, shards, workers, batch_llm, pipeline, run_deadline=run_deadline)
+        elif batch_llm:
+            outcomes = (
+                outcome
+                for chunk in batched(leads, workers * 4)
+                for outcome in self._process_leads_batched(chunk, email_type, workers, run_deadline=run_deadline)
+            )
+        elif pipeline:
+            outcomes = self._pipeline_leads(leads, email_type, run_deadline=run_deadline, metrics=metrics)
+        else:
+            outcomes = self._stream_leads(leads, email_type, workers, run_deadline)
+        
+        for lead_result, processing_time in outcomes:
+            yield from self._drain_replayed(metrics, replayed)
+            self._record_outcome(metrics, lead_result, processing_time)
+            yield lead_result
+        yield from self._drain_replayed(metrics, replayed)
+        
+        self._finalize_metrics(metrics)
+        self.analytics.incr('runs')
+    
+    def _skip_finished(self, leads: Iterable[Dict], replayed: deque) -> Iterator[Dict]:
+        for lead in leads:
+            finished = self.checkpoint.finished(lead)
+            if finished is None:
+                yield lead
+            else:
+                replayed.append(finished)
+    
+    def _drain_replayed(self, metrics: Dict, replayed: deque) -> Iterator[LeadResult]:
+        while replayed:
+            lead_result = replayed.popleft()
+            self._record_outcome(metrics, lead_result, lead_result.processing_time or 0, replayed=True)
+            yield lead_result
+    
+    def _stream_leads(self, leads: Iterable[Dict], email_type: str, workers: int, run_deadline: Deadline = None) -> Iterator[tuple]:
+        window = workers * 4
+        chunks = (
+            zip(chunk, self._extract_domains(chunk))
+            for chunk in batched(leads, window)
+        )
+        
+        if workers == 1:
+            for chunk in chunks:
+                for lead, resolved in chunk:
+                    yield self._process_lead(lead, email_type, resolved, run_deadline=run_deadline)
+            return
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lead-worker') as pool:
+            pending = deque()
+            for chunk in chunks:
+                for lead, resolved in chunk:
+                    pending.append(pool.submit(self._process_lead, lead, email_type, resolved, run_deadline=run_deadline))
+                    if len(pending) >= window:
+                        yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def _new_metrics(self, keep_times: bool = True) -> Dict:
+        metrics = {
+            'total_processed': 0,
+            'completed': 0,
+            'skipped': 0,
+            'errors': 0,
+            'resumed': 0,
+            'degraded': 0,
+            'start_time': datetime.now()
+        }
+        if keep_times:
+            metrics['processing_times'] = []
+        else:
+            metrics['processing_time_sum'] = 0.0
+        return metrics
+    
+    def _record_outcome(self, metrics: Dict, lead_result: LeadResult, processing_time: float, replayed: bool = False):
+        metrics['total_processed'] += 1
+        if replayed:
+            # Already counted in analytics by the run that finished it.
+            metrics['resumed'] += 1
+        else:
+            self.analytics.record_lead(lead_result.status, processing_time)
+            if lead_result.degraded:
+                self.analytics.record_degraded(lead_result.degraded.split(', '))
+        if lead_result.degraded:
+            metrics['degraded'] += 1
+        
+        if lead_result.status == 'Completed':
+            metrics['completed'] += 1
+            if 'processing_times' in metrics:
+                metrics['processing_times'].append(processing_time)
+            else:
+                metrics['processing_time_sum'] += processing_time
+        elif lead_result.status == 'Skipped':
+            metrics['skipped'] += 1
+            metrics['errors'] += 1
+        elif lead_result.status == 'Error':
+            metrics['errors'] += 1
+    
+    def _finalize_metrics(self, metrics: Dict):
+        if 'processing_times' in metrics:
+            if metrics['processing_times']:
+                metrics['average_processing_time'] = round(sum(metrics['processing_times']) / len(metrics['processing_times']), 2)
+        elif metrics['completed']:
+            metrics['average_processing_time'] = round(metrics['processing_time_sum'] / metrics['completed'], 2)
+        metrics['total_processing_time'] = round((datetime.now() - metrics['start_time']).total_seconds(), 2)
+    
+    def _process_leads(self, leads: List[Dict], email_type: str, max_workers: int, progress_callback=None, email_delta_callback=None, resolved: List[tuple] = None,
+                       run_deadline: Deadline = None) -> List[tuple]:
+        def process(item):
+            outcome = self._process_lead(item[0], email_type, item[1], email_delta_callback, run_deadline)
+            if progress_callback:
+                progress_callback(outcome[0], len(leads))
+            return outcome
+        
+        return self._map_leads(process, list(zip(leads, resolved or self._extract_domains(leads))), max_workers)
+    
+    def _process_leads_batched(self, leads: List[Dict], email_type: str, max_workers: int, progress_callback=None, resolved: List[tuple] = None,
+                               run_deadline: Deadline = None) -> List[tuple]:
+        prepared = self._map_leads(
+            lambda item: self._prepare_lead(item[0], email_type, item[1], run_deadline),
+            list(zip(leads, resolved or self._extract_domains(leads))),
+            max_workers
+        )
+        outcomes = [(lead_result, 0) for lead_result, _, _, _ in prepared]
+        ready = [index for index, (lead_result, _, _, _) in enumerate(prepared) if lead_result.status == 'Pending']
+        
+        try:
+            journaled = {}
+            if self.checkpoint is not None:
+                for index in ready:
+                    summary = self.checkpoint.summary(prepared[index][0])
+                    if summary is not None:
+                        journaled[index] = summary
+            unsummarized = [index for index in ready if index not in journaled]
+            started = time.perf_counter()
+            summaries = self.summarizer.generate_summaries_batch(
+                [
+                    {
+                        'company_name': leads[index]['company_name'],
+                        'domain': prepared[index][0].domain,
+                        'content': prepared[index][1]
+                    }
+                    for index in unsummarized
+                ],
+                scope=self._batch_scope([prepared[index][0] for index in unsummarized], self.lead_budget * SUMMARY_BUDGET_SHARE, run_deadline)
+            )
+            per_summary = self._observe_batch('summarize', started, [prepared[index][0] for index in unsummarized])
+            for index, summary in zip(unsummarized, summaries):
+                self._checkpoint_summary(prepared[index][0], summary)
+                journaled[index] = summary
+            for index in ready:
+                prepared[index][0].add_step(Step.SUMMARIZED, per_summary)
+                prepared[index][0].summary = journaled[index]
+            
+            started = time.perf_counter()
+            emails = self.email_generator.generate_personalized_emails_batch(
+                [(leads[index], prepared[index][0].summary) for index in ready],
+                email_type,
+                scope=self._batch_scope([prepared[index][0] for index in ready], self.lead_budget * (1 - SUMMARY_BUDGET_SHARE), run_deadline)
+            )
+            per_email = self._observe_batch('email', started, [prepared[index][0] for index in ready])
+            for index, email_content in zip(ready, emails):
+                prepared[index][0].add_step(Step.EMAILED, per_email)
+                prepared[index][0].email_content = email_content
+                outcomes[index] = self._complete_lead(prepared[index][0], prepared[index][2])
+        
+        except Exception as e:
+            for index in ready:
+                if prepared[index][0].status == 'Pending':
+                    outcomes[index] = self._fail_lead(prepared[index][0], e)
+        
+        if progress_callback:
+            for lead_result, _ in outcomes:
+                progress_callback(lead_result, len(leads))
+        return outcomes
+    
+    @staticmethod
+    def _batch_scope(results: List[LeadResult], budget: float, run_deadline: Deadline = None) -> Callable:
+        """Deadline scopes for ``run_batched``: ``budget`` seconds per lead in each call, starting when it does.
+        
+        A single-lead call (including the one-by-one fallback after a failed
+        batch) is owned by that lead, so any template fallback is put down to it.
+        """
+        def scope(entries: List[Dict]):
+            owner = results[int(entries[0]['id'])] if len(entries) == 1 else None
+            return deadline_scope(Deadline(budget * len(entries), run_deadline, 'lead' if owner else 'batch', owner))
+        return scope
+    
+    def _map_leads(self, func, items: List, max_workers: int) -> List:
+        workers = max(1, min(max_workers, len(items)))
+        if workers == 1:
+            return [func(item) for item in items]
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lead-worker') as pool:
+            return list(pool.map(func, items))
+    
+    def _prepare_lead(self, lead: Dict, email_type: str, resolved: tuple = None, run_deadline: Deadline = None) -> tuple[LeadResult, Optional[str], datetime, Deadline]:
+        start_time = datetime.now()
+        lead_result = LeadResult.for_lead(lead, email_type)
+        deadline = Deadline(self.lead_budget, run_deadline, 'lead', lead_result)
+        
+        try:
+            domain, error = resolved if resolved is not None else self._extract_domains([lead])[0]
+            lead_result.add_step(Step.DOMAIN)
+            
+            if error:
+                lead_result.status = 'Skipped'
+                lead_result.error = error
+                self._checkpoint_result(lead_result)
+                return lead_result, None, start_time, deadline
+            
+            if self.dedup_index is not None:
+                duplicate = self.dedup_index.claim(domain, lead.get('company_name'))
+                if duplicate:
+                    # Kept on the skipped result so its domain step still names the domain.
+                    lead_result.domain = domain
+                    lead_result.add_step(Step.DEDUP)
+                    lead_result.status = 'Skipped'
+                    lead_result.error = duplicate
+                    self._checkpoint_result(lead_result)
+                    return lead_result, None, start_time, deadline
+            
+            lead_result.domain = domain
+            
+            if deadline.expired:
+                # Not journaled, so a resumed run gets another go at it.
+                lead_result.status = 'Skipped'
+                lead_result.error = f"{deadline.reason.capitalize()} budget exhausted before scraping {domain}"
+                lead_result.degrade('scrape_deadline')
+                self._release_lead(lead_result)
+                return lead_result, None, start_time, deadline
+            
+            started = time.perf_counter()
+            with deadline_scope(deadline.stage(SCRAPE_BUDGET_SHARE, 'scrape')):
+                website_content = self.web_scraper.scrape_website_content(domain)
+            lead_result.add_step(Step.SCRAPED if website_content else Step.SCRAPE_FAILED, self._observe('scrape', started, lead_result))
+            
+            if not website_content:
+                lead_result.status = 'Skipped'
+                lead_result.error = f"Could not scrape content from {domain}"
+                self._release_lead(lead_result)
+                self._checkpoint_result(lead_result)
+                return lead_result, None, start_time, deadline
+            
+            return lead_result, website_content, start_time, deadline
+            
+        except Exception as e:
+            self._fail_lead(lead_result, e)
+            return lead_result, None, start_time, deadline
+    
+    def _process_lead(self, lead: Dict, email_type: str, resolved: tuple = None, email_delta_callback=None, run_deadline: Deadline = None) -> tuple[LeadResult, float]:
+        lead_result, website_content, start_time, deadline = self._prepare_lead(lead, email_type, resolved, run_deadline)
+        if lead_result.status != 'Pending':
+            return lead_result, 0
+        
+        try:
+            self._summarize_lead(lead, lead_result, website_content, deadline)
+            self._write_email(lead, lead_result, email_type, email_delta_callback, deadline)
+            return self._complete_lead(lead_result, start_time)
+            
+        except Exception as e:
+            return self._fail_lead(lead_result, e)
+    
+    def _summarize_lead(self, lead: Dict, lead_result: LeadResult, website_content: str, deadline: Deadline = None):
+        summary = self.checkpoint.summary(lead_result) if self.checkpoint is not None else None
+        elapsed = 0.0
+        if summary is None:
+            started = time.perf_counter()
+            with deadline_scope(deadline and deadline.stage(SUMMARY_BUDGET_SHARE, 'summary')):
+                summary = self.summarizer.generate_summary(lead['company_name'], lead_result.domain, website_content)
+            elapsed = self._observe('summarize', started, lead_result)
+            self._checkpoint_summary(lead_result, summary)
+        lead_result.add_step(Step.SUMMARIZED, elapsed)
+        lead_result.summary = summary
+    
+    def _write_email(self, lead: Dict, lead_result: LeadResult, email_type: str, email_delta_callback=None, deadline: Deadline = None):
+        on_delta = None
+        if email_delta_callback and LLM_STREAMING:
+            on_delta = lambda text: email_delta_callback(lead_result, text)
+        started = time.perf_counter()
+        with deadline_scope(deadline):
+            email_content = self.email_generator.generate_personalized_email(lead, lead_result.summary, email_type, on_delta)
+        lead_result.add_step(Step.EMAILED, self._observe('email', started, lead_result))
+        lead_result.email_content = email_content
+    
+    def _pipeline_leads(self, leads: Iterable[Dict], email_type: str, progress_callback=None, total: int = None, email_delta_callback=None, resolved: List[tuple] = None,
+                        run_deadline: Deadline = None, metrics: Dict = None) -> Iterator[tuple]:
+        """Runs leads through the scrape/summarize/email stages; per-stage stats land in ``metrics['pipeline']``."""
+        def feed():
+            if resolved is not None:
+                for lead, lead_resolved in zip(leads, resolved):
+                    yield {'lead': lead, 'resolved': lead_resolved}
+                return
+            for chunk in batched(leads, PIPELINE_QUEUE_SIZE):
+                for lead, lead_resolved in zip(chunk, self._extract_domains(chunk)):
+                    yield {'lead': lead, 'resolved': lead_resolved}
+        
+        def scrape(item):
+            item['result'], item['content'], item['start_time'], item['deadline'] = self._prepare_lead(
+                item['lead'], email_type, item['resolved'], run_deadline
+            )
+            item['outcome'] = (item['result'], 0)
+            item['queued_at'] = time.monotonic()
+            return item
+        
+        # Waiting in a stage queue is not the lead's doing, so it is given back
+        # to the lead's budget when the next stage picks the item up.
+        def summarize(item):
+            item['deadline'].resume(item['queued_at'])
+            self._summarize_lead(item['lead'], item['result'], item['content'], item['deadline'])
+            item['content'] = None
+            item['queued_at'] = time.monotonic()
+            return item
+        
+        def write_email(item):
+            item['deadline'].resume(item['queued_at'])
+            self._write_email(item['lead'], item['result'], email_type, email_delta_callback, item['deadline'])
+            item['outcome'] = self._complete_lead(item['result'], item['start_time'])
+            return item
+        
+        def fail(item, error):
+            item['outcome'] = self._fail_lead(item['result'], error)
+            return item
+        
+        def pending(item):
+            return item['result'].status == 'Pending'
+        
+        pipeline = Pipeline([
+            Stage('scrape', scrape, PIPELINE_SCRAPE_WORKERS, PIPELINE_SCRAPE_RPS),
+            Stage('summarize', summarize, PIPELINE_SUMMARY_WORKERS, PIPELINE_SUMMARY_RPS, when=pending),
+            Stage('email', write_email, PIPELINE_EMAIL_WORKERS, PIPELINE_EMAIL_RPS, when=pending)
+        ], on_error=fail)
+        
+        start = time.perf_counter()
+        for item in pipeline.run(feed()):
+            if progress_callback:
+                progress_callback(item['outcome'][0], total)
+            yield item['outcome']
+        if metrics is not None:
+            metrics['pipeline'] = pipeline.summary(time.perf_counter() - start)
+    
+    def _shard_leads(self, leads: Iterable[Dict], email_type: str, shards: int, max_workers: int, batch_llm: bool, pipeline: bool,
+                     progress_callback=None, total: int = None, run_deadline: Deadline = None) -> Iterator[tuple]:
+        """Spreads leads over ``shards`` worker processes, partitioned by domain.
+        
+        Domains are resolved here so the same domain always reaches the same
+        process, keeping its HTTP pool, page cache and in-flight dedup claims
+        in one place. Each process runs its chunks with the usual thread pool,
+        batched or pipelined path; results come back in input order and are
+        journaled and counted here, and summaries are journaled here as the
+        shards report them. Streamed email deltas are not forwarded.
+        """
+        pool = self._get_shard_pool(shards)
+        journal = self.checkpoint
+        items = (
+            (lead_resolved[0] or lead.get('company_name'),
+             (lead, lead_resolved, journal.lead_summary(lead) if journal is not None else None))
+            for chunk in batched(leads, pool.chunk_size * shards)
+            for lead, lead_resolved in zip(chunk, self._extract_domains(chunk))
+        )
+        options = {'email_type': email_type, 'max_workers': max_workers, 'batch_llm': batch_llm, 'pipeline': pipeline}
+        on_record = None
+        if journal is not None:
+            on_record = lambda record: journal.record_summary(record, record['summary'])
+        for lead_result, processing_time in pool.map(items, lambda: self._shard_options(options, run_deadline), on_record):
+            self._checkpoint_result(lead_result)
+            if progress_callback:
+                progress_callback(lead_result, total)
+            yield lead_result, processing_time
+    
+    def _get_shard_pool(self, shards: int) -> ShardPool:
+        with self._shard_pool_lock:
+            if self._shard_pool is None or self._shard_pool.shards != shards:
+                if self._shard_pool is not None:
+                    self._shard_pool.close()
+                self._shard_pool = ShardPool(shards, partial(_build_shard_worker, self.shard_factory))
+            return self._shard_pool
+    
+    @staticmethod
+    def _shard_options(options: Dict, run_deadline: Deadline = None) -> Dict:
+        # Monotonic clocks are per process, so the run budget travels as seconds left.
+        if run_deadline is None or not run_deadline.bounded:
+            return options
+        return {**options, 'run_budget': max(run_deadline.remaining(), 1e-3)}
+    
+    def _process_shard(self, items: List[tuple], options: Dict, report: Callable = None) -> List[tuple]:
+        leads = [lead for lead, _, _ in items]
+        resolved = [lead_resolved for _, lead_resolved, _ in items]
+        run_deadline = Deadline(options.get('run_budget', 0), reason='run')
+        # A shard process runs one chunk at a time, so the relay can sit where the journal would.
+        journal = self.checkpoint
+        if report is not None:
+            self.checkpoint = CheckpointRelay({lead_key(lead): summary for lead, _, summary in items if summary}, report)
+        try:
+            if options['batch_llm']:
+                return self._process_leads_batched(leads, options['email_type'], options['max_workers'], resolved=resolved,
+                                                   run_deadline=run_deadline)
+            if options['pipeline']:
+                return list(self._pipeline_leads(leads, options['email_type'], resolved=resolved, run_deadline=run_deadline))
+            return self._process_leads(leads, options['email_type'], options['max_workers'], resolved=resolved,
+                                       run_deadline=run_deadline)
+        finally:
+            self.checkpoint = journal
+            # Shard processes can exit without running atexit, so counters are pushed per chunk.
+            self.analytics.flush()
+    
+    def close(self):
+        with self._shard_pool_lock:
+            if self._shard_pool is not None:
+                self._shard_pool.close()
+                self._shard_pool = None
+    
+    def _complete_lead(self, lead_result: LeadResult, start_time: datetime) -> tuple[LeadResult, float]:
+        if self.dedup_index is not None:
+            self.dedup_index.record(lead_result.domain, lead_result.company)
+        lead_result.status = 'Completed'
+        processing_time = (datetime.now() - start_time).total_seconds()
+        lead_result.processing_time = round(processing_time, 2)
+        self.analytics.observe('total', processing_time, lead_result.industry)
+        self._checkpoint_result(lead_result)
+        return lead_result, processing_time
+    
+    def _fail_lead(self, lead_result: LeadResult, error: Exception) -> tuple[LeadResult, float]:
+        lead_result.status = 'Error'
+        lead_result.error = f"Processing error: {str(error)}"
+        lead_result.add_step(Step.ERROR)
+        self._release_lead(lead_result)
+        self._checkpoint_result(lead_result)
+        return lead_result, 0
+    
+    def _extract_domains(self, leads: List[Dict]) -> List[tuple]:
+        started = time.perf_counter()
+        resolved = self.domain_extractor.extract_domains(leads)
+        if leads:
+            per_lead = (time.perf_counter() - started) / len(leads)
+            for lead in leads:
+                self.analytics.observe('domain_extraction', per_lead, lead.get('industry'))
+        return resolved
+    
+    def _observe(self, stage: str, started: float, lead_result: LeadResult) -> float:
+        elapsed = time.perf_counter() - started
+        self.analytics.observe(stage, elapsed, lead_result.industry)
+        return elapsed
+    
+    def _observe_batch(self, stage: str, started: float, lead_results: List[LeadResult]) -> float:
+        if not lead_results:
+            return 0.0
+        per_lead = (time.perf_counter() - started) / len(lead_results)
+        for lead_result in lead_results:
+            self.analytics.observe(stage, per_lead, lead_result.industry)
+        return per_lead
+    
+    def _release_lead(self, lead_result: LeadResult):
+        if self.dedup_index is not None:
+            self.dedup_index.release(lead_result.domain)
+    
+    def _checkpoint_result(self, lead_result: LeadResult):
+        if self.checkpoint is not None:
+            self.checkpoint.record_result(lead_result)
+    
+    def _checkpoint_summary(self, lead_result: LeadResult, summary: Optional[str]):
+        if self.checkpoint is not None and summary:
+            self.checkpoint.record_summary(lead_result, summary)
+
+
+def _build_shard_worker(factory: Callable[[], LeadGenerationWorkflow]) -> Callable:
+    # Runs once in each shard process, so its scraper session and LLM clients stay warm across chunks.
+    return factory()._process_shard
+
+
+_shared_workflow: Shared[LeadGenerationWorkflow] = Shared(LeadGenerationWorkflow)
+
+
+def get_workflow() -> LeadGenerationWorkflow:
+    """Process-wide workflow, so every job reuses the same HTTP pool, LLM client and caches."""
+    return _shared_workflow.get()